@@ -0,0 +1,153 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+import Analyze_Resume
+from Scoring.Get_Overall_Score import score_weights
+from Scoring.Keyword_Match import keyword_terms
+from Job_Role.Get_Job_Category import model_fingerprint as job_role_fingerprint
+from Validity.Get_Validity import model_fingerprint as validity_fingerprint
+from Job_Role.Text_Normalize import normalize_whitespace
+from DB_Handle import get_cached_analysis, save_cached_analysis, aget_cached_analysis, asave_cached_analysis
+
+## Content-addressed cache of finished workflow results.
+## Tier 1 : in-process LRU with TTL (per worker).
+## Tier 2 : MongoDB collection shared by every worker (DB_Handle.ANALYSIS_CACHE_COLLECTION).
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "1024"))             # entries kept in memory per worker
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600)))   # seconds, both tiers
+ANALYSIS_CACHE_SHARED = os.getenv("ANALYSIS_CACHE_SHARED", "true").lower() in ("1", "true", "yes")
+
+
+# ---------------------------
+# Cache Key
+# ---------------------------
+def normalize_text(text) -> str:
+    # Re-extracted PDFs differ only in whitespace, which must not change the key
+    return normalize_whitespace(text)
+
+def analysis_cache_key(resume_content: str, job_description: str, mode: str = None) -> str:
+    """
+    SHA-256 over the normalized inputs and everything that changes the workflow's output:
+    prompt fingerprint, model name, analysis mode, the overall-score engine / weights version, the
+    keyword engine / dictionary version, the job-role model and the validity engine / model.
+    """
+    parts = [
+        Analyze_Resume.PROMPT_VERSION,
+        Analyze_Resume.get_model_name(),
+        mode or Analyze_Resume.ANALYSIS_MODE,
+        Analyze_Resume.OVERALL_SCORE_ENGINE,
+        str(score_weights.get('version')),
+        Analyze_Resume.KEYWORD_ENGINE,
+        str(keyword_terms.get('version')),
+        job_role_fingerprint(),
+        Analyze_Resume.VALIDITY_ENGINE,
+        validity_fingerprint() if Analyze_Resume.VALIDITY_ENGINE == "local" else '',
+        normalize_text(resume_content),
+        normalize_text(job_description),
+    ]
+    return hashlib.sha256("\x00".join(parts).encode('utf-8')).hexdigest()
+
+
+# ---------------------------
+# In-process LRU with TTL
+# ---------------------------
+class TTLCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (value, expires_at)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# ---------------------------
+# Two-tier Analysis Cache
+# ---------------------------
+class AnalysisCache:
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_SIZE, ttl_seconds: int = ANALYSIS_CACHE_TTL, shared: bool = ANALYSIS_CACHE_SHARED):
+        self.local = TTLCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.counters = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0, 'stores': 0}
+        self.counter_lock = threading.Lock()
+
+    def count(self, name: str):
+        with self.counter_lock:
+            self.counters[name] += 1
+
+    def get(self, key: str):
+        """Return a copy of the cached ResumeState, or None on a miss."""
+        result = self.local.get(key)
+        if result is not None:
+            self.count('memory_hits')
+            return copy.deepcopy(result)
+        if self.shared:
+            result = get_cached_analysis(key)
+            if result is not None:
+                self.local.set(key, result)
+                self.count('shared_hits')
+                return copy.deepcopy(result)
+        self.count('misses')
+        return None
+
+    async def aget(self, key: str):
+        result = self.local.get(key)
+        if result is not None:
+            self.count('memory_hits')
+            return copy.deepcopy(result)
+        if self.shared:
+            result = await aget_cached_analysis(key)
+            if result is not None:
+                self.local.set(key, result)
+                self.count('shared_hits')
+                return copy.deepcopy(result)
+        self.count('misses')
+        return None
+
+    def set(self, key: str, result: dict):
+        self.local.set(key, copy.deepcopy(result))
+        if self.shared:
+            save_cached_analysis(key, result, self.ttl_seconds)
+        self.count('stores')
+
+    async def aset(self, key: str, result: dict):
+        self.local.set(key, copy.deepcopy(result))
+        if self.shared:
+            await asave_cached_analysis(key, result, self.ttl_seconds)
+        self.count('stores')
+
+    def stats(self) -> dict:
+        with self.counter_lock:
+            stats = dict(self.counters)
+        lookups = stats['memory_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        stats['memory_entries'] = len(self.local)
+        stats['prompt_version'] = Analyze_Resume.PROMPT_VERSION
+        return stats
+
+
+analysis_cache = AnalysisCache()
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from io import BytesIO
+from bson import ObjectId
+from Analyze_Resume import check_job_description_rules
+from Resume_Service import get_resume_content, aget_resume_report
+from DB_Handle import aattach_files, asaveManyToDb
+from LLM_Scheduler import llm_priority
+
+## Batch recruiter mode : one job description, many resumes.
+## Resumes run through the workflow with bounded concurrency and results are yielded as they finish.
+## Run Command (from Analyze) : python Batch_Analyze.py --job-description jd.txt resumes/*.pdf   (prints NDJSON, nothing is saved)
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))     # resumes of one batch analysed at the same time
+BATCH_INSERT_SIZE = int(os.getenv("BATCH_INSERT_SIZE", "25"))    # documents per insert_many
+
+
+def prepare_job_description(job_description: str) -> str:
+    """
+    Validate and normalise the job description once for the whole batch.
+
+    Raises:
+        ValueError: If the job description contains prompt-injection / malicious patterns.
+    """
+    check_job_description_rules(job_description)
+    return (job_description or '').strip()
+
+async def analyze_one(index: int, file_name: str, file_bytes: bytes, job_description: str):
+    try:
+        resume_text = await asyncio.to_thread(get_resume_content, BytesIO(file_bytes))
+    except ValueError as e:
+        return index, file_name, {
+            "success": False,
+            "error": {
+            "type": "FileProcessingError",
+            "message": str(e),
+            "details": None
+            }
+        }
+    # Batch calls wait behind interactive uploads for the LLM budget
+    with llm_priority("batch"):
+        AI_Response = await aget_resume_report({'resume_content': resume_text, 'job_description': job_description})
+    return index, file_name, AI_Response
+
+async def analyze_batch(job_description: str, resumes, max_concurrency: int = BATCH_CONCURRENCY):
+    """
+    Analyze many resumes against one job description.
+
+    Args:
+        job_description (str): The job description shared by the whole batch.
+        resumes (iterable): (file_name, file_bytes) pairs.
+        max_concurrency (int): Resumes of this batch analysed at the same time.
+
+    Yields:
+        tuple: (index, file_name, AI_Response) in completion order.
+    """
+    job_description = prepare_job_description(job_description)
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(index, file_name, file_bytes):
+        async with slots:
+            return await analyze_one(index, file_name, file_bytes, job_description)
+
+    tasks = [asyncio.create_task(bounded(index, file_name, file_bytes)) for index, (file_name, file_bytes) in enumerate(resumes)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        # Consumer went away (e.g. client disconnected) -> stop the remaining analyses
+        for task in tasks:
+            task.cancel()
+
+async def analyze_and_save_batch(job_description: str, resumes, user_name: str,
+                                 max_concurrency: int = BATCH_CONCURRENCY, insert_size: int = BATCH_INSERT_SIZE):
+    """
+    Batch counterpart of /upload_resume: analyze, store files in GridFS and bulk-insert the documents into the
+    user's collection (reports are rendered on their first download, see Resume_Service.render_report).
+
+    Yields:
+        dict: One document per resume (with 'index') as soon as it is analysed, then a final {'summary': {...}}.
+    """
+    resumes = list(resumes)
+    today_date = datetime.today().strftime("%Y-%m-%d")
+    pending, saved, save_failures = [], 0, 0
+
+    async def flush():
+        nonlocal saved, save_failures
+        if not pending:
+            return
+        inserted = await asaveManyToDb(pending, user_name)
+        if inserted is None:
+            save_failures += len(pending)
+        else:
+            saved += len(inserted)
+        pending.clear()
+
+    async for index, file_name, AI_Response in analyze_batch(job_description, resumes, max_concurrency):
+        try:
+            await aattach_files(AI_Response, user_name, BytesIO(resumes[index][1]), None, file_name, today_date)
+        except Exception as e:
+            print(f"❌ Error storing files for {file_name}: {str(e)}")
+            AI_Response['resume_file_name'] = file_name
+            AI_Response['uploaded_date'] = today_date
+
+        # Ids are assigned client-side so every line can be streamed before its bulk insert
+        # (attach_files has already assigned one to an analysis with a lazy report)
+        AI_Response['_id'] = str(AI_Response.get('_id') or ObjectId())
+        pending.append(AI_Response)
+        yield dict(AI_Response, index=index)
+
+        if len(pending) >= insert_size:
+            await flush()
+
+    await flush()
+    yield {"summary": {"total": len(resumes), "saved": saved, "save_failures": save_failures}}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Analyze many resumes against one job description")
+    parser.add_argument('--job-description', required=True, help="Path to a text file with the job description")
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument('resumes', nargs='+', help="Resume PDF files")
+    args = parser.parse_args()
+
+    with open(args.job_description, 'r', encoding='utf-8') as f:
+        job_description = f.read()
+    resumes = []
+    for path in args.resumes:
+        with open(path, 'rb') as f:
+            resumes.append((os.path.basename(path), f.read()))
+
+    async for index, file_name, AI_Response in analyze_batch(job_description, resumes, args.concurrency):
+        print(json.dumps({'index': index, 'resume_file_name': file_name, **AI_Response}, default=str), flush=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+import csv
+import math
+import time
+
+## Shared helpers for the scripts in this folder.
+## All benchmarks are run from the Analyze directory, e.g. : python -m Benchmarks.Single_Call_Benchmark
+
+DATASET_PATH = './Job_Role/Dataset/ResumeDataSet.csv'
+
+SAMPLE_JOB_DESCRIPTION = """We are hiring a Data Scientist / Python Developer to build machine learning models and data pipelines.
+Requirements: Python, SQL, pandas, scikit-learn, TensorFlow or PyTorch, NLP, statistics, data visualization (Tableau / Power BI),
+REST APIs, Docker, Git, AWS. Experience deploying models to production and communicating insights to stakeholders."""
+
+
+def load_resumes(limit=None, min_length=0):
+    """
+    Load resume texts from ResumeDataSet.csv.
+
+    Args:
+        limit (int): Maximum number of resumes to return (None for all).
+        min_length (int): Skip resumes shorter than this many characters.
+
+    Returns:
+        list[tuple[str, str]]: (category, resume_text) pairs.
+    """
+    rows = []
+    with open(DATASET_PATH, encoding='utf-8', errors='ignore', newline='') as f:
+        for row in csv.DictReader(f):
+            if len(row['Resume']) < min_length:
+                continue
+            rows.append((row['Category'], row['Resume']))
+            if limit is not None and len(rows) >= limit:
+                break
+    return rows
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_call(func, *args, **kwargs):
+    """Run func once and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def format_latency_row(label, seconds):
+    """One aligned report line with p50 / p95 / mean of a list of latencies (in seconds)."""
+    mean = sum(seconds) / len(seconds) if seconds else 0.0
+    return (f"{label:<28} n={len(seconds):<5} p50={percentile(seconds, 50) * 1000:10.3f} ms  "
+            f"p95={percentile(seconds, 95) * 1000:10.3f} ms  mean={mean * 1000:10.3f} ms")
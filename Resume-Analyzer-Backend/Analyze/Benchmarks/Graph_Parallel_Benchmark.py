@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+from Analyze_Resume import build_workflow, check_resume_rules, set_llm_provider
+from Node_Trace import NodeTimingTrace
+from Benchmarks.Bench_Utils import load_resumes, percentile, SAMPLE_JOB_DESCRIPTION
+
+## Compares the critical path of the sequential and fan-out graph modes using a per-node timing trace.
+## Needs GROQ_API_KEY (every sample costs one full analysis per mode), or runs offline with --provider replay / fake
+## (record a cassette first with --provider record; offline providers are not held to the LLM_RPM / LLM_TPM budgets).
+## Run Command (from Analyze) : python -m Benchmarks.Graph_Parallel_Benchmark --samples 5 --show-trace
+
+MODES = ("chain", "parallel", "speculative")
+
+
+async def run_mode(mode, samples, show_trace):
+    workflow = build_workflow(mode)
+    critical_paths, node_times = [], []
+    for _, resume_text in samples:
+        trace = NodeTimingTrace()
+        state = {'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION}
+        try:
+            await workflow.ainvoke(state, config={'callbacks': [trace]})
+        except Exception as e:
+            print(f"  [{mode}] analysis failed: {str(e)[:120]}")
+            continue
+        summary = trace.summary()
+        critical_paths.append(summary['critical_path'])
+        node_times.append(summary['node_time'])
+        if show_trace:
+            print(f"[{mode}]\n{trace.format()}")
+    return critical_paths, node_times
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs parallel / speculative graph modes")
+    parser.add_argument('--samples', type=int, default=5, help="Number of resumes from ResumeDataSet.csv")
+    parser.add_argument('--show-trace', action='store_true', help="Print the per-node timeline of every run")
+    parser.add_argument('--provider', choices=("groq", "record", "replay", "fake"), help="LLM provider (defaults to LLM_PROVIDER)")
+    parser.add_argument('--cassette', help="Cassette file for record / replay (defaults to LLM_CASSETTE)")
+    args = parser.parse_args()
+    if args.provider:
+        set_llm_provider(args.provider, args.cassette)
+
+    samples = []
+    for category, resume_text in load_resumes(min_length=100):
+        try:
+            check_resume_rules({'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION})
+        except ValueError:
+            continue
+        samples.append((category, resume_text))
+        if len(samples) >= args.samples:
+            break
+
+    print(f"Benchmarking {len(samples)} resumes per mode\n")
+    for mode in MODES:
+        critical_paths, node_times = await run_mode(mode, samples, args.show_trace)
+        print(f"{mode:<12} critical path p50={percentile(critical_paths, 50) * 1000:9.1f} ms  "
+              f"p95={percentile(critical_paths, 95) * 1000:9.1f} ms  "
+              f"summed node time p50={percentile(node_times, 50) * 1000:9.1f} ms\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
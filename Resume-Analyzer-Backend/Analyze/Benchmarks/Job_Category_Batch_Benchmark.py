@@ -0,0 +1,56 @@
+import argparse
+import time
+from Job_Role.Get_Job_Category import load_models, cleanResume, predict_resume_category, predict_resume_categories
+from Benchmarks.Bench_Utils import load_resumes
+
+## Job-category throughput over the whole ResumeDataSet.csv: one predict_resume_category call per resume against
+## predict_resume_categories with several chunk sizes (and top-k). --legacy adds the original per-resume dense path
+## (tfidf.transform(...).toarray() -> model.predict).
+## Run Command (from Analyze) : python -m Benchmarks.Job_Category_Batch_Benchmark --chunk-sizes 32 256 1024 --legacy
+
+
+def report(label, seconds, count):
+    print(f"{label:<34} {seconds:8.3f} s  {count / seconds:10.1f} resumes/s  {seconds / count * 1000:8.3f} ms/resume")
+
+def legacy_predict(text):
+    model, tfidf, category_map = load_models()
+    return category_map.get(model.predict(tfidf.transform([cleanResume(text)]).toarray())[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch job-category prediction throughput")
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[32, 256, 1024], help="Chunk sizes to try")
+    parser.add_argument('--top-k', type=int, default=3, help="Also time the batch API returning the top-k categories")
+    parser.add_argument('--legacy', action='store_true', help="Also time the original dense per-resume path")
+    args = parser.parse_args()
+
+    texts = [text for _, text in load_resumes()]
+    predict_resume_category(texts[0])  # load the models outside the timings
+    print(f"{len(texts)} resumes from ResumeDataSet.csv\n")
+
+    if args.legacy:
+        start = time.perf_counter()
+        legacy = [legacy_predict(text) for text in texts]
+        report("per resume, dense (original)", time.perf_counter() - start, len(texts))
+
+    start = time.perf_counter()
+    single = [predict_resume_category(text) for text in texts]
+    report("per resume, predict_resume_category", time.perf_counter() - start, len(texts))
+
+    for chunk_size in args.chunk_sizes:
+        start = time.perf_counter()
+        batch = predict_resume_categories(texts, chunk_size=chunk_size)
+        report(f"batch, chunk_size={chunk_size}", time.perf_counter() - start, len(texts))
+        if batch != single:
+            print(f"  ❌ batch predictions differ from predict_resume_category")
+
+    start = time.perf_counter()
+    predict_resume_categories(texts, top_k=args.top_k)
+    report(f"batch, top_k={args.top_k}", time.perf_counter() - start, len(texts))
+
+    if args.legacy:
+        print(f"\nIdentical to the original path: {sum(a == b for a, b in zip(legacy, single))}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import time
+import tracemalloc
+from Job_Role.Get_Job_Category import load_models, load_sparse_knn, cleanResume
+from Benchmarks.Bench_Utils import load_resumes, format_latency_row, percentile
+
+## Job-category inference per call: the original dense path (tfidf.transform(...).toarray() -> OneVsRest k-NN predict)
+## against the sparse-native SparseKNN (Job_Role/Sparse_KNN.py). Reports latency, peak memory allocated per call
+## (tracemalloc) and whether both paths predict the same category for every resume.
+## Run Command (from Analyze) : python -m Benchmarks.Job_Category_Benchmark --samples 200
+
+
+def dense_predict(model, tfidf, text):
+    return model.predict(tfidf.transform([text]).toarray())[0]
+
+def sparse_predict(knn, tfidf, text):
+    return knn.predict(tfidf.transform([text]))[0]
+
+def measure(func, texts):
+    """(latencies, peak bytes allocated per call, predictions)"""
+    latencies, peaks, predictions = [], [], []
+    for text in texts:
+        start = time.perf_counter()
+        predictions.append(func(text))
+        latencies.append(time.perf_counter() - start)
+    # Memory separately: tracing slows every allocation down and would distort the latencies
+    for text in texts:
+        tracemalloc.start()
+        func(text)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return latencies, peaks, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dense vs sparse job-category inference")
+    parser.add_argument('--samples', type=int, default=200, help="Number of resumes from ResumeDataSet.csv")
+    args = parser.parse_args()
+
+    model, tfidf, _ = load_models()
+    start = time.perf_counter()
+    knn = load_sparse_knn()
+    build_time = time.perf_counter() - start
+    if knn is None:
+        print("❌ The job-role model is not a OneVsRest k-NN, nothing to compare.")
+        return
+
+    texts = [cleanResume(text) for _, text in load_resumes(limit=args.samples)]
+    print(f"{len(texts)} resumes, SparseKNN built in {build_time * 1000:.1f} ms "
+          f"({knn.train_matrix_t.shape[1]} training rows x {knn.train_matrix_t.shape[0]} features, nnz={knn.train_matrix_t.nnz})\n")
+
+    # One call each first, so imports / lazy initialisation are not timed
+    dense_predict(model, tfidf, texts[0])
+    sparse_predict(knn, tfidf, texts[0])
+
+    results = {}
+    for label, func in (("dense (toarray + predict)", lambda text: dense_predict(model, tfidf, text)),
+                        ("sparse (SparseKNN)", lambda text: sparse_predict(knn, tfidf, text))):
+        latencies, peaks, predictions = measure(func, texts)
+        results[label] = predictions
+        print(format_latency_row(label, latencies) +
+              f"  peak mem p50={percentile(peaks, 50) / 1024:8.1f} KB  max={max(peaks) / 1024:8.1f} KB")
+
+    dense, sparse_ = results.values()
+    agree = sum(a == b for a, b in zip(dense, sparse_))
+    print(f"\nIdentical predictions: {agree}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import re
+import time
+from collections import Counter
+from Resume_Compact import resume_sections
+from Scoring.Keyword_Match import KeywordAutomaton, dictionary_phrases, keyword_terms, keyword_match, job_terms, split_tokens
+from Benchmarks.Bench_Utils import load_resumes, format_latency_row, SAMPLE_JOB_DESCRIPTION
+
+## Microbenchmark of the local keyword engine (Scoring/Keyword_Match.py).
+## Builds an automaton over a --terms sized dictionary (the shipped skill dictionary padded with frequent
+## words / bigrams from ResumeDataSet.csv) and times one matching pass per resume, against a per-term regex scan.
+## Run Command (from Analyze) : python -m Benchmarks.Keyword_Match_Benchmark --terms 10000
+
+
+def build_dictionary(resumes, size):
+    phrases = dictionary_phrases(keyword_terms['terms'])
+    counts = Counter()
+    for _, text in resumes:
+        tokens = [t for t in split_tokens(text) if len(t) > 2 and t.isalpha()]
+        counts.update(tokens)
+        counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for phrase, _ in counts.most_common():
+        if len(phrases) >= size:
+            break
+        phrases.setdefault(phrase, phrase)
+    return phrases
+
+
+def time_each(func, items):
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Aho-Corasick keyword engine")
+    parser.add_argument('--terms', type=int, default=10000, help="Dictionary size")
+    parser.add_argument('--baseline-samples', type=int, default=20, help="Resumes for the per-term regex baseline")
+    args = parser.parse_args()
+
+    resumes = load_resumes(min_length=100)
+    texts = [text for _, text in resumes]
+    phrases = build_dictionary(resumes, args.terms)
+
+    start = time.perf_counter()
+    automaton = KeywordAutomaton(phrases)
+    build_time = time.perf_counter() - start
+    print(f"{len(phrases)} phrases -> {len(automaton)} automaton states, built in {build_time * 1000:.1f} ms")
+    print(f"{len(texts)} resumes, avg {sum(map(len, texts)) / len(texts):.0f} characters\n")
+
+    print(format_latency_row("automaton, whole resume", time_each(automaton.find_terms, texts)))
+
+    sections = [resume_sections(text) for text in texts]
+    print(format_latency_row("automaton, per section", time_each(
+        lambda secs: [automaton.find_terms('\n'.join(lines)) for _, lines in secs], sections)))
+
+    # keyword_match with the job description terms cached (the API path after the first request)
+    job_terms(SAMPLE_JOB_DESCRIPTION)
+    print(format_latency_row("keyword_match (sample JD)", time_each(
+        lambda text: keyword_match.__wrapped__(text, SAMPLE_JOB_DESCRIPTION), texts)))
+
+    patterns = [re.compile(r'(?<![a-z0-9])' + re.escape(p) + r'(?![a-z0-9])') for p in phrases]
+    baseline = time_each(lambda text: {p.pattern for p in patterns if p.search(text.lower())}, texts[:args.baseline_samples])
+    print(format_latency_row("regex per term (baseline)", baseline))
+
+
+if __name__ == "__main__":
+    main()
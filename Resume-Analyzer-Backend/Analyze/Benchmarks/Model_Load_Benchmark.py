@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from Benchmarks.Bench_Utils import percentile
+
+## Loading the job-role model in every API worker: the pickles (JOB_ROLE_MODEL_FORMAT=pickle) against the
+## memory-mapped artifact (Job_Role/Model_Artifact.py, export it first). For each format, --workers processes
+## are started together, each loads the model and predicts once, then all of them report their memory while
+## still alive: private memory added by the model, and PSS (shared pages counted once across the processes),
+## which is what N workers really cost on the machine. Linux only (/proc/self/smaps_rollup).
+## Run Command (from Analyze) : python -m Benchmarks.Model_Load_Benchmark --workers 4 --runs 3
+
+CHILD_SCRIPT = """
+import json, sys, time
+import numpy, scipy.sparse, sklearn.feature_extraction.text
+import Job_Role.Get_Job_Category as job_category
+
+def memory():
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {'rss': values['Rss'], 'pss': values['Pss'], 'private': values['Private_Clean'] + values['Private_Dirty']}
+
+before = memory()
+start = time.perf_counter()
+if job_category.load_artifact() is None:
+    job_category.load_models()
+    job_category.load_sparse_knn()
+loaded = time.perf_counter() - start
+job_category.predict_resume_category("Python developer with Django, SQL and machine learning experience")
+first_prediction = time.perf_counter() - start - loaded
+print("LOADED", flush=True)
+sys.stdin.readline()  # wait until every worker has loaded, so shared pages are shared while measuring
+after = memory()
+print("RESULT " + json.dumps({'load': loaded, 'predict': first_prediction, 'format': 'artifact' if job_category.load_artifact() else 'pickle',
+                              'rss': after['rss'] - before['rss'], 'private': after['private'] - before['private'], 'pss': after['pss']}), flush=True)
+"""
+
+
+def run_workers(model_format, workers):
+    env = dict(os.environ, JOB_ROLE_MODEL_FORMAT=model_format)
+    children = [subprocess.Popen([sys.executable, '-W', 'ignore', '-c', CHILD_SCRIPT], env=env, text=True,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE) for _ in range(workers)]
+    for child in children:
+        line = child.stdout.readline()
+        if not line.startswith("LOADED"):
+            raise RuntimeError(f"Worker failed: {child.stderr.read().strip()[-500:]}")
+    results = []
+    for child in children:
+        child.stdin.write("\n")
+        child.stdin.flush()
+        for line in child.stdout:
+            if line.startswith("RESULT "):
+                results.append(json.loads(line[len("RESULT "):]))
+        child.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading the job-role model: pickles vs memory-mapped artifact")
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes alive at the same time")
+    parser.add_argument('--runs', type=int, default=3, help="Repetitions per format")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.runs} runs per format\n")
+    for model_format in ("pickle", "artifact"):
+        runs = [run_workers(model_format, args.workers) for _ in range(args.runs)]
+        results = [r for run in runs for r in run]
+        if any(r['format'] != model_format for r in results):
+            print(f"{model_format:<9} ❌ not used (export the artifact first: python -m Job_Role.Model_Artifact export)")
+            continue
+        loads = [r['load'] for r in results]
+        predicts = [r['predict'] for r in results]
+        private = percentile([r['private'] for r in results], 50) / 1024
+        rss = percentile([r['rss'] for r in results], 50) / 1024
+        total_pss = percentile([sum(r['pss'] for r in run) for run in runs], 50) / 1024
+        print(f"{model_format:<9} load p50={percentile(loads, 50) * 1000:7.1f} ms  first predict p50={percentile(predicts, 50) * 1000:6.1f} ms  "
+              f"per worker: +{rss:6.1f} MB RSS, +{private:6.1f} MB private  all {args.workers} workers: {total_pss:7.1f} MB PSS")
+
+
+if __name__ == "__main__":
+    main()
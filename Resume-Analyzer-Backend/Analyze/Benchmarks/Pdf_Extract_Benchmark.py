@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+from io import BytesIO
+import PyPDF2
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from Pdf_Extract import extract_pdf, PDF_WORKERS
+from Benchmarks.Bench_Utils import load_resumes
+
+## PDF text extraction over a generated corpus of multi-page PDFs (ResumeDataSet.csv text laid out with reportlab,
+## a full page of text per page): the original loop (every page, text += page text) against extract_pdf in one
+## worker process and spread over several (Pdf_Extract.py; PDF_WORKERS=0 parses in this process instead). The first
+## pass checks that extract_pdf returns exactly the original text when nothing stops it early. The second pass uses the default budgets
+## (PDF_MAX_PAGES / PDF_TIME_BUDGET / PDF_TEXT_TARGET), which is what a huge upload costs a worker now.
+## Run Command (from Analyze) : python -m Benchmarks.Pdf_Extract_Benchmark --pages 1 3 10 30 100 300 --documents 3
+
+
+def make_pdf(text: str, pages: int) -> bytes:
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    words = text.split()
+    position = 0
+    for _ in range(pages):
+        y = 800
+        while y > 40:
+            line = []
+            while len(' '.join(line)) < 95:
+                line.append(words[position % len(words)])
+                position += 1
+            pdf.drawString(30, y, ' '.join(line))
+            y -= 14
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+def original_extract(data: bytes) -> str:
+    pdf_reader = PyPDF2.PdfReader(BytesIO(data))
+    text = ""
+    for page in pdf_reader.pages:
+        extracted = page.extract_text()
+        if extracted:
+            text += extracted
+    return text
+
+def timed(func, documents):
+    start = time.perf_counter()
+    results = [func(data) for data in documents]
+    return (time.perf_counter() - start) / len(documents), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bounded / parallel PDF text extraction")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 3, 10, 30, 100, 300], help="Page counts of the generated PDFs")
+    parser.add_argument('--documents', type=int, default=3, help="PDFs per page count")
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    text = ' '.join(resume for _, resume in rng.sample(load_resumes(min_length=1000), 40))
+    extract_pdf(make_pdf(text, 2), parallel_pages=1)  # start the process pool outside the timings
+    print(f"Process pool: {PDF_WORKERS} workers\n")
+
+    print(f"{'pages':>5} {'KB':>7} | {'original':>10} | {'sequential':>10} {'parallel':>10} {'same text':>9} | "
+          f"{'budgeted':>10} {'read':>5} stopped")
+    for pages in args.pages:
+        documents = [make_pdf(text[rng.randrange(len(text) // 2):], pages) for _ in range(args.documents)]
+        size = sum(len(data) for data in documents) / len(documents) / 1024
+
+        original_seconds, original = timed(original_extract, documents)
+        unbounded = dict(max_pages=10 ** 6, time_budget=10 ** 6, text_target=0)
+        sequential_seconds, sequential = timed(lambda data: extract_pdf(data, parallel_pages=0, **unbounded), documents)
+        parallel_seconds, parallel = timed(lambda data: extract_pdf(data, parallel_pages=1, **unbounded), documents)
+        same = sum(a == s['text'] == p['text'] for a, s, p in zip(original, sequential, parallel))
+        budgeted_seconds, budgeted = timed(extract_pdf, documents)
+
+        print(f"{pages:>5} {size:>7.0f} | {original_seconds * 1000:8.1f}ms | {sequential_seconds * 1000:8.1f}ms "
+              f"{parallel_seconds * 1000:8.1f}ms {same:>5}/{len(documents):<3} | {budgeted_seconds * 1000:8.1f}ms "
+              f"{budgeted[0]['pages_read']:>5} {budgeted[0]['stopped'] or '-'}{' (pool)' if budgeted[0]['parallel'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
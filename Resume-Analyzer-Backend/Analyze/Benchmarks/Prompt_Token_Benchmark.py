@@ -0,0 +1,83 @@
+import argparse
+import time
+import Analyze_Resume
+import Resume_Compact
+from Analyze_Resume import build_workflow, check_resume_rules, set_llm_provider
+from Node_Trace import NodeTimingTrace
+from Benchmarks.Bench_Utils import load_resumes, percentile, format_latency_row, SAMPLE_JOB_DESCRIPTION
+
+## Input tokens and latency per LLM node with full vs compact prompt inputs (Resume_Compact.py).
+## The Overall_Score LLM fallback is forced on, so all three LLM nodes of the chain are measured.
+## Offline by default (--provider fake counts ~4 characters per token); use --provider groq for real token counts and latency.
+## Run Command (from Analyze) : python -m Benchmarks.Prompt_Token_Benchmark --samples 50
+
+
+def run_setting(workflow, samples, compaction):
+    Resume_Compact.PROMPT_COMPACTION = compaction
+    per_node = {}  # node -> {'input_tokens': [...], 'latency': [...]}
+    totals, failures = [], 0
+    for _, resume_text in samples:
+        trace = NodeTimingTrace()
+        state = {'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION}
+        try:
+            workflow.invoke(state, config={'callbacks': [trace]})
+        except Exception as e:
+            print(f"  analysis failed: {str(e)[:120]}")
+            failures += 1
+            continue
+        for span in trace.spans:
+            tokens = trace.tokens.get(span['node'])
+            if tokens:
+                node = per_node.setdefault(span['node'], {'input_tokens': [], 'latency': []})
+                node['input_tokens'].append(tokens['input_tokens'])
+                node['latency'].append(span['duration'])
+        totals.append(trace.summary()['input_tokens'])
+    return per_node, totals, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt input tokens with and without compaction")
+    parser.add_argument('--samples', type=int, default=50, help="Number of resumes from ResumeDataSet.csv")
+    parser.add_argument('--provider', choices=("groq", "replay", "fake"), default="fake", help="LLM provider")
+    parser.add_argument('--cassette', help="Cassette file for replay (defaults to LLM_CASSETTE)")
+    args = parser.parse_args()
+    set_llm_provider(args.provider, args.cassette)
+    Analyze_Resume.OVERALL_SCORE_ENGINE = "llm"
+
+    samples = []
+    for category, resume_text in load_resumes(min_length=100):
+        try:
+            check_resume_rules({'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION})
+        except ValueError:
+            continue
+        samples.append((category, resume_text))
+        if len(samples) >= args.samples:
+            break
+
+    # Cost of building the compact representation itself (uncached)
+    start = time.perf_counter()
+    for _, resume_text in samples:
+        Resume_Compact.compact_inputs.__wrapped__(resume_text, SAMPLE_JOB_DESCRIPTION)
+    build_time = (time.perf_counter() - start) / max(1, len(samples))
+
+    print(f"Benchmarking {len(samples)} resumes (provider={args.provider})")
+    print(f"compact_inputs build time: {build_time * 1e6:.1f} us per resume\n")
+    workflow = build_workflow("chain")
+    results = {}
+    for label, compaction in (("full", False), ("compact", True)):
+        per_node, totals, failures = run_setting(workflow, samples, compaction)
+        results[label] = totals
+        print(f"[{label}] failures={failures}")
+        for node, values in per_node.items():
+            avg_tokens = sum(values['input_tokens']) / len(values['input_tokens'])
+            print(format_latency_row(f"  {node}", values['latency']) + f"  avg input tokens={avg_tokens:9.1f}")
+        print()
+
+    full, compact = sum(results['full']), sum(results['compact'])
+    if full:
+        print(f"Input tokens per analysis: full={full / len(results['full']):.1f}  compact={compact / len(results['compact']):.1f}  "
+              f"reduction={(1 - compact / full) * 100:.1f}%  (p95 compact={percentile(results['compact'], 95)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import tempfile
+from io import BytesIO
+import PyPDF2
+from Report.resume_report import generate_resume_report, is_complete_pdf
+from Benchmarks.Bench_Utils import load_resumes, time_call, format_latency_row
+
+## Report PDF cost per analysis. Before lazy rendering every upload paid for the reportlab render, a PyPDF2 re-parse
+## inside generate_resume_report, a local copy under Report/Resume_Reports and a second PyPDF2 parse in
+## DB_Handle.attach_files; now an upload renders nothing and the first download pays one render with the cheap
+## is_complete_pdf check (later downloads are a GridFS read). Analyses are built from ResumeDataSet.csv sentences.
+## Run Command (from Analyze) : python -m Benchmarks.Report_Render_Benchmark --analyses 50
+
+
+def sample_analysis(rng, sentences):
+    points = lambda n: rng.sample(sentences, n)
+    return {
+        'ats_score': rng.randint(30, 95), 'content_score': rng.randint(30, 95), 'format_design_score': rng.randint(30, 95),
+        'overall_score': rng.randint(30, 95), 'ai_job_category': 'Data Science', 'ml_job_category': 'Data Science',
+        'strengths': points(5), 'weakness': points(5), 'content_improvements': points(4),
+        'format_design_improvements': points(4), 'key_improvements': points(5), 'conclusion': ' '.join(points(4)),
+    }
+
+def parse_check(pdf_bytes):
+    if len(PyPDF2.PdfReader(BytesIO(pdf_bytes)).pages) == 0:
+        raise ValueError("empty")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs lazy report rendering")
+    parser.add_argument('--analyses', type=int, default=50, help="Analyses to render")
+    args = parser.parse_args()
+
+    rng = random.Random(25)
+    sentences = [s.strip()[:220] for _, text in load_resumes(limit=300) for s in text.split('.') if len(s.strip()) > 40]
+    analyses = [sample_analysis(rng, sentences) for _ in range(args.analyses)]
+
+    render, eager, parse, cheap = [], [], [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for index, analysis in enumerate(analyses):
+            pdf_bytes, seconds = time_call(generate_resume_report, analysis, user_name="Benchmark User")
+            render.append(seconds)
+            # The old upload path: render, re-parse, write the local copy, parse again before storing
+            output_path = os.path.join(directory, f"{index}_Report.pdf")
+            _, seconds = time_call(lambda: (parse_check(generate_resume_report(analysis, "Benchmark User", output_path)),
+                                            parse_check(pdf_bytes)))
+            eager.append(seconds)
+            parse.append(time_call(parse_check, pdf_bytes)[1])
+            cheap.append(time_call(is_complete_pdf, pdf_bytes)[1])
+
+    print(format_latency_row("upload, eager (before)", eager) + "   (lazy: nothing at upload)")
+    print(format_latency_row("first download render", render))
+    print(format_latency_row("validate: PyPDF2 parse", parse))
+    print(format_latency_row("validate: is_complete_pdf", cheap))
+
+
+if __name__ == "__main__":
+    main()
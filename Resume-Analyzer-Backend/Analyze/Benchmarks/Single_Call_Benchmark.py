@@ -0,0 +1,63 @@
+import argparse
+from langchain_core.callbacks import get_usage_metadata_callback
+from Analyze_Resume import build_workflow, check_resume_rules, set_llm_provider
+from Benchmarks.Bench_Utils import load_resumes, time_call, format_latency_row, SAMPLE_JOB_DESCRIPTION
+
+## Compares the three-call "chain" workflow against the "single_call" workflow on real resumes.
+## Reports p50 / p95 latency per resume and the average input / output tokens each mode sends to the LLM.
+## Needs GROQ_API_KEY (every sample costs one full analysis per mode), or runs offline with --provider replay / fake
+## (record a cassette first with --provider record; offline providers are not held to the LLM_RPM / LLM_TPM budgets).
+## Run Command (from Analyze) : python -m Benchmarks.Single_Call_Benchmark --samples 20
+
+
+def run_mode(mode, samples):
+    workflow = build_workflow(mode)
+    latencies, input_tokens, output_tokens, failures = [], [], [], 0
+
+    for _, resume_text in samples:
+        state = {'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION}
+        with get_usage_metadata_callback() as usage:
+            try:
+                _, elapsed = time_call(workflow.invoke, state)
+            except Exception as e:
+                print(f"  [{mode}] analysis failed: {str(e)[:120]}")
+                failures += 1
+                continue
+        latencies.append(elapsed)
+        input_tokens.append(sum(u.get('input_tokens', 0) for u in usage.usage_metadata.values()))
+        output_tokens.append(sum(u.get('output_tokens', 0) for u in usage.usage_metadata.values()))
+
+    return latencies, input_tokens, output_tokens, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chain vs single-call analysis modes")
+    parser.add_argument('--samples', type=int, default=10, help="Number of resumes from ResumeDataSet.csv")
+    parser.add_argument('--provider', choices=("groq", "record", "replay", "fake"), help="LLM provider (defaults to LLM_PROVIDER)")
+    parser.add_argument('--cassette', help="Cassette file for record / replay (defaults to LLM_CASSETTE)")
+    args = parser.parse_args()
+    if args.provider:
+        set_llm_provider(args.provider, args.cassette)
+
+    # Only keep resumes that pass the local rule check, so both modes reach the LLM
+    samples = []
+    for category, resume_text in load_resumes(min_length=100):
+        try:
+            check_resume_rules({'resume_content': resume_text, 'job_description': SAMPLE_JOB_DESCRIPTION})
+        except ValueError:
+            continue
+        samples.append((category, resume_text))
+        if len(samples) >= args.samples:
+            break
+
+    print(f"Benchmarking {len(samples)} resumes per mode\n")
+    for mode in ("chain", "single_call"):
+        latencies, input_tokens, output_tokens, failures = run_mode(mode, samples)
+        avg_in = sum(input_tokens) / len(input_tokens) if input_tokens else 0
+        avg_out = sum(output_tokens) / len(output_tokens) if output_tokens else 0
+        print(format_latency_row(mode, latencies))
+        print(f"{'':<28} avg input tokens={avg_in:10.1f}  avg output tokens={avg_out:8.1f}  failures={failures}\n")
+
+
+if __name__ == "__main__":
+    main()
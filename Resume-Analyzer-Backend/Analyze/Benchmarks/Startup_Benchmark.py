@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from Benchmarks.Bench_Utils import percentile
+
+## Cold start of an API process, as a freshly autoscaled replica sees it.
+## Every run is a new interpreter: time to `import main` (when uvicorn can start serving), then the lifespan
+## warmup (Warmup.py) until GET /ready would answer 200, with the time of each warmup step.
+## --importtime lists the modules that dominate the import (python -X importtime, cumulative).
+## Run Command (from Analyze) : python -m Benchmarks.Startup_Benchmark --runs 5 --provider fake
+
+CHILD_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+start = time.perf_counter()
+asyncio.run(main.readiness.awarmup())
+warmup = time.perf_counter() - start
+print("RESULT " + json.dumps({'import': imported, 'warmup': warmup, 'ready': main.readiness.is_ready(),
+                              'steps': {name: status['seconds'] for name, status in main.readiness.status.items()}}))
+"""
+
+
+def run_child(env):
+    completed = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD_SCRIPT], env=env, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"Startup run failed: {completed.stderr.strip()[-500:]}")
+
+def top_imports(env, count):
+    completed = subprocess.run([sys.executable, '-W', 'ignore', '-X', 'importtime', '-c', 'import main'], env=env, capture_output=True, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and '|' in line:
+            _, cumulative, name = line[len("import time:"):].split('|')
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API process import time and warmup")
+    parser.add_argument('--runs', type=int, default=5, help="Number of fresh interpreters")
+    parser.add_argument('--provider', choices=("groq", "replay", "fake"), default=None, help="LLM_PROVIDER for the runs (defaults to the environment)")
+    parser.add_argument('--importtime', type=int, default=0, metavar='N', help="Also list the N slowest imports (cumulative)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.provider:
+        env['LLM_PROVIDER'] = args.provider
+
+    results = [run_child(env) for _ in range(args.runs)]
+    imports = [r['import'] for r in results]
+    warmups = [r['warmup'] for r in results]
+    totals = [r['import'] + r['warmup'] for r in results]
+    print(f"{args.runs} cold starts (provider={env.get('LLM_PROVIDER', 'groq')})\n")
+    for label, values in (("import main", imports), ("warmup (parallel)", warmups), ("import + warmup", totals)):
+        print(f"{label:<28} p50={percentile(values, 50):7.3f} s  max={max(values):7.3f} s")
+    print(f"ready after warmup: {sum(r['ready'] for r in results)}/{args.runs}\n")
+
+    print("Warmup steps (p50 seconds; groups run in parallel, so the warmup takes about the slowest group):")
+    for name in results[0]['steps']:
+        values = [r['steps'][name] or 0.0 for r in results]
+        print(f"  {name:<26} {percentile(values, 50):7.3f} s")
+
+    if args.importtime:
+        print(f"\nSlowest imports of main (cumulative):")
+        for microseconds, name in top_imports(env, args.importtime):
+            print(f"  {microseconds / 1e6:7.3f} s  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import random
+import time
+from io import BytesIO
+import docx
+import PyPDF2
+from Text_Extract import extract_text, extractor_stats
+from Pdf_Extract import start_workers
+from Job_Role.Text_Normalize import normalize_extracted_text
+from Benchmarks.Bench_Utils import load_resumes
+from Benchmarks.Pdf_Extract_Benchmark import make_pdf
+
+## Resume text extraction per format: the original extension-based helpers of Job_Role/app.py (PyPDF2 page loop,
+## python-docx document model, decode) against the magic-byte registry (Text_Extract.extract_text: budgeted PDF,
+## streamed DOCX, zero-parse TXT) on the same ResumeDataSet.csv texts saved as PDF / DOCX / TXT.
+## "same" counts files whose registry text equals the original helper's text after normalize_extracted_text.
+## Run Command (from Analyze) : python -m Benchmarks.Text_Extract_Benchmark --documents 20
+
+
+def make_docx(text: str) -> bytes:
+    document = docx.Document()
+    for line in text.split('. '):
+        document.add_paragraph(line)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def original_pdf(data: bytes) -> str:
+    text = ''
+    for page in PyPDF2.PdfReader(BytesIO(data)).pages:
+        text += page.extract_text() or ''
+    return text
+
+def original_docx(data: bytes) -> str:
+    text = ''
+    for paragraph in docx.Document(BytesIO(data)).paragraphs:
+        text += paragraph.text + '\n'
+    return text
+
+def original_txt(data: bytes) -> str:
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-format resume text extractors")
+    parser.add_argument('--documents', type=int, default=20, help="Resumes per format")
+    parser.add_argument('--pages', type=int, default=2, help="Pages of the generated PDFs")
+    args = parser.parse_args()
+
+    resumes = [text for _, text in random.Random(23).sample(load_resumes(min_length=1000), args.documents)]
+    start_workers()  # the PDF worker processes are started outside the timings, like the API warmup does
+    formats = {
+        'pdf': ([make_pdf(text, args.pages) for text in resumes], original_pdf),
+        'docx': ([make_docx(text) for text in resumes], original_docx),
+        'txt': ([text.encode('utf-8') for text in resumes], original_txt),
+    }
+
+    print(f"{'format':<6} {'KB':>6} | {'original':>10} | {'registry':>10} {'speedup':>8} {'same':>7}")
+    for name, (documents, original) in formats.items():
+        size = sum(len(data) for data in documents) / len(documents) / 1024
+        start = time.perf_counter()
+        expected = [normalize_extracted_text(original(data)) for data in documents]
+        original_seconds = (time.perf_counter() - start) / len(documents)
+        start = time.perf_counter()
+        results = [extract_text(data) for data in documents]
+        registry_seconds = (time.perf_counter() - start) / len(documents)
+        same = sum(r['text'] == e and r['format'] == name for r, e in zip(results, expected))
+        print(f"{name:<6} {size:>6.1f} | {original_seconds * 1000:8.2f}ms | {registry_seconds * 1000:8.2f}ms "
+              f"{original_seconds / registry_seconds:7.1f}x {same:>3}/{len(documents):<3}")
+
+    print("\nextractor_stats():")
+    for name, stats in extractor_stats().items():
+        print(f"  {name:<5} {stats}")
+
+
+if __name__ == "__main__":
+    main()
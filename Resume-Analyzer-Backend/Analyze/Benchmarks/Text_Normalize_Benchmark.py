@@ -0,0 +1,57 @@
+import argparse
+import random
+import time
+from Job_Role.Text_Normalize import cleanResume, legacy_clean_resume
+from Benchmarks.Bench_Utils import load_resumes
+
+## cleanResume (Job_Role/Text_Normalize.py) against the original seven-pass cleaner on large multi-page resumes:
+## several ResumeDataSet.csv resumes joined with page breaks, as a long PDF extraction looks. --links adds a URL,
+## hashtag and mention to every page, so every document also goes through the token patterns.
+## Also checks that every output is byte-identical to the original.
+## Run Command (from Analyze) : python -m Benchmarks.Text_Normalize_Benchmark --documents 50 --pages 10 --links
+
+
+def build_documents(count, pages, links, seed=18):
+    rng = random.Random(seed)
+    texts = [text for _, text in load_resumes(min_length=1000)]
+    documents = []
+    for _ in range(count):
+        page_texts = rng.sample(texts, pages)
+        if links:
+            page_texts = [f"{page} https://www.linkedin.com/in/candidate-{i} #portfolio @candidate" for i, page in enumerate(page_texts)]
+        documents.append("\n\f".join(page_texts))
+    return documents
+
+def timed(func, documents, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(text) for text in documents]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job-role text cleaner on large multi-page resumes")
+    parser.add_argument('--documents', type=int, default=50, help="Number of synthetic documents")
+    parser.add_argument('--pages', type=int, default=10, help="Dataset resumes joined into one document")
+    parser.add_argument('--links', action='store_true', help="Add a URL / hashtag / mention to every page")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs (best is reported)")
+    args = parser.parse_args()
+
+    documents = build_documents(args.documents, args.pages, args.links)
+    megabytes = sum(len(text) for text in documents) / 1e6
+    print(f"{len(documents)} documents x {args.pages} pages, {megabytes:.1f} M characters "
+          f"(avg {megabytes * 1e3 / len(documents):.0f} K per document)\n")
+
+    legacy_seconds, legacy = timed(legacy_clean_resume, documents, args.repeat)
+    seconds, cleaned = timed(cleanResume, documents, args.repeat)
+    for label, elapsed in (("original (7 x re.sub)", legacy_seconds), ("cleanResume", seconds)):
+        print(f"{label:<24} {elapsed * 1000:9.1f} ms  {megabytes / elapsed:7.1f} M chars/s  "
+              f"{elapsed / len(documents) * 1000:7.2f} ms/document")
+    print(f"\nSpeed-up: {legacy_seconds / seconds:.1f}x, byte-identical outputs: "
+          f"{sum(a == b for a, b in zip(cleaned, legacy))}/{len(documents)}")
+
+
+if __name__ == "__main__":
+    main()
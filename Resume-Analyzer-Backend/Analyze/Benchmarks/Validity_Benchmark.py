@@ -0,0 +1,62 @@
+import argparse
+import time
+from Validity.Get_Validity import find_injection, find_code, resume_validity, VALIDITY_ACCEPT, VALIDITY_REJECT
+from Validity.Train_Validity_Model import build_corpus, SEED
+from Benchmarks.Bench_Utils import format_latency_row
+
+## Validate_Resume LLM calls avoided by the local validity check (Validity/Get_Validity.py).
+## Runs the injection screen + classifier over the held-out part of the labeled corpus the model was trained
+## against (Validity/Train_Validity_Model.py) and reports, per document kind, how many are decided locally,
+## how many would still be escalated to the LLM, and how many local decisions are wrong.
+## Run Command (from Analyze) : python -m Benchmarks.Validity_Benchmark --accept 0.9 --reject 0.1
+
+
+def local_decision(text, accept, reject):
+    """(verdict, source): verdict True / False / None (escalate), source 'screen' or 'classifier'."""
+    if find_injection(text):
+        return False, 'screen'
+    if find_code(text):
+        return None, 'screen'
+    verdict, _ = resume_validity(text, accept, reject)
+    return verdict, 'classifier'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local validity check against the LLM validator")
+    parser.add_argument('--accept', type=float, default=VALIDITY_ACCEPT, help="P(resume) accepted without the LLM")
+    parser.add_argument('--reject', type=float, default=VALIDITY_REJECT, help="P(resume) rejected without the LLM")
+    parser.add_argument('--seed', type=int, default=SEED, help="Corpus seed (must match the one the model was trained with)")
+    args = parser.parse_args()
+
+    samples = build_corpus(args.seed)['test']
+    rows, latencies = {}, []
+    for text, label, kind in samples:
+        start = time.perf_counter()
+        verdict, source = local_decision(text, args.accept, args.reject)
+        latencies.append(time.perf_counter() - start)
+        row = rows.setdefault(kind, {'n': 0, 'accepted': 0, 'rejected': 0, 'escalated': 0, 'screen': 0, 'wrong': 0})
+        row['n'] += 1
+        if verdict is None:
+            row['escalated'] += 1
+            continue
+        row['accepted' if verdict else 'rejected'] += 1
+        row['screen'] += source == 'screen'
+        row['wrong'] += int(verdict) != label
+
+    print(f"{len(samples)} held-out documents, accept >= {args.accept}, reject <= {args.reject}\n")
+    print(f"{'kind':<18} {'n':>5} {'accepted':>9} {'rejected':>9} {'(screen)':>9} {'escalated':>10} {'wrong':>6}")
+    for kind, row in sorted(rows.items()):
+        print(f"{kind:<18} {row['n']:>5} {row['accepted']:>9} {row['rejected']:>9} {row['screen']:>9} {row['escalated']:>10} {row['wrong']:>6}")
+
+    total = len(samples)
+    escalated = sum(row['escalated'] for row in rows.values())
+    wrong = sum(row['wrong'] for row in rows.values())
+    decided = total - escalated
+    print(f"\nValidate_Resume LLM calls: {escalated}/{total} ({escalated / total * 100:.1f}%)  "
+          f"-> reduction {decided / total * 100:.1f}%")
+    print(f"Local decision error rate: {wrong}/{decided} ({wrong / max(1, decided) * 100:.2f}%)")
+    print(format_latency_row("local check per document", latencies))
+
+
+if __name__ == "__main__":
+    main()
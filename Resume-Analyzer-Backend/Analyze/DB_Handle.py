@@ -1,11 +1,18 @@
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import gridfs
 from dotenv import load_dotenv
+import argparse
+import hashlib
 import os
 from bson import ObjectId
 from io import BytesIO
-import PyPDF2
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from Report.resume_report import is_complete_pdf
 
 # Load environment variables
 load_dotenv()
@@ -14,13 +21,17 @@ MONGODB_URI = os.getenv("MONGODB_URI")
 DB_NAME = os.getenv("DB_NAME")
 
 # Setting up Database Connection
+# MongoClient connects in the background on first use; the API pings it during startup (see ping_db / Warmup.py)
 client = MongoClient(MONGODB_URI, server_api=ServerApi('1'))
 
-try:
-    client.admin.command('ping')
-    print("Pinged your deployment. You successfully connected to MongoDB!")
-except Exception as e:
-    print("MongoDB connection error:", str(e))
+def ping_db() -> bool:
+    try:
+        client.admin.command('ping')
+        print("Pinged your deployment. You successfully connected to MongoDB!")
+        return True
+    except Exception as e:
+        print("MongoDB connection error:", str(e))
+        return False
 
 # Creating/Connecting to Database
 db = client[DB_NAME]
@@ -29,37 +40,124 @@ db = client[DB_NAME]
 fs = gridfs.GridFS(db)
 
 
-def saveToDb(AI_Response, username, resume_file, resume_report, resume_file_name, today_date):
+# ---------------------------
+# Content-addressed Blob Storage
+# ---------------------------
+# Resumes and reports are stored in GridFS once per distinct content. fs.blobs maps a file's SHA-256 to its GridFS id
+# and counts the documents pointing at it: the count moves with an atomic $inc when a document is saved or deleted,
+# and the GridFS file is removed with its last reference. collect_blob_garbage sweeps what a crash leaves behind.
+BLOB_COLLECTION = "fs.blobs"
+BLOB_GC_GRACE = int(os.getenv("BLOB_GC_GRACE", "3600"))  # seconds; younger blobs / files may belong to a save in flight and are never swept
+blob_index_ready = False
+
+def blob_collection():
+    global blob_index_ready
+    collection = db[BLOB_COLLECTION]
+    if not blob_index_ready:
+        collection.create_index('file_id', unique=True)
+        blob_index_ready = True
+    return collection
+
+def put_blob(data: bytes, filename: str) -> str:
+    """
+    Store a file once per content: if the same bytes are already stored, add a reference to that GridFS file,
+    otherwise write a new one. The hash is computed here from the bytes, never taken from the caller.
 
-    try:
-        # Ensure resume_file is at the start
-        if isinstance(resume_file, BytesIO):
-            resume_file.seek(0)
+    Returns:
+        str: The GridFS file id.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    blobs = blob_collection()
+    while True:
+        now = datetime.now(timezone.utc)
+        blob = blobs.find_one_and_update({'_id': digest}, {'$inc': {'refs': 1}, '$set': {'updated_at': now}},
+                                         return_document=ReturnDocument.AFTER)
+        if blob is not None:
+            return str(blob['file_id'])
+
+        file_id = fs.put(data, filename=filename, sha256=digest)
+        try:
+            blobs.insert_one({'_id': digest, 'file_id': file_id, 'length': len(data), 'refs': 1, 'created_at': now, 'updated_at': now})
+            return str(file_id)
+        except DuplicateKeyError:
+            # Another worker stored the same content at the same time: drop this copy and reference theirs
+            fs.delete(file_id)
+
+def reclaim_blob(digest: str) -> int:
+    """Delete an unreferenced blob and its GridFS file. Returns the bytes freed (0 if it was referenced again meanwhile)."""
+    blob = blob_collection().find_one_and_delete({'_id': digest, 'refs': {'$lte': 0}})
+    if blob is None:
+        return 0
+    fs.delete(blob['file_id'])
+    return blob['length']
+
+def release_blob(file_id):
+    """
+    Drop one reference to a stored file, deleting it with its last reference.
+    Files stored before the blob layer (no fs.blobs entry) are deleted directly, as before.
+    """
+    file_id = ObjectId(file_id)
+    blob = blob_collection().find_one_and_update({'file_id': file_id}, {'$inc': {'refs': -1}, '$set': {'updated_at': datetime.now(timezone.utc)}},
+                                                 return_document=ReturnDocument.AFTER)
+    if blob is None:
+        fs.delete(file_id)
+    elif blob['refs'] <= 0:
+        reclaim_blob(blob['_id'])
 
-        # Store resume file in GridFS
-        resume_id = fs.put(resume_file, filename=f"{username}_resume")
-        AI_Response["resume_file_id"] = str(resume_id)
-        
-        # Store report file in GridFS only if it exists
-        if resume_report is not None:
-            try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(resume_report))
-                if len(pdf_reader.pages) == 0:
-                    raise ValueError("Resume report PDF is empty")
-                report_id = fs.put(resume_report, filename=f"{username}_report")
-                AI_Response["resume_report_id"] = str(report_id)
-            except Exception as e:
-                print(f"❌ Invalid resume report PDF: {str(e)}")
-                AI_Response["resume_report_id"] = None  # Mark as absent but proceed
+
+def attach_files(AI_Response, username, resume_file, resume_report, resume_file_name, today_date):
+    """
+    Store the resume (and report, if any) in GridFS and add the file ids, file name and
+    upload date to AI_Response. Shared by saveToDb and the bulk path (saveManyToDb).
+    Without report bytes, a successful analysis gets a lazy report id (reserve_report): the PDF is rendered
+    from the saved analysis on its first download. Its document '_id' is then assigned here, for the report record.
+    """
+    user_collection(username)  # a reserved name is refused before any file is stored
+
+    # Whole resume, wherever the stream position is
+    resume_bytes = resume_file.getvalue() if isinstance(resume_file, BytesIO) else resume_file
+
+    # Store resume file in GridFS (once per distinct file, see put_blob)
+    AI_Response["resume_file_id"] = put_blob(resume_bytes, filename=f"{username}_resume")
+    
+    # Store report file in GridFS only if it exists
+    if resume_report is not None:
+        if is_complete_pdf(resume_report):
+            AI_Response["resume_report_id"] = put_blob(resume_report, filename=f"{username}_report")
         else:
-            AI_Response["resume_report_id"] = None  # No report for invalid resumes
-            
-        # Adding Resume File Name & Uploaded Date
-        AI_Response['resume_file_name'] = resume_file_name
-        AI_Response['uploaded_date'] = today_date
+            print("❌ Invalid resume report PDF: incomplete PDF data")
+            AI_Response["resume_report_id"] = None  # Mark as absent but proceed
+    elif AI_Response.get('success'):
+        document_id = ObjectId(AI_Response.setdefault('_id', ObjectId()))
+        AI_Response["resume_report_id"] = reserve_report(username, document_id)
+    else:
+        AI_Response["resume_report_id"] = None  # No report for invalid resumes
+        
+    # Adding Resume File Name & Uploaded Date
+    AI_Response['resume_file_name'] = resume_file_name
+    AI_Response['uploaded_date'] = today_date
+    return AI_Response
+
+def user_collection(username: str):
+    """
+    The collection of a user's documents, named after the user.
+
+    Raises:
+        ValueError: If the name is one of the system collections (see is_system_collection).
+    """
+    if is_system_collection(username):
+        raise ValueError(f"'{username}' is a reserved name, not a username")
+    return db[username]
+
+def saveToDb(AI_Response, username, resume_file, resume_report, resume_file_name, today_date):
+
+    # A failed insert keeps its blob references: the insert may have landed anyway, and an extra reference only
+    # delays deletion until collect_blob_garbage recounts, while a missing one could delete a file still in use
+    try:
+        attach_files(AI_Response, username, resume_file, resume_report, resume_file_name, today_date)
         
         # Save JSON document in a collection (per user)
-        collection_data = db[username]
+        collection_data = user_collection(username)
         result = collection_data.insert_one(AI_Response)
 
         AI_Response["_id"] = str(result.inserted_id)
@@ -71,9 +169,57 @@ def saveToDb(AI_Response, username, resume_file, resume_report, resume_file_name
         print("❌ Database Exception:", str(e))
         return None
 
+def get_saved_analysis(document_id: str, username: str):
+    """
+    The analysis saved under document_id, or None if there is none yet.
+    Errors are raised rather than answered with None: a retried job must not take an unreachable database
+    for an unsaved analysis and save it twice.
+    """
+    document = user_collection(username).find_one({'_id': ObjectId(document_id)})
+    if document is not None:
+        document['_id'] = str(document['_id'])
+    return document
+
+def saveManyToDb(documents, username):
+    """
+    Bulk-insert analysis documents (already passed through attach_files) into the user's collection
+    with a single insert_many round trip.
+
+    Args:
+        documents (list[dict]): Documents to insert. Missing '_id's are assigned client-side.
+        username (str): The username associated with the collection.
+
+    Returns:
+        list: Inserted ids as strings (the documents' '_id' is converted too), or None if an error occurs.
+    """
+    if not documents:
+        return []
+    try:
+        for doc in documents:
+            if "_id" not in doc:
+                doc["_id"] = ObjectId()
+            elif isinstance(doc["_id"], str):
+                doc["_id"] = ObjectId(doc["_id"])
+
+        collection_data = user_collection(username)
+        result = collection_data.insert_many(documents, ordered=False)
+
+        for doc in documents:
+            doc["_id"] = str(doc["_id"])
+
+        print(f"✅ {len(result.inserted_ids)} document(s) saved for user {username}.")
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    except Exception as e:
+        print("❌ Database Exception (bulk insert):", str(e))
+        return None
+
 def check_username_exists(username):
     try:
         # Attempt to access the collection; if it doesn't exist, list_collection_names() won't include it
+        # (the system collections exist, but are no users)
+        if is_system_collection(username):
+            return False
         collection_names = db.list_collection_names()
         return username in collection_names
     except Exception as e:
@@ -123,7 +269,7 @@ def get_file_stream(file_id):
 
 def get_report(report_id: str, username: str):
     try:
-        collection_data = db[username]
+        collection_data = user_collection(username)
         
         # Find the document first
         data = collection_data.find_one({'_id': ObjectId(report_id)})
@@ -144,7 +290,7 @@ def get_report(report_id: str, username: str):
 
 def delete_report(report_id: str, username: str):
     try:
-        collection_data = db[username]
+        collection_data = user_collection(username)
         
         # Find the document first
         data = collection_data.find_one({'_id': ObjectId(report_id)})
@@ -152,21 +298,21 @@ def delete_report(report_id: str, username: str):
             print(f"⚠️ No document found with report_id {report_id} for user {username}.")
             return False
 
-        # Delete files from GridFS
-        if 'resume_file_id' in data:
-            fs.delete(ObjectId(data['resume_file_id']))
-        if 'resume_report_id' in data:
-            fs.delete(ObjectId(data['resume_report_id']))
-
         # Delete document from collection
         result = collection_data.delete_one({'_id': ObjectId(report_id)})
-        if result.deleted_count > 0:
-            print(f"✅ Report {report_id} deleted successfully for user {username}.")
-            return True
-        else:
+        if result.deleted_count == 0:
             print(f"⚠️ Document {report_id} was not deleted.")
             return False
 
+        # Then drop its references to the GridFS files (deleted once nothing else points at them)
+        if data.get('resume_file_id'):
+            release_blob(data['resume_file_id'])
+        if data.get('resume_report_id') and not delete_lazy_report(data['resume_report_id']):
+            release_blob(data['resume_report_id'])
+
+        print(f"✅ Report {report_id} deleted successfully for user {username}.")
+        return True
+
     except Exception as e:
         print(f"❌ Error deleting report {report_id}: {str(e)}")
         return False
@@ -182,7 +328,7 @@ def get_all_documents(username: str):
         tuple: (documents, avg_ats_score, score_change)
     """
     try:
-        collection_data = db[username]
+        collection_data = user_collection(username)
         documents = list(collection_data.find())
 
         total_valid_documents = 0
@@ -214,4 +360,498 @@ def get_all_documents(username: str):
 
     except Exception as e:
         print(f"❌ Error retrieving documents for user {username}: {str(e)}")
-        return None, None, None, None
\ No newline at end of file
+        return None, None, None, None
+
+# ---------------------------
+# Analysis Cache (shared tier)
+# ---------------------------
+# Dotted name keeps the cache out of the per-user collection namespace, like GridFS's fs.files / fs.chunks
+ANALYSIS_CACHE_COLLECTION = "cache.analysis"
+analysis_cache_index_ready = False
+
+def get_cached_analysis(cache_key: str):
+    """
+    Look up a cached workflow result by its content-addressed key.
+
+    Returns:
+        dict: The cached ResumeState, or None on a miss / expired entry / error.
+    """
+    try:
+        doc = db[ANALYSIS_CACHE_COLLECTION].find_one({'_id': cache_key, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        return doc['result'] if doc else None
+    except Exception as e:
+        print(f"❌ Error reading analysis cache {cache_key}: {str(e)}")
+        return None
+
+def save_cached_analysis(cache_key: str, result: dict, ttl_seconds: int):
+    """
+    Store a workflow result under its content-addressed key. MongoDB's TTL monitor removes it after ttl_seconds.
+
+    Returns:
+        bool: True if stored, False on error.
+    """
+    global analysis_cache_index_ready
+    try:
+        collection = db[ANALYSIS_CACHE_COLLECTION]
+        if not analysis_cache_index_ready:
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            analysis_cache_index_ready = True
+        collection.replace_one(
+            {'_id': cache_key},
+            {'_id': cache_key, 'result': result, 'expires_at': datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)},
+            upsert=True
+        )
+        return True
+    except Exception as e:
+        print(f"❌ Error writing analysis cache {cache_key}: {str(e)}")
+        return False
+
+
+# ---------------------------
+# Extraction Cache (MongoDB tier)
+# ---------------------------
+# Extracted resume text keyed by the file's SHA-256, kept next to the GridFS buckets (fs.files / fs.chunks)
+EXTRACTION_CACHE_COLLECTION = "fs.extracted_text"
+extraction_cache_index_ready = False
+
+def get_cached_extraction(file_hash: str):
+    """
+    Look up the stored extraction of a file by its SHA-256.
+
+    Returns:
+        dict: The stored extraction (text, format, pages, pages_read, stopped, settings), or None on a miss / expired entry / error.
+    """
+    try:
+        doc = db[EXTRACTION_CACHE_COLLECTION].find_one({'_id': file_hash, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        return doc['extraction'] if doc else None
+    except Exception as e:
+        print(f"❌ Error reading extraction cache {file_hash}: {str(e)}")
+        return None
+
+def save_cached_extraction(file_hash: str, extraction: dict, ttl_seconds: int):
+    """
+    Store the extraction of a file under its SHA-256. MongoDB's TTL monitor removes it after ttl_seconds.
+
+    Returns:
+        bool: True if stored, False on error.
+    """
+    global extraction_cache_index_ready
+    try:
+        collection = db[EXTRACTION_CACHE_COLLECTION]
+        if not extraction_cache_index_ready:
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            extraction_cache_index_ready = True
+        collection.replace_one(
+            {'_id': file_hash},
+            {'_id': file_hash, 'extraction': extraction, 'expires_at': datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)},
+            upsert=True
+        )
+        return True
+    except Exception as e:
+        print(f"❌ Error writing extraction cache {file_hash}: {str(e)}")
+        return False
+
+
+# ---------------------------
+# Job Queue (MongoDB backend)
+# ---------------------------
+JOB_QUEUE_COLLECTION = "queue.jobs"
+job_queue_index_ready = False
+
+def enqueue_job(kind: str, payload: dict):
+    """
+    Insert a queued job.
+
+    Returns:
+        str: The job id, or None if an error occurs.
+    """
+    global job_queue_index_ready
+    try:
+        collection = db[JOB_QUEUE_COLLECTION]
+        if not job_queue_index_ready:
+            collection.create_index([('status', 1), ('locked_until', 1), ('created_at', 1)])
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            job_queue_index_ready = True
+        now = datetime.now(timezone.utc)
+        result = collection.insert_one({
+            'kind': kind, 'payload': payload, 'status': 'queued', 'attempts': 0,
+            'created_at': now, 'updated_at': now, 'locked_until': None, 'worker': None,
+            'result': None, 'error': None
+        })
+        return str(result.inserted_id)
+    except Exception as e:
+        print(f"❌ Error enqueuing job: {str(e)}")
+        return None
+
+def claim_job(worker_id: str, lease_seconds: int, max_attempts: int, ttl_seconds: int = None):
+    """
+    Atomically claim the oldest queued job, or a running job whose lease expired (its worker died).
+    An expired job that has used its max_attempts is marked 'failed' instead: a job that kills its worker
+    (out of memory, segfault) would otherwise be reclaimed and re-run forever.
+
+    Returns:
+        dict: The claimed job document, or None if nothing is claimable / an error occurs.
+    """
+    try:
+        now = datetime.now(timezone.utc)
+        collection = db[JOB_QUEUE_COLLECTION]
+        exhausted = {'$set': {'status': 'failed', 'error': f"Worker lost {max_attempts} times while running the job",
+                              'locked_until': None, 'worker': None, 'updated_at': now},
+                     '$unset': {'payload': ''}}
+        if ttl_seconds:
+            exhausted['$set']['expires_at'] = now + timedelta(seconds=ttl_seconds)
+        collection.update_many({'status': 'running', 'locked_until': {'$lt': now}, 'attempts': {'$gte': max_attempts}}, exhausted)
+
+        job = collection.find_one_and_update(
+            {'$or': [{'status': 'queued'},
+                     {'status': 'running', 'locked_until': {'$lt': now}, 'attempts': {'$lt': max_attempts}}]},
+            {'$set': {'status': 'running', 'worker': worker_id, 'locked_until': now + timedelta(seconds=lease_seconds), 'updated_at': now},
+             '$inc': {'attempts': 1}},
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            job['_id'] = str(job['_id'])
+        return job
+    except Exception as e:
+        print(f"❌ Error claiming job: {str(e)}")
+        return None
+
+def extend_job_lease(job_id: str, worker_id: str, lease_seconds: int):
+    try:
+        now = datetime.now(timezone.utc)
+        result = db[JOB_QUEUE_COLLECTION].update_one(
+            {'_id': ObjectId(job_id), 'worker': worker_id, 'status': 'running'},
+            {'$set': {'locked_until': now + timedelta(seconds=lease_seconds), 'updated_at': now}}
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        print(f"❌ Error extending lease of job {job_id}: {str(e)}")
+        return False
+
+def finish_job(job_id: str, status: str, result=None, error=None, ttl_seconds: int = None):
+    """
+    Mark a job 'done', 'failed' or back to 'queued' (retry). The payload is dropped once the job is final,
+    and with ttl_seconds MongoDB's TTL monitor removes the finished job that long after.
+    """
+    try:
+        now = datetime.now(timezone.utc)
+        update = {'$set': {'status': status, 'result': result, 'error': error, 'locked_until': None,
+                           'worker': None, 'updated_at': now}}
+        if status in ('done', 'failed'):
+            update['$unset'] = {'payload': ''}
+            if ttl_seconds:
+                update['$set']['expires_at'] = now + timedelta(seconds=ttl_seconds)
+        db[JOB_QUEUE_COLLECTION].update_one({'_id': ObjectId(job_id)}, update)
+        return True
+    except Exception as e:
+        print(f"❌ Error updating job {job_id}: {str(e)}")
+        return False
+
+def get_job(job_id: str):
+    """
+    Returns:
+        dict: The job document without its payload, False if not found, or None if an error occurs.
+    """
+    if not ObjectId.is_valid(job_id):
+        return False
+    try:
+        job = db[JOB_QUEUE_COLLECTION].find_one({'_id': ObjectId(job_id)}, {'payload': 0})
+        if not job:
+            return False
+        job['_id'] = str(job['_id'])
+        return job
+    except Exception as e:
+        print(f"❌ Error retrieving job {job_id}: {str(e)}")
+        return None
+
+
+# ---------------------------
+# Idempotency Keys (shared tier)
+# ---------------------------
+IDEMPOTENCY_COLLECTION = "idempotency.keys"
+idempotency_index_ready = False
+
+def get_idempotent_response(record_key: str):
+    """
+    Look up the stored response of an upload made with an Idempotency-Key.
+
+    Returns:
+        dict: {'fingerprint', 'status_code', 'body'}, or None on a miss / expired entry / error.
+    """
+    try:
+        doc = db[IDEMPOTENCY_COLLECTION].find_one({'_id': record_key, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        if not doc:
+            return None
+        return {'fingerprint': doc['fingerprint'], 'status_code': doc['status_code'], 'body': doc['body']}
+    except Exception as e:
+        print(f"❌ Error reading idempotency key {record_key}: {str(e)}")
+        return None
+
+def save_idempotent_response(record_key: str, record: dict, ttl_seconds: int):
+    """
+    Store the response of an upload under its Idempotency-Key. The first stored response wins,
+    MongoDB's TTL monitor removes it after ttl_seconds.
+
+    Returns:
+        bool: True if stored (or already present), False on error.
+    """
+    global idempotency_index_ready
+    try:
+        collection = db[IDEMPOTENCY_COLLECTION]
+        if not idempotency_index_ready:
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            idempotency_index_ready = True
+        collection.update_one(
+            {'_id': record_key},
+            {'$setOnInsert': {**record, 'expires_at': datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+        return True
+    except Exception as e:
+        print(f"❌ Error writing idempotency key {record_key}: {str(e)}")
+        return False
+
+
+# ---------------------------
+# Lazy Reports
+# ---------------------------
+# Report id -> owner and '_id' of the analysis it renders. The id is what the document's resume_report_id holds (and
+# the frontend downloads); renders are cached as GridFS files tagged with report_id and template_version.
+REPORT_COLLECTION = "fs.reports"
+
+def reserve_report(username: str, document_id: ObjectId) -> str:
+    """Reserve a report id for the analysis document_id of username, rendered later by Resume_Service.render_report."""
+    report_id = ObjectId()
+    db[REPORT_COLLECTION].insert_one({'_id': report_id, 'username': username, 'document_id': document_id,
+                                      'created_at': datetime.now(timezone.utc)})
+    return str(report_id)
+
+def get_report_source(report_id: str):
+    """
+    The saved analysis a lazy report renders.
+
+    Returns:
+        tuple: (username, document), or (None, None) if report_id is not a lazy report / its analysis is gone.
+    """
+    try:
+        record = db[REPORT_COLLECTION].find_one({'_id': ObjectId(report_id)})
+        if record is None:
+            return None, None
+        collection_data = user_collection(record['username'])
+        if 'document_id' in record:
+            document = collection_data.find_one({'_id': record['document_id']})
+        else:
+            # Reserved before records held the document id: found by a scan of the user's collection
+            document = collection_data.find_one({'resume_report_id': report_id})
+        return (record['username'], document) if document else (None, None)
+    except Exception as e:
+        print(f"❌ Error reading report source {report_id}: {str(e)}")
+        return None, None
+
+def get_rendered_report(report_id: str, template_version: str):
+    """
+    Returns:
+        tuple: (PDF bytes, filename) rendered with template_version, or (None, None) if there is none yet.
+    """
+    try:
+        grid_out = fs.find_one({'report_id': ObjectId(report_id), 'template_version': template_version})
+        return (grid_out.read(), grid_out.filename) if grid_out else (None, None)
+    except Exception as e:
+        print(f"❌ Error reading rendered report {report_id}: {str(e)}")
+        return None, None
+
+def save_rendered_report(report_id: str, template_version: str, pdf_bytes: bytes, filename: str) -> bool:
+    """Cache a render in GridFS, dropping renders of older templates (and a concurrent duplicate of this one)."""
+    try:
+        file_id = fs.put(pdf_bytes, filename=filename, report_id=ObjectId(report_id), template_version=template_version)
+        for stale in db['fs.files'].find({'report_id': ObjectId(report_id), '_id': {'$ne': file_id}}, {'template_version': 1}):
+            # Of two concurrent renders of the same template the older file is kept, both workers serve identical content
+            if stale['template_version'] != template_version or stale['_id'] > file_id:
+                fs.delete(stale['_id'])
+        return True
+    except Exception as e:
+        print(f"❌ Error caching rendered report {report_id}: {str(e)}")
+        return False
+
+def delete_lazy_report(report_id: str) -> bool:
+    """Delete a lazy report's renders and record. Returns False if report_id is not a lazy report."""
+    report_id = ObjectId(report_id)
+    if db[REPORT_COLLECTION].delete_one({'_id': report_id}).deleted_count == 0:
+        return False
+    for rendered in db['fs.files'].find({'report_id': report_id}, {'_id': 1}):
+        fs.delete(rendered['_id'])
+    return True
+
+
+# ---------------------------
+# Blob Garbage Collection / Storage Report
+# ---------------------------
+# Collections that hold no user documents (every per-user collection is named after its user)
+SYSTEM_COLLECTIONS = (ANALYSIS_CACHE_COLLECTION, EXTRACTION_CACHE_COLLECTION, BLOB_COLLECTION, REPORT_COLLECTION, JOB_QUEUE_COLLECTION, IDEMPOTENCY_COLLECTION)
+# Their namespaces and MongoDB's own system.*: no username may start with one
+SYSTEM_PREFIXES = tuple(sorted({name.split('.')[0] + '.' for name in SYSTEM_COLLECTIONS} | {'system.'}))
+
+def is_system_collection(name: str) -> bool:
+    """Whether a collection name is (or could become) a system collection, so never a username."""
+    return name in SYSTEM_COLLECTIONS or name.startswith(SYSTEM_PREFIXES)
+
+def referenced_file_ids() -> Counter:
+    """GridFS file id -> number of user documents pointing at it (resume_file_id / resume_report_id)."""
+    counts = Counter()
+    for name in db.list_collection_names():
+        if is_system_collection(name):
+            continue
+        for doc in db[name].find({}, {'resume_file_id': 1, 'resume_report_id': 1}):
+            for key in ('resume_file_id', 'resume_report_id'):
+                if doc.get(key) and ObjectId.is_valid(doc[key]):
+                    counts[ObjectId(doc[key])] += 1
+    return counts
+
+def collect_blob_garbage(grace_seconds: int = BLOB_GC_GRACE, dry_run: bool = False) -> dict:
+    """
+    Sweep for storage nothing points at any more. Blobs and files touched within grace_seconds are left alone,
+    they may belong to a save that has stored its files but not yet inserted its document.
+      - blob reference counts are recounted from the user documents (an interrupted save / delete leaves them off)
+        and blobs without references are deleted with their GridFS file;
+      - lazy report records whose document is gone are deleted;
+      - GridFS files that are neither a blob nor referenced by any document (nor a render of a referenced report)
+        are deleted.
+
+    Returns:
+        dict: blobs_recounted, blobs_reclaimed, reports_deleted, orphan_files_deleted, bytes_freed
+              (what would be done, if dry_run).
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    references = referenced_file_ids()
+    blobs = blob_collection()
+    report = {'blobs_recounted': 0, 'blobs_reclaimed': 0, 'reports_deleted': 0, 'orphan_files_deleted': 0, 'bytes_freed': 0}
+
+    blob_file_ids = {blob['file_id'] for blob in blobs.find({}, {'file_id': 1})}
+    for blob in blobs.find({'updated_at': {'$lt': cutoff}}):
+        actual = references.get(blob['file_id'], 0)
+        if actual != blob['refs']:
+            report['blobs_recounted'] += 1
+            # Compare-and-set: a reference added or dropped since the read wins over the recount
+            if not dry_run and blobs.update_one({'_id': blob['_id'], 'refs': blob['refs']}, {'$set': {'refs': actual}}).modified_count == 0:
+                continue
+        if actual == 0:
+            freed = blob['length'] if dry_run else reclaim_blob(blob['_id'])
+            report['blobs_reclaimed'] += bool(freed)
+            report['bytes_freed'] += freed
+
+    for record in db[REPORT_COLLECTION].find({'created_at': {'$lt': cutoff}}, {'_id': 1}):
+        if not references.get(record['_id']):
+            if not dry_run:
+                db[REPORT_COLLECTION].delete_one({'_id': record['_id']})
+            report['reports_deleted'] += 1
+
+    for grid_file in db['fs.files'].find({'uploadDate': {'$lt': cutoff}}, {'length': 1, 'report_id': 1}):
+        # Cached report renders belong to the document holding their report id
+        if grid_file['_id'] in blob_file_ids or references.get(grid_file['_id']) or references.get(grid_file.get('report_id')):
+            continue
+        if not dry_run:
+            fs.delete(grid_file['_id'])
+        report['orphan_files_deleted'] += 1
+        report['bytes_freed'] += grid_file['length']
+
+    return report
+
+def blob_storage_stats() -> dict:
+    """
+    What deduplication saves: bytes the stored documents reference (one copy per reference, what plain fs.put would
+    have stored) against bytes actually stored once per content. Files stored before the blob layer are listed apart,
+    cached report renders (re-created on demand) are left out.
+    """
+    totals = {'unique_blobs': 0, 'references': 0, 'stored_bytes': 0, 'referenced_bytes': 0}
+    for blob in blob_collection().find({}, {'length': 1, 'refs': 1}):
+        totals['unique_blobs'] += 1
+        totals['references'] += max(blob['refs'], 0)
+        totals['stored_bytes'] += blob['length']
+        totals['referenced_bytes'] += blob['length'] * max(blob['refs'], 0)
+    blob_file_ids = {blob['file_id'] for blob in blob_collection().find({}, {'file_id': 1})}
+    legacy = [f['length'] for f in db['fs.files'].find({'report_id': {'$exists': False}}, {'length': 1}) if f['_id'] not in blob_file_ids]
+
+    totals['saved_bytes'] = totals['referenced_bytes'] - totals['stored_bytes']
+    totals['saved_ratio'] = round(totals['saved_bytes'] / totals['referenced_bytes'], 4) if totals['referenced_bytes'] else 0.0
+    totals['legacy_files'] = len(legacy)
+    totals['legacy_bytes'] = sum(legacy)
+    return totals
+
+
+# ---------------------------
+# Async wrappers
+# ---------------------------
+# pymongo's client is thread-safe, so the async API runs each blocking call in a worker thread
+# and keeps the FastAPI event loop free while MongoDB / GridFS I/O is in flight.
+
+async def asaveToDb(AI_Response, username, resume_file, resume_report, resume_file_name, today_date):
+    return await asyncio.to_thread(saveToDb, AI_Response, username, resume_file, resume_report, resume_file_name, today_date)
+
+async def aattach_files(AI_Response, username, resume_file, resume_report, resume_file_name, today_date):
+    return await asyncio.to_thread(attach_files, AI_Response, username, resume_file, resume_report, resume_file_name, today_date)
+
+async def aget_saved_analysis(document_id: str, username: str):
+    return await asyncio.to_thread(get_saved_analysis, document_id, username)
+
+async def asaveManyToDb(documents, username):
+    return await asyncio.to_thread(saveManyToDb, documents, username)
+
+async def acheck_username_exists(username):
+    return await asyncio.to_thread(check_username_exists, username)
+
+async def aget_file_stream(file_id):
+    return await asyncio.to_thread(get_file_stream, file_id)
+
+async def aget_report(report_id: str, username: str):
+    return await asyncio.to_thread(get_report, report_id, username)
+
+async def adelete_report(report_id: str, username: str):
+    return await asyncio.to_thread(delete_report, report_id, username)
+
+async def aget_all_documents(username: str):
+    return await asyncio.to_thread(get_all_documents, username)
+
+async def aget_cached_analysis(cache_key: str):
+    return await asyncio.to_thread(get_cached_analysis, cache_key)
+
+async def asave_cached_analysis(cache_key: str, result: dict, ttl_seconds: int):
+    return await asyncio.to_thread(save_cached_analysis, cache_key, result, ttl_seconds)
+
+async def aget_idempotent_response(record_key: str):
+    return await asyncio.to_thread(get_idempotent_response, record_key)
+
+async def asave_idempotent_response(record_key: str, record: dict, ttl_seconds: int):
+    return await asyncio.to_thread(save_idempotent_response, record_key, record, ttl_seconds)
+
+async def aping_db():
+    return await asyncio.to_thread(ping_db)
+
+async def ablob_storage_stats():
+    return await asyncio.to_thread(blob_storage_stats)
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+## Run Command (from Analyze) : python DB_Handle.py stats   |   python DB_Handle.py gc [--dry-run]
+def main():
+    parser = argparse.ArgumentParser(description="Report / garbage-collect the deduplicated GridFS blob storage")
+    parser.add_argument('command', choices=("stats", "gc"))
+    parser.add_argument('--dry-run', action='store_true', help="gc: only report what would be deleted")
+    parser.add_argument('--grace', type=int, default=BLOB_GC_GRACE, help="gc: seconds during which new blobs / files are kept")
+    args = parser.parse_args()
+
+    if args.command == "gc":
+        report = collect_blob_garbage(args.grace, args.dry_run)
+        print(f"✅ {'Would free' if args.dry_run else 'Freed'} {report['bytes_freed'] / 1e6:.2f} MB: {report}")
+        return
+    stats = blob_storage_stats()
+    print(f"✅ {stats['references']} references to {stats['unique_blobs']} unique files: "
+          f"{stats['stored_bytes'] / 1e6:.2f} MB stored instead of {stats['referenced_bytes'] / 1e6:.2f} MB "
+          f"({stats['saved_ratio']:.1%} saved), plus {stats['legacy_files']} files from before deduplication "
+          f"({stats['legacy_bytes'] / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
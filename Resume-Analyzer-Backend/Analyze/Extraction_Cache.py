@@ -0,0 +1,87 @@
+import hashlib
+import os
+import threading
+import PyPDF2
+from io import BytesIO
+from Analysis_Cache import TTLCache
+from Pdf_Extract import PDF_MAX_PAGES, PDF_TEXT_TARGET
+from Text_Extract import EXTRACTOR_VERSION
+from DB_Handle import get_cached_extraction, save_cached_extraction
+
+## Cache of extracted resume text keyed by the SHA-256 of the uploaded file, so a re-upload skips parsing entirely.
+## Tier 1 : in-process LRU with TTL (per worker).
+## Tier 2 : MongoDB collection next to the GridFS buckets (DB_Handle.EXTRACTION_CACHE_COLLECTION), shared by every worker.
+## Extractions cut short by the time budget depend on the machine's load and are never stored.
+
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "512"))              # extractions kept in memory per worker
+EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, both tiers
+EXTRACTION_CACHE_SHARED = os.getenv("EXTRACTION_CACHE_SHARED", "true").lower() in ("1", "true", "yes")
+
+
+def file_sha256(file_bytes) -> str:
+    data = file_bytes.getvalue() if isinstance(file_bytes, BytesIO) else file_bytes
+    return hashlib.sha256(data).hexdigest()
+
+def extraction_settings() -> dict:
+    # Everything besides the file that changes the extracted text; a stored extraction made with other settings is a miss
+    return {'extractor': EXTRACTOR_VERSION, 'max_pages': PDF_MAX_PAGES, 'text_target': PDF_TEXT_TARGET, 'pypdf2': PyPDF2.__version__}
+
+
+# ---------------------------
+# Two-tier Extraction Cache
+# ---------------------------
+class ExtractionCache:
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_SIZE, ttl_seconds: int = EXTRACTION_CACHE_TTL, shared: bool = EXTRACTION_CACHE_SHARED):
+        self.local = TTLCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.settings = extraction_settings()
+        self.counters = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0, 'stores': 0}
+        self.counter_lock = threading.Lock()
+
+    def count(self, name: str):
+        with self.counter_lock:
+            self.counters[name] += 1
+
+    def get(self, file_hash: str):
+        """Return the extracted text of the file with this SHA-256, or None on a miss."""
+        text = self.local.get(file_hash)
+        if text is not None:
+            self.count('memory_hits')
+            return text
+        if self.shared:
+            extraction = get_cached_extraction(file_hash)
+            if extraction is not None and extraction.get('settings') == self.settings:
+                self.local.set(file_hash, extraction['text'])
+                self.count('shared_hits')
+                return extraction['text']
+        self.count('misses')
+        return None
+
+    def set(self, file_hash: str, extraction: dict):
+        """Store an extract_text result (skipped if the time budget stopped it)."""
+        if extraction['stopped'] == 'time_budget':
+            return
+        self.local.set(file_hash, extraction['text'])
+        if self.shared:
+            save_cached_extraction(file_hash, {
+                'text': extraction['text'],
+                'format': extraction['format'],
+                'pages': extraction['pages'],
+                'pages_read': extraction['pages_read'],
+                'stopped': extraction['stopped'],
+                'settings': self.settings,
+            }, self.ttl_seconds)
+        self.count('stores')
+
+    def stats(self) -> dict:
+        with self.counter_lock:
+            stats = dict(self.counters)
+        lookups = stats['memory_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        stats['memory_entries'] = len(self.local)
+        stats['settings'] = self.settings
+        return stats
+
+
+extraction_cache = ExtractionCache()
@@ -0,0 +1,226 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from DB_Handle import enqueue_job, claim_job, extend_job_lease, finish_job, get_job
+
+## Background job queue for analyses with a pluggable backend and an asyncio worker pool.
+##   "mongo"  : (default) MongoDB collection (DB_Handle.JOB_QUEUE_COLLECTION), shared by every API / worker process.
+##              Claimed jobs hold a lease that the worker keeps extending; if the worker dies the lease
+##              expires and another worker picks the job up again, so no job is lost on restart.
+##   "memory" : opt-in in-process queue, for local development and tests (jobs are lost on restart). Single process
+##              only: with several API workers a job can only be polled from the worker that enqueued it.
+## Standalone worker (mongo backend) : python Job_Queue.py
+
+# uvicorn / gunicorn read their worker count from WEB_CONCURRENCY; the memory queue is not shared between workers
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "mongo")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))                  # workers per process (0 = enqueue only)
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))    # a running job is reclaimed this long after its last heartbeat
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", str(24 * 3600)))  # seconds a done / failed job (and its result) can still be polled
+
+
+# ---------------------------
+# Queue Backends
+# ---------------------------
+class JobQueue:
+    """
+    Interface every queue backend implements. Jobs are dicts with
+    '_id', 'kind', 'payload', 'status' (queued / running / done / failed), 'attempts', 'result', 'error'.
+    """
+
+    async def enqueue(self, kind: str, payload: dict) -> str:
+        raise NotImplementedError
+
+    async def claim(self, worker_id: str):
+        """Return the next job for worker_id (status set to running), or None if the queue is empty."""
+        raise NotImplementedError
+
+    async def heartbeat(self, job_id: str, worker_id: str):
+        pass
+
+    async def finish(self, job_id: str, status: str, result=None, error=None):
+        raise NotImplementedError
+
+    async def get(self, job_id: str):
+        """Return the job without its payload, or None if it does not exist."""
+        raise NotImplementedError
+
+
+class InMemoryJobQueue(JobQueue):
+    def __init__(self, result_ttl: int = JOB_RESULT_TTL):
+        self.jobs = {}
+        self.ready = asyncio.Queue()
+        self.result_ttl = result_ttl
+        self.finished = OrderedDict()  # job_id -> eviction time of done / failed jobs, oldest first
+
+    def evict_finished(self):
+        now = time.monotonic()
+        while self.finished:
+            job_id, evict_at = next(iter(self.finished.items()))
+            if evict_at > now:
+                break
+            del self.finished[job_id]
+            self.jobs.pop(job_id, None)
+
+    async def enqueue(self, kind: str, payload: dict) -> str:
+        self.evict_finished()
+        job_id = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        self.jobs[job_id] = {'_id': job_id, 'kind': kind, 'payload': payload, 'status': 'queued', 'attempts': 0,
+                             'created_at': now, 'updated_at': now, 'result': None, 'error': None}
+        self.ready.put_nowait(job_id)
+        return job_id
+
+    async def claim(self, worker_id: str):
+        try:
+            job_id = await asyncio.wait_for(self.ready.get(), timeout=JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+        job = self.jobs[job_id]
+        job.update({'status': 'running', 'worker': worker_id, 'updated_at': datetime.now(timezone.utc)})
+        job['attempts'] += 1
+        return job
+
+    async def finish(self, job_id: str, status: str, result=None, error=None):
+        job = self.jobs[job_id]
+        job.update({'status': status, 'result': result, 'error': error, 'worker': None, 'updated_at': datetime.now(timezone.utc)})
+        if status == 'queued':
+            self.ready.put_nowait(job_id)
+        else:
+            job.pop('payload', None)
+            self.finished[job_id] = time.monotonic() + self.result_ttl
+
+    async def get(self, job_id: str):
+        self.evict_finished()
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return {key: value for key, value in job.items() if key != 'payload'}
+
+
+class MongoJobQueue(JobQueue):
+    async def enqueue(self, kind: str, payload: dict) -> str:
+        job_id = await asyncio.to_thread(enqueue_job, kind, payload)
+        if job_id is None:
+            raise RuntimeError("Failed to enqueue job")
+        return job_id
+
+    async def claim(self, worker_id: str):
+        job = await asyncio.to_thread(claim_job, worker_id, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RESULT_TTL)
+        if job is None:
+            await asyncio.sleep(JOB_POLL_SECONDS)
+        return job
+
+    async def heartbeat(self, job_id: str, worker_id: str):
+        await asyncio.to_thread(extend_job_lease, job_id, worker_id, JOB_LEASE_SECONDS)
+
+    async def finish(self, job_id: str, status: str, result=None, error=None):
+        await asyncio.to_thread(finish_job, job_id, status, result, error, JOB_RESULT_TTL)
+
+    async def get(self, job_id: str):
+        job = await asyncio.to_thread(get_job, job_id)
+        if job is None:
+            raise RuntimeError(f"Failed to retrieve job {job_id}")
+        return job or None
+
+
+JOB_QUEUE_BACKENDS = {
+    "memory": InMemoryJobQueue,
+    "mongo": MongoJobQueue,
+}
+
+def create_job_queue(backend: str = JOB_QUEUE_BACKEND) -> JobQueue:
+    if backend not in JOB_QUEUE_BACKENDS:
+        raise ValueError(f"Unknown job queue backend '{backend}'. Expected one of {tuple(JOB_QUEUE_BACKENDS)}.")
+    if backend == "memory" and WEB_CONCURRENCY > 1:
+        print(f"⚠️ The memory job queue is not shared between the {WEB_CONCURRENCY} API workers, use JOB_QUEUE_BACKEND=mongo")
+    return JOB_QUEUE_BACKENDS[backend]()
+
+
+# ---------------------------
+# Worker Pool
+# ---------------------------
+class JobWorkerPool:
+    """
+    Runs `workers` asyncio tasks that drain the queue. handlers maps a job kind to an
+    async function taking the job payload and returning a JSON-serialisable result.
+    """
+
+    def __init__(self, queue: JobQueue, handlers: dict, workers: int = JOB_WORKERS):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.tasks = []
+        self.prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self.counters = {'done': 0, 'failed': 0, 'retried': 0}
+
+    def start(self):
+        for i in range(self.workers):
+            self.tasks.append(asyncio.create_task(self.run_worker(f"{self.prefix}-{i}")))
+
+    async def stop(self):
+        # Jobs interrupted here keep their lease and are reclaimed after it expires (mongo backend)
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+
+    async def keep_lease(self, job_id: str, worker_id: str):
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            await self.queue.heartbeat(job_id, worker_id)
+
+    async def run_job(self, job: dict, worker_id: str):
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            await self.queue.finish(job['_id'], 'failed', error=f"No handler for job kind '{job['kind']}'")
+            self.counters['failed'] += 1
+            return
+
+        lease = asyncio.create_task(self.keep_lease(job['_id'], worker_id))
+        started = time.perf_counter()
+        try:
+            result = await handler(job['payload'])
+        except Exception as e:
+            # ValueError means bad input (unreadable PDF, invalid report): retrying cannot help
+            if job['attempts'] < JOB_MAX_ATTEMPTS and not isinstance(e, ValueError):
+                print(f"⚠️ Job {job['_id']} failed (attempt {job['attempts']}), retrying: {str(e)}")
+                await self.queue.finish(job['_id'], 'queued', error=str(e))
+                self.counters['retried'] += 1
+            else:
+                print(f"❌ Job {job['_id']} failed after {job['attempts']} attempts: {str(e)}")
+                await self.queue.finish(job['_id'], 'failed', error=str(e))
+                self.counters['failed'] += 1
+            return
+        finally:
+            lease.cancel()
+
+        await self.queue.finish(job['_id'], 'done', result=result)
+        self.counters['done'] += 1
+        print(f"✅ Job {job['_id']} done in {time.perf_counter() - started:.1f}s")
+
+    async def run_worker(self, worker_id: str):
+        while True:
+            job = await self.queue.claim(worker_id)
+            if job is not None:
+                await self.run_job(job, worker_id)
+
+
+async def main():
+    from Resume_Service import JOB_HANDLERS
+
+    queue = create_job_queue()
+    pool = JobWorkerPool(queue, JOB_HANDLERS, workers=max(1, JOB_WORKERS))
+    pool.start()
+    print(f"Worker pool started: {pool.workers} worker(s), backend '{JOB_QUEUE_BACKEND}'")
+    await asyncio.gather(*pool.tasks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
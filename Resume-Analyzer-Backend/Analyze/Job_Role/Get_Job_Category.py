@@ -1,50 +1,148 @@
+import hashlib
+import json
+import os
 import pickle
-import re
+import warnings
+from functools import lru_cache
 import numpy as np
+from Job_Role.Text_Normalize import cleanResume  # shared with training and Job_Role/app.py
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model')
+PREDICT_CHUNK_SIZE = int(os.getenv("PREDICT_CHUNK_SIZE", "256"))   # texts vectorized / scored at a time by predict_resume_categories
+MODEL_FORMAT = os.getenv("JOB_ROLE_MODEL_FORMAT", "auto")  # "artifact" (Job_Role/Model_Artifact.py), "pickle", or "auto" (the artifact when exported)
+
+EMPTY_CONTENT = "Extraction failed or content is empty."
 
 ## Loading Models
-model = pickle.load(open('./Job_Role/Model/job-role-prediction-model.pkl', 'rb'))
-tfidf = pickle.load(open('./Job_Role/Model/tfidf.pkl', 'rb'))
-category_map = pickle.load(open('./Job_Role/Model/job-role-dict.pkl', 'rb'))
+# Loaded on first use (or by the API warmup), not at import: unpickling pulls in scikit-learn and scipy
+@lru_cache(maxsize=1)
+def load_models():
+    """(model, tfidf, category_map), loaded once per process."""
+    from sklearn.exceptions import InconsistentVersionWarning
 
+    # Ignore scikit-learn version mismatch warnings
+    warnings.filterwarnings("ignore", category=InconsistentVersionWarning)
+    model_path = os.path.join(MODEL_DIR, 'job-role-prediction-model.pkl')
+    if not os.path.exists(model_path):
+        # Not in the repository (too large), rebuilt from the dataset
+        raise FileNotFoundError(f"{model_path} not found, train it with : python -m Job_Role.Train_Job_Role_Model")
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(MODEL_DIR, 'tfidf.pkl'), 'rb') as f:
+        tfidf = pickle.load(f)
+    with open(os.path.join(MODEL_DIR, 'job-role-dict.pkl'), 'rb') as f:
+        category_map = pickle.load(f)
+    return model, tfidf, category_map
 
-### Helper Functions
+@lru_cache(maxsize=1)
+def load_sparse_knn():
+    """SparseKNN built from the pickled OneVsRest k-NN (None if the model is not one, then the model itself predicts)."""
+    from Job_Role.Sparse_KNN import SparseKNN
+    return SparseKNN.from_one_vs_rest(load_models()[0])
+
+@lru_cache(maxsize=1)
+def load_artifact():
+    """Memory-mapped JobRoleArtifact used instead of the pickles, or None (JOB_ROLE_MODEL_FORMAT=pickle / not exported)."""
+    from Job_Role.Model_Artifact import ARTIFACT_DIR, MANIFEST, read_artifact
+
+    if MODEL_FORMAT == "pickle" or (MODEL_FORMAT == "auto" and not os.path.exists(os.path.join(ARTIFACT_DIR, MANIFEST))):
+        return None
+    try:
+        return read_artifact(ARTIFACT_DIR)
+    except Exception as e:
+        if MODEL_FORMAT == "artifact":
+            raise
+        print(f"❌ Job-role artifact unusable, loading the pickles: {str(e)}")
+        return None
 
-## Clean Resume Function
-def cleanResume(txt):
-    clean_text = re.sub(r'http\S+', ' ', txt)   # Removes URL
-    clean_text = re.sub(r'RT|cc', ' ', clean_text) 
-    clean_text = re.sub(r'#\S+', ' ', clean_text) # Removes HashTags
-    clean_text = re.sub(r'@\S+', ' ', clean_text)  # # Removes @ Signs
-    clean_text = re.sub(r'[%s]' % re.escape(r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', clean_text)  # Removes Special Characters
-    clean_text = re.sub(r'[^\x00-\x7f]', ' ', clean_text) 
-    clean_text = re.sub(r'\s+', ' ', clean_text)
-    return clean_text
+@lru_cache(maxsize=1)
+def model_fingerprint() -> str:
+    """
+    Version of the job-role model this process predicts with (part of the analysis cache key, so a retrain or a new
+    artifact invalidates cached categories): the artifact manifest, which holds every array's SHA-256, or the pickles.
+    """
+    artifact = load_artifact()
+    if artifact is not None:
+        data = json.dumps(artifact.manifest, sort_keys=True).encode('utf-8')
+        return 'artifact:' + hashlib.sha256(data).hexdigest()[:16]
+    digest = hashlib.sha256()
+    for name in ('job-role-prediction-model.pkl', 'tfidf.pkl', 'job-role-dict.pkl'):
+        path = os.path.join(MODEL_DIR, name)
+        if not os.path.exists(path):
+            return 'missing'
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return 'pickle:' + digest.hexdigest()[:16]
+
+
+### Helper Functions
 
 ## Predict the Category / Job Role of the Resume
 def predict_resume_category(resume_content):
     if not resume_content or not isinstance(resume_content, str):
-        return "Extraction failed or content is empty."
+        return EMPTY_CONTENT
+    return predict_resume_categories([resume_content])[0]
 
-    # Preprocess the input text (e.g., cleaning, etc.)
-    cleaned_text = cleanResume(resume_content)
+def category_scores(X):
+    """
+    Score of every category for each row of a TF-IDF matrix (n_rows x n_categories, rows sum to 1):
+    the share of the k nearest training resumes in that category, OvR predict_proba for rows SparseKNN
+    leaves to the model (or any other model).
+    """
+    artifact = load_artifact()
+    knn = artifact.knn if artifact is not None else load_sparse_knn()
+    if knn is None:
+        return model_scores(X)
+    scores = knn.vote_counts(X) / knn.n_neighbors
+    # Text without a single vocabulary term is equally far from every resume, only the model's own tie order decides it
+    # (the artifact stores the model's scores for that case)
+    empty_rows = np.flatnonzero(X.getnnz(axis=1) == 0)
+    if len(empty_rows):
+        scores[empty_rows] = artifact.empty_scores if artifact is not None else model_scores(X[empty_rows])
+    return scores
 
-    # Vectorize the cleaned text using the same TF-IDF vectorizer used during training
-    vectorized_text = tfidf.transform([cleaned_text])
+def model_scores(X):
+    # The pickled k-NN on the dense matrix, as predict_resume_category always did (its ties depend on it);
+    # other models (the hashing variant's 2^18 features) score the sparse matrix directly
+    model, _, _ = load_models()
+    X = X.toarray() if load_sparse_knn() is not None else X
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)
+    return (model.predict(X)[:, None] == model.classes_[None, :]).astype(float)
 
-    # Convert sparse matrix to dense 
-    vectorized_text = vectorized_text.toarray()
+## Predict the Categories of many Resumes at once
+def predict_resume_categories(texts, top_k: int = None, chunk_size: int = PREDICT_CHUNK_SIZE):
+    """
+    Batch counterpart of predict_resume_category: each chunk of texts is vectorized with one
+    tfidf.transform and scored with one sparse matrix product.
 
-    # Prediction
-    predicted_category = model.predict(vectorized_text)
+    Args:
+        texts (list[str]): Resume texts.
+        top_k (int): Return the top_k categories with their scores instead of only the best one.
+        chunk_size (int): Texts vectorized at a time (bounds the memory of the TF-IDF / score matrices).
 
-    # We must access the first element [0] of the NumPy array to get the integer index/label.
-    if isinstance(predicted_category, np.ndarray) and predicted_category.size > 0:
-        predicted_index = predicted_category[0]
+    Returns:
+        list: Category name per text, or (with top_k) a list of (category name, score) pairs per text,
+              best first, scores being the share of the nearest training resumes in that category.
+    """
+    artifact = load_artifact()
+    if artifact is not None:
+        tfidf, classes, category_map = artifact.tfidf, artifact.knn.classes, artifact.category_map
     else:
-        # Handle cases where prediction fails or returns unexpected format
-        return "Prediction failed (Unexpected model output)."
-
-    predicted_category_name = category_map.get(predicted_index, f"Unknown Category Index: {predicted_index}")
+        model, tfidf, category_map = load_models()
+        classes = model.classes_
+    results = [EMPTY_CONTENT if top_k is None else [] for _ in texts]
+    valid = [i for i, text in enumerate(texts) if text and isinstance(text, str)]
 
-    return predicted_category_name  # Return the category name
\ No newline at end of file
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        X = tfidf.transform([cleanResume(texts[i]) for i in chunk])
+        scores = category_scores(X)
+        # np.argmax picks the first category on ties, like OneVsRestClassifier.predict
+        ranked = scores.argmax(axis=1)[:, None] if top_k is None else np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+        for row, i in enumerate(chunk):
+            names = [(category_map.get(classes[c], f"Unknown Category Index: {classes[c]}"), round(float(scores[row, c]), 3))
+                     for c in ranked[row] if top_k is None or scores[row, c] > 0]
+            results[i] = names[0][0] if top_k is None else names
+    return results
@@ -0,0 +1,208 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+from datetime import datetime, timezone
+import numpy as np
+from scipy import sparse
+from Job_Role.Sparse_KNN import SparseKNN
+
+## The job-role model as plain arrays instead of pickles.
+## export writes the TF-IDF vocabulary and IDF weights, the SparseKNN training matrix (CSR data / indices / indptr)
+## and the category map as .npy files next to a versioned manifest.json. read_artifact maps the arrays read-only
+## (np.load(mmap_mode='r')): every API / gunicorn worker, forked or not, shares the same pages through the OS page
+## cache instead of holding its own unpickled copy, and nothing depends on the scikit-learn version that trained
+## the model (the vectorizer is rebuilt from its parameters, no InconsistentVersionWarning to silence).
+## Run Command (from Analyze) : python -m Job_Role.Model_Artifact export   (then: info / verify)
+
+ARTIFACT_FORMAT = "job-role-sparse-knn"
+ARTIFACT_VERSION = 1    # bumped when the files or their meaning change; read_artifact refuses other versions
+MANIFEST = 'manifest.json'
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model', 'artifact')
+
+# TfidfVectorizer parameters that are stored; tokenizer / preprocessor / analyzer callables cannot be
+VECTORIZER_PARAMS = ('analyzer', 'binary', 'decode_error', 'encoding', 'input', 'lowercase', 'max_df', 'max_features',
+                     'min_df', 'ngram_range', 'norm', 'smooth_idf', 'stop_words', 'strip_accents', 'sublinear_tf',
+                     'token_pattern', 'use_idf')
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def sha256_file(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def vectorizer_params(tfidf) -> dict:
+    params = tfidf.get_params()
+    if params['tokenizer'] is not None or params['preprocessor'] is not None or not isinstance(params['analyzer'], str):
+        raise ValueError("A vectorizer with a custom tokenizer / preprocessor / analyzer cannot be exported")
+    stored = {name: params[name] for name in VECTORIZER_PARAMS}
+    stored['ngram_range'] = list(stored['ngram_range'])
+    if not isinstance(stored['stop_words'], (str, type(None))):
+        stored['stop_words'] = sorted(stored['stop_words'])
+    stored['dtype'] = np.dtype(params['dtype']).name
+    return stored
+
+def export_artifact(tfidf, knn: SparseKNN, category_map: dict, empty_scores, directory: str = ARTIFACT_DIR) -> dict:
+    """
+    Write the arrays and the manifest to directory.
+
+    Args:
+        tfidf (TfidfVectorizer): Fitted vectorizer.
+        knn (SparseKNN): Built from the pickled model (SparseKNN.from_one_vs_rest).
+        category_map (dict): Category id -> name.
+        empty_scores (array): Category scores of a text without any vocabulary term (the pickled model's own
+                              tie order, see category_scores in Get_Job_Category.py).
+        directory (str): Output directory (created if needed).
+
+    Returns:
+        dict: The manifest.
+    """
+    import sklearn
+    import scipy
+
+    matrix = knn.train_matrix_t
+    arrays = {
+        'vocabulary': np.array(sorted(tfidf.vocabulary_, key=tfidf.vocabulary_.get)),
+        'idf': np.asarray(tfidf.idf_, dtype=np.float64),
+        'train_data': matrix.data,
+        'train_indices': matrix.indices,
+        'train_indptr': matrix.indptr,
+        'train_norms': knn.train_norms,
+        'labels': knn.labels,
+        'classes': knn.classes,
+        'empty_scores': np.asarray(empty_scores, dtype=np.float64).ravel(),
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    # The manifest is written last: a directory without one is an unfinished export and is never read
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    files = {}
+    for name, array in arrays.items():
+        path = os.path.join(directory, f"{name}.npy")
+        np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+        files[name] = {'file': f"{name}.npy", 'dtype': array.dtype.str, 'shape': list(array.shape), 'sha256': sha256_file(path)}
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'exported_with': {'python': platform.python_version(), 'numpy': np.__version__,
+                          'scipy': scipy.__version__, 'scikit-learn': sklearn.__version__},
+        'vectorizer': vectorizer_params(tfidf),
+        'n_neighbors': int(knn.n_neighbors),
+        'train_matrix_t_shape': list(matrix.shape),
+        'categories': [[int(category_id), name] for category_id, name in sorted(category_map.items())],
+        'arrays': files,
+    }
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+def export_model(model, tfidf, category_map: dict, directory: str = ARTIFACT_DIR) -> dict:
+    """export_artifact for the pickled OneVsRest k-NN and its TfidfVectorizer (ValueError for any other model)."""
+    knn = SparseKNN.from_one_vs_rest(model)
+    if knn is None or not hasattr(tfidf, 'vocabulary_'):
+        raise ValueError("Only the OneVsRest k-NN job-role model with a TfidfVectorizer can be exported")
+    # A text without any vocabulary term: the dense all-zero row, as Get_Job_Category.model_scores scores it
+    empty_scores = model.predict_proba(np.zeros((1, len(tfidf.vocabulary_))))
+    return export_artifact(tfidf, knn, category_map, empty_scores, directory)
+
+
+# ---------------------------
+# Import
+# ---------------------------
+class JobRoleArtifact:
+    """An exported job-role model, arrays memory-mapped: tfidf, knn, category_map and empty_scores."""
+
+    def __init__(self, directory: str = ARTIFACT_DIR, verify: bool = False):
+        """
+        Args:
+            directory (str): Directory written by export_artifact.
+            verify (bool): Also check the SHA-256 of every file (reads them whole, so off by default).
+
+        Raises:
+            FileNotFoundError: No manifest in directory.
+            ValueError: Another format / version, or files that do not match the manifest.
+        """
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported job-role artifact {manifest.get('format')} v{manifest.get('version')} "
+                             f"(expected {ARTIFACT_FORMAT} v{ARTIFACT_VERSION}), export it again")
+        self.directory = directory
+        self.manifest = manifest
+
+        arrays = {}
+        for name, entry in manifest['arrays'].items():
+            path = os.path.join(directory, entry['file'])
+            if verify and sha256_file(path) != entry['sha256']:
+                raise ValueError(f"Job-role artifact file {entry['file']} does not match its checksum")
+            array = np.load(path, mmap_mode='r', allow_pickle=False)
+            # Only the .npy header is read here, which catches truncated / replaced files cheaply
+            if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+                raise ValueError(f"Job-role artifact file {entry['file']} does not match the manifest")
+            arrays[name] = array
+
+        train_matrix_t = sparse.csr_matrix((arrays['train_data'], arrays['train_indices'], arrays['train_indptr']),
+                                           shape=tuple(manifest['train_matrix_t_shape']), copy=False)
+        self.knn = SparseKNN.from_arrays(train_matrix_t, arrays['train_norms'], arrays['labels'], arrays['classes'],
+                                         manifest['n_neighbors'])
+        self.tfidf = self.build_vectorizer(manifest['vectorizer'], arrays['vocabulary'], arrays['idf'])
+        self.category_map = {category_id: name for category_id, name in manifest['categories']}
+        self.empty_scores = arrays['empty_scores']
+
+    @staticmethod
+    def build_vectorizer(params: dict, vocabulary, idf):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(params, ngram_range=tuple(params['ngram_range']), dtype=np.dtype(params['dtype']).type)
+        tfidf = TfidfVectorizer(**params)
+        # The term -> column dict is the only per-process copy, transform looks every token up in it
+        tfidf.vocabulary_ = {term: column for column, term in enumerate(vocabulary.tolist())}
+        tfidf.idf_ = idf
+        return tfidf
+
+def read_artifact(directory: str = ARTIFACT_DIR, verify: bool = False) -> JobRoleArtifact:
+    return JobRoleArtifact(directory, verify)
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Export / inspect the memory-mappable job-role model artifact")
+    parser.add_argument('command', choices=("export", "info", "verify"))
+    parser.add_argument('--dir', default=ARTIFACT_DIR, help="Artifact directory")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from Job_Role.Get_Job_Category import load_models
+
+        model, tfidf, category_map = load_models()
+        try:
+            manifest = export_model(model, tfidf, category_map, args.dir)
+        except ValueError as e:
+            raise SystemExit(f"❌ {str(e)}")
+        size = sum(os.path.getsize(os.path.join(args.dir, entry['file'])) for entry in manifest['arrays'].values())
+        print(f"✅ Exported {ARTIFACT_FORMAT} v{ARTIFACT_VERSION} to {args.dir} ({size / 1e6:.1f} MB)")
+        return
+
+    artifact = read_artifact(args.dir, verify=args.command == "verify")
+    manifest = artifact.manifest
+    print(f"✅ {manifest['format']} v{manifest['version']}, exported {manifest['created']} with {manifest['exported_with']}")
+    for name, entry in manifest['arrays'].items():
+        print(f"  {entry['file']:<22} {entry['dtype']:<6} {str(tuple(entry['shape'])):<14} "
+              f"{os.path.getsize(os.path.join(args.dir, entry['file'])) / 1e3:10.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
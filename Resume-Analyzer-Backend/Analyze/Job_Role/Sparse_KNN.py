@@ -0,0 +1,91 @@
+import numpy as np
+from scipy import sparse
+
+## Sparse-native inference for the job-role model.
+## The trained model is OneVsRestClassifier(KNeighborsClassifier()): one binary k-NN per category, all fit on the
+## same TF-IDF matrix, so every estimator finds the same k neighbours and the OvR argmax is a majority vote of
+## their categories. SparseKNN keeps that matrix once (CSR, rows L2-normalized, transposed for the dot product)
+## and scores a query by sparse cosine similarity, without densifying the vocabulary-wide TF-IDF vector.
+## For unit-length rows, squared Euclidean distance = |q|^2 + 1 - 2 cos(q, x), so the neighbours (and predictions)
+## are the ones the Euclidean k-NN finds; rows that were all-zero keep their exact distance through their norm.
+
+
+def same_matrix(a, b) -> bool:
+    a = sparse.csr_matrix(a)
+    return a.shape == b.shape and (a != b).nnz == 0
+
+
+class SparseKNN:
+
+    def __init__(self, train_matrix, labels, classes, n_neighbors: int = 5):
+        """
+        Args:
+            train_matrix (scipy.sparse matrix): TF-IDF rows the k-NN was fit on (n_samples x n_features).
+            labels (array): Category index (position in classes) of every row.
+            classes (array): Category ids, in the order of the OvR estimators.
+            n_neighbors (int): k.
+        """
+        train_matrix = train_matrix.tocsr().astype(np.float64)
+        squared_norms = np.asarray(train_matrix.multiply(train_matrix).sum(axis=1)).ravel()
+        norms = np.sqrt(squared_norms)
+        scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        # Precomputed once: L2-normalized rows, transposed so a query row times it gives all similarities
+        self.train_matrix_t = train_matrix.multiply(scale[:, None]).tocsr().T.tocsr()
+        self.train_norms = norms
+        self.labels = np.asarray(labels, dtype=np.intp)
+        self.classes = np.asarray(classes)
+        self.n_neighbors = n_neighbors
+
+    @classmethod
+    def from_one_vs_rest(cls, model):
+        """
+        Build from a fitted OneVsRestClassifier(KNeighborsClassifier), or return None if the model
+        is anything else (another classifier, distance weights, a non-Euclidean metric ...).
+        """
+        estimators = getattr(model, 'estimators_', None)
+        if not estimators or getattr(getattr(model, 'label_binarizer_', None), 'y_type_', None) != 'multiclass':
+            return None
+        first = estimators[0]
+        train_matrix = sparse.csr_matrix(first._fit_X)
+        for e in estimators:
+            if type(e).__name__ != 'KNeighborsClassifier' or e.weights != 'uniform' or e.effective_metric_ != 'euclidean':
+                return None
+            if e.n_neighbors != first.n_neighbors or not same_matrix(e._fit_X, train_matrix):
+                return None
+
+        # Category of every training row: the estimator whose binary target is 1 for it
+        targets = np.vstack([e.classes_[e._y] for e in estimators])
+        if not np.all(targets.sum(axis=0) == 1):
+            return None
+        return cls(train_matrix, targets.argmax(axis=0), model.classes_, first.n_neighbors)
+
+    @classmethod
+    def from_arrays(cls, train_matrix_t, train_norms, labels, classes, n_neighbors: int):
+        """Rebuild from the attributes of an exported SparseKNN as they are (Job_Role/Model_Artifact.py), nothing is copied."""
+        knn = cls.__new__(cls)
+        knn.train_matrix_t = train_matrix_t
+        knn.train_norms = train_norms
+        knn.labels = labels
+        knn.classes = classes
+        knn.n_neighbors = n_neighbors
+        return knn
+
+    def kneighbors(self, X):
+        """Indices of the k nearest training rows for every row of X (sparse), nearest first (ties: lower index)."""
+        # q . x_hat for every training row (the cosine, scaled by |q|)
+        similarities = (X @ self.train_matrix_t).toarray()
+        query_squared_norms = np.asarray(X.multiply(X).sum(axis=1)).reshape(-1, 1)
+        # Squared Euclidean distance to the original rows: |q|^2 + |x|^2 - 2 |x| (q . x_hat)
+        distances = query_squared_norms + self.train_norms ** 2 - 2.0 * self.train_norms * similarities
+        return np.argsort(distances, axis=1, kind='stable')[:, :self.n_neighbors]
+
+    def vote_counts(self, X):
+        """Neighbours per category (n_queries x n_categories), what each OvR estimator's predict_proba scales by 1/k."""
+        neighbors = self.kneighbors(X)
+        counts = np.zeros((neighbors.shape[0], len(self.classes)), dtype=np.intp)
+        np.add.at(counts, (np.arange(neighbors.shape[0])[:, None], self.labels[neighbors]), 1)
+        return counts
+
+    def predict(self, X):
+        # np.argmax picks the first category on ties, like OneVsRestClassifier.predict
+        return self.classes[self.vote_counts(X).argmax(axis=1)]
@@ -0,0 +1,63 @@
+import re
+
+## Text normalization shared by the job-role model (training and inference) and the LLM-side helpers.
+## cleanResume is the cleaner the job-role model was trained with. It must stay byte-identical to the original
+## seven re.sub passes (legacy_clean_resume, kept as the reference), including their quirks: "RT" and "cc" are cut
+## out of words too ("accounting" -> "a ounting"), and the model learned its vocabulary from that output.
+## Changing the behaviour means retraining the model with the new cleaner.
+## Lives in Job_Role so the standalone Streamlit app (streamlit run app.py from Job_Role) can import it as well.
+
+PUNCTUATION = r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""   # string.punctuation
+
+# Tokens removed whole, in the order of the original passes (URLs, then hashtags, then mentions). The original
+# replaced "RT" / "cc" by a space before #\S+ / @\S+ ran, so a hashtag or mention ends where one of them begins.
+# Each pattern starts with a literal, which the regex engine searches for directly instead of trying every position.
+TOKEN_PATTERNS = [
+    ('http', re.compile(r'http\S+')),
+    ('#', re.compile(r'#(?:(?!RT|cc)\S)+')),
+    ('@', re.compile(r'@(?:(?!RT|cc)\S)+')),
+]
+
+# Everything else is character-level and runs on ASCII bytes: encode('ascii', 'replace') turns every non-ASCII
+# character into "?", then one bytes.translate maps punctuation (including that "?") and whitespace to a space
+SPACE_TABLE = bytes(32 if chr(i) in PUNCTUATION or chr(i).isspace() else i for i in range(256))
+
+
+def legacy_clean_resume(txt):
+    """The original cleaner (seven passes), the reference cleanResume is tested and benchmarked against."""
+    clean_text = re.sub(r'http\S+', ' ', txt)   # Removes URL
+    clean_text = re.sub(r'RT|cc', ' ', clean_text)
+    clean_text = re.sub(r'#\S+', ' ', clean_text) # Removes HashTags
+    clean_text = re.sub(r'@\S+', ' ', clean_text)  # # Removes @ Signs
+    clean_text = re.sub(r'[%s]' % re.escape(r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', clean_text)  # Removes Special Characters
+    clean_text = re.sub(r'[^\x00-\x7f]', ' ', clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text)
+    return clean_text
+
+
+## Clean Resume Function (job-role model input)
+def cleanResume(txt):
+    for marker, pattern in TOKEN_PATTERNS:
+        if marker in txt:
+            txt = pattern.sub(' ', txt)
+    clean_text = txt.encode('ascii', 'replace').replace(b'RT', b' ').replace(b'cc', b' ').translate(SPACE_TABLE)
+    # Runs of spaces -> one space, keeping a single leading / trailing one like the original \s+ -> ' '
+    words = clean_text.split()
+    if not words:
+        return ' ' if clean_text else ''
+    return ((' ' if clean_text[:1] == b' ' else '') + b' '.join(words).decode('ascii') +
+            (' ' if clean_text[-1:] == b' ' else ''))
+
+
+def normalize_whitespace(text):
+    """Whitespace runs -> one space, stripped: re.sub(r'\\s+', ' ', text).strip() without the regex."""
+    return ' '.join((text or '').split())
+
+
+def normalize_extracted_text(text):
+    """
+    The text every extractor (Text_Extract.py) returns, whatever the file format: "\\n" line ends (also for
+    "\\r\\n", "\\r" and form feeds), no NULs or byte-order marks, no blank lines / spaces around the whole text.
+    """
+    text = (text or '').replace('\r\n', '\n').replace('\r', '\n').replace('\f', '\n')
+    return text.replace('\x00', '').replace('\ufeff', '').strip()
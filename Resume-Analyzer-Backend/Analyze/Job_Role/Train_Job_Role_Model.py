@@ -0,0 +1,237 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import pickle
+import platform
+import time
+from datetime import datetime, timezone
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import StratifiedGroupKFold
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder
+from Job_Role.Text_Normalize import cleanResume
+from Job_Role.Model_Artifact import ARTIFACT_DIR, MANIFEST, export_model
+
+## Trains the job-role model in Job_Role/Model (used by Job_Role/Get_Job_Category.py and Job_Role/app.py), the
+## scripted version of Notebook/Job-Role-Prediction-Model.ipynb. Two variants, both over ResumeDataSet.csv cleaned
+## with the shared cleanResume and written as tfidf.pkl (the vectorizer) / job-role-prediction-model.pkl /
+## job-role-dict.pkl:
+##   knn     : TfidfVectorizer(stop_words='english') + OneVsRestClassifier(KNeighborsClassifier()), the notebook's
+##             model. Also exported as the memory-mapped artifact (Job_Role/Model_Artifact.py).
+##   hashing : HashingVectorizer (no vocabulary to fit or store) + SGDClassifier(log_loss) trained in mini-batches with
+##             partial_fit, so it can keep learning from new resumes (--update). Stored with sparse coefficients.
+## The dataset repeats the same resumes many times (166 distinct texts in 962 rows), so cross-validation keeps all
+## copies of a resume in one fold; a random split like the notebook's scores the copies it has already seen.
+## Everything is seeded: the same command on the same dataset gives the same folds, scores and model.
+## Run Command (from Analyze) : python -m Job_Role.Train_Job_Role_Model --variant knn   (--compare to report both)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, 'Dataset', 'ResumeDataSet.csv')
+MODEL_DIR = os.path.join(BASE_DIR, 'Model')
+REPORT_FILE = 'job-role-training.json'
+
+SEED = 42
+FOLDS = 5
+HASHING_FEATURES = 2 ** 18
+EPOCHS = 10
+BATCH_SIZE = 64
+THROUGHPUT_CHUNK = 256
+
+
+# ---------------------------
+# Dataset
+# ---------------------------
+def load_dataset(path: str = DATASET_PATH):
+    """(cleaned resume texts, category names), in file order."""
+    with open(path, encoding='utf-8', errors='ignore', newline='') as f:
+        rows = list(csv.DictReader(f))
+    return [cleanResume(row['Resume']) for row in rows], [row['Category'] for row in rows]
+
+def dataset_hash(path: str = DATASET_PATH) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ---------------------------
+# Variants
+# ---------------------------
+def fit_knn(texts, labels, classes, seed: int, n_features: int = None):
+    tfidf = TfidfVectorizer(stop_words='english')
+    model = OneVsRestClassifier(KNeighborsClassifier())
+    model.fit(tfidf.fit_transform(texts), labels)
+    return tfidf, model
+
+def make_hashing_vectorizer(n_features: int = HASHING_FEATURES):
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, stop_words='english', norm='l2')
+
+def partial_fit(vectorizer, model, texts, labels, classes, seed: int, epochs: int = EPOCHS, batch_size: int = BATCH_SIZE):
+    """Shuffled mini-batch passes of model.partial_fit (the model has to be dense, see densify)."""
+    X = vectorizer.transform(texts)
+    labels = np.asarray(labels)
+    rng = np.random.RandomState(seed)
+    for _ in range(epochs):
+        order = rng.permutation(len(labels))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            model.partial_fit(X[batch], labels[batch], classes=classes)
+    return model
+
+def fit_hashing(texts, labels, classes, seed: int, n_features: int = HASHING_FEATURES):
+    vectorizer = make_hashing_vectorizer(n_features)
+    model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=seed)
+    return vectorizer, partial_fit(vectorizer, model, texts, labels, classes, seed)
+
+VARIANTS = {'knn': fit_knn, 'hashing': fit_hashing}
+
+
+# ---------------------------
+# Evaluation
+# ---------------------------
+def cross_validate(variant: str, texts, labels, classes, seed: int = SEED, folds: int = FOLDS, n_features: int = HASHING_FEATURES):
+    """Accuracy per fold, identical resumes always in the same fold."""
+    labels = np.asarray(labels)
+    splitter = StratifiedGroupKFold(n_splits=folds, shuffle=True, random_state=seed)
+    scores = []
+    for train, test in splitter.split(texts, labels, groups=texts):
+        vectorizer, model = VARIANTS[variant]([texts[i] for i in train], labels[train], classes, seed, n_features)
+        predictions = model.predict(vectorizer.transform([texts[i] for i in test]))
+        scores.append(float(np.mean(predictions == labels[test])))
+    return scores
+
+def stored_model(model):
+    # Features never seen in training keep a zero weight, so the hashing model's coefficients are mostly zeros
+    if isinstance(model, SGDClassifier):
+        model = pickle.loads(pickle.dumps(model))
+        model.sparsify()
+    return model
+
+def model_size(vectorizer, model) -> dict:
+    return {'vectorizer_bytes': len(pickle.dumps(vectorizer)), 'model_bytes': len(pickle.dumps(stored_model(model))),
+            'vocabulary_terms': len(getattr(vectorizer, 'vocabulary_', {}))}
+
+def throughput(vectorizer, model, texts) -> float:
+    """Resumes per second through vectorizer.transform + model.predict, in chunks like predict_resume_categories."""
+    start = time.perf_counter()
+    for chunk in range(0, len(texts), THROUGHPUT_CHUNK):
+        model.predict(vectorizer.transform(texts[chunk:chunk + THROUGHPUT_CHUNK]))
+    return len(texts) / (time.perf_counter() - start)
+
+def evaluate(variant: str, texts, labels, classes, seed: int, folds: int, n_features: int) -> tuple:
+    """Cross-validate, then train on the whole dataset. Returns (vectorizer, model, report)."""
+    scores = cross_validate(variant, texts, labels, classes, seed, folds, n_features)
+    start = time.perf_counter()
+    vectorizer, model = VARIANTS[variant](texts, labels, classes, seed, n_features)
+    training_seconds = time.perf_counter() - start
+    report = {
+        'variant': variant,
+        'cv_accuracy': scores,
+        'cv_accuracy_mean': float(np.mean(scores)),
+        'training_seconds': round(training_seconds, 3),
+        'throughput_per_second': round(throughput(vectorizer, model, texts), 1),
+        **model_size(vectorizer, model),
+    }
+    if variant == 'hashing':
+        report['hashing_features'] = n_features
+    return vectorizer, model, report
+
+def print_report(report: dict):
+    print(f"{report['variant']:<8} cv accuracy {report['cv_accuracy_mean']:.3f} (folds: {', '.join(f'{s:.3f}' for s in report['cv_accuracy'])})  "
+          f"training {report['training_seconds']:6.2f} s  size {(report['vectorizer_bytes'] + report['model_bytes']) / 1e6:6.2f} MB "
+          f"({report['vocabulary_terms']} vocabulary terms)  inference {report['throughput_per_second']:8.1f} resumes/s")
+
+
+# ---------------------------
+# Output
+# ---------------------------
+def save_model(vectorizer, model, category_map: dict, report: dict, output_dir: str = MODEL_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    for name, obj in (('tfidf.pkl', vectorizer), ('job-role-prediction-model.pkl', stored_model(model)),
+                      ('job-role-dict.pkl', category_map)):
+        with open(os.path.join(output_dir, name), 'wb') as f:
+            pickle.dump(obj, f)
+    with open(os.path.join(output_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    # The memory-mapped artifact is used before the pickles, it has to describe the same model
+    artifact_dir = os.path.join(output_dir, os.path.basename(ARTIFACT_DIR))
+    if report['variant'] == 'knn':
+        export_model(model, vectorizer, category_map, artifact_dir)
+    elif os.path.exists(os.path.join(artifact_dir, MANIFEST)):
+        os.remove(os.path.join(artifact_dir, MANIFEST))
+    print(f"✅ Model written to {output_dir} ({report['variant']})")
+
+def update_hashing_model(texts, labels, seed: int, dataset_path: str = DATASET_PATH, output_dir: str = MODEL_DIR):
+    """Continue training the saved hashing model with partial_fit (new resumes appended to the dataset)."""
+    with open(os.path.join(output_dir, 'tfidf.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    with open(os.path.join(output_dir, 'job-role-prediction-model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(output_dir, 'job-role-dict.pkl'), 'rb') as f:
+        category_map = pickle.load(f)
+    if not isinstance(model, SGDClassifier):
+        raise SystemExit("❌ --update needs the hashing variant in the model directory")
+    unknown = sorted(set(labels) - set(category_map.values()))
+    if unknown:
+        raise SystemExit(f"❌ --update cannot add categories ({', '.join(unknown)}), train the model again")
+    index = {name: category_id for category_id, name in category_map.items()}
+    model.densify()
+    start = time.perf_counter()
+    partial_fit(vectorizer, model, texts, [index[label] for label in labels], model.classes_, seed)
+    print(f"Updated with {len(texts)} resumes in {time.perf_counter() - start:.2f} s")
+
+    report_path = os.path.join(output_dir, REPORT_FILE)
+    report = {'variant': 'hashing'}
+    if os.path.exists(report_path):
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    report.setdefault('updates', []).append({'rows': len(texts), 'dataset_sha256': dataset_hash(dataset_path),
+                                             'created': datetime.now(timezone.utc).isoformat(timespec='seconds')})
+    return vectorizer, model, category_map, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the job-role prediction model")
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='knn', help="Model written to Job_Role/Model")
+    parser.add_argument('--compare', action='store_true', help="Report every variant, write nothing")
+    parser.add_argument('--dry-run', action='store_true', help="Report the variant without writing the model")
+    parser.add_argument('--update', action='store_true', help="partial_fit the saved hashing model on --dataset instead of training")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with Category and Resume columns")
+    parser.add_argument('--output-dir', default=MODEL_DIR, help="Directory for the pickles")
+    parser.add_argument('--seed', type=int, default=SEED, help="Fold / shuffling / model seed")
+    parser.add_argument('--folds', type=int, default=FOLDS, help="Cross-validation folds")
+    parser.add_argument('--hashing-features', type=int, default=HASHING_FEATURES, help="HashingVectorizer n_features")
+    args = parser.parse_args()
+
+    texts, categories = load_dataset(args.dataset)
+    if args.update:
+        vectorizer, model, category_map, report = update_hashing_model(texts, categories, args.seed, args.dataset, args.output_dir)
+        save_model(vectorizer, model, category_map, report, args.output_dir)
+        return
+
+    # Category ids are the LabelEncoder's (sorted names), like the notebook's job-role-dict.pkl
+    encoder = LabelEncoder().fit(categories)
+    labels = encoder.transform(categories)
+    classes = np.arange(len(encoder.classes_))
+    category_map = {int(i): str(name) for i, name in enumerate(encoder.classes_)}
+    print(f"{len(texts)} resumes ({len(set(texts))} distinct), {len(classes)} categories, {args.folds}-fold grouped cross-validation\n")
+
+    for variant in (sorted(VARIANTS) if args.compare else [args.variant]):
+        vectorizer, model, report = evaluate(variant, texts, labels, classes, args.seed, args.folds, args.hashing_features)
+        print_report(report)
+
+    if args.compare or args.dry_run:
+        return
+    report.update({'seed': args.seed, 'folds': args.folds, 'rows': len(texts), 'dataset_sha256': dataset_hash(args.dataset),
+                   'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                   'trained_with': {'python': platform.python_version(), 'numpy': np.__version__, 'scikit-learn': sklearn.__version__}})
+    save_model(vectorizer, model, category_map, report, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
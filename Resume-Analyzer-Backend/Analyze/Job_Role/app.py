@@ -1,10 +1,14 @@
 import streamlit as st
+import os
+import sys
 import pickle
-import re
 import nltk
-import PyPDF2
-import docx
 import numpy as np # Import numpy for array handling
+from Text_Normalize import cleanResume  # same cleaner as the API (Job_Role/Text_Normalize.py)
+
+# The text extractors live one level up (Analyze/Text_Extract.py), shared with the API
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Text_Extract import extract_text
 
 # Command to run : streamlit run app.py
 
@@ -16,71 +20,20 @@ except nltk.downloader.DownloadError:
     nltk.download('punkt')
     nltk.download('stopwords')
 
-## Loading Models
-model = pickle.load(open('./Model/job-role-prediction-model.pkl', 'rb'))
-tfidf = pickle.load(open('./Model/tfidf.pkl', 'rb'))
-category_map = pickle.load(open('./Model/job-role-dict.pkl', 'rb'))
+## Loading Models (relative to this file, so the app can be started from any directory)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model')
+model = pickle.load(open(os.path.join(MODEL_DIR, 'job-role-prediction-model.pkl'), 'rb'))
+tfidf = pickle.load(open(os.path.join(MODEL_DIR, 'tfidf.pkl'), 'rb'))
+category_map = pickle.load(open(os.path.join(MODEL_DIR, 'job-role-dict.pkl'), 'rb'))
 
 
 ### Helper Functions
 
-## Clean Resume Function
-def cleanResume(txt):
-    clean_text = re.sub(r'http\S+', ' ', txt)   # Removes URL
-    clean_text = re.sub(r'RT|cc', ' ', clean_text) 
-    clean_text = re.sub(r'#\S+', ' ', clean_text) # Removes HashTags
-    clean_text = re.sub(r'@\S+', ' ', clean_text)  # # Removes @ Signs
-    clean_text = re.sub(r'[%s]' % re.escape(r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', clean_text)  # Removes Special Characters
-    clean_text = re.sub(r'[^\x00-\x7f]', ' ', clean_text) 
-    clean_text = re.sub(r'\s+', ' ', clean_text)
-    return clean_text
-
-# Function to extract text from PDF
-def extract_text_from_pdf(file):
-    pdf_reader = PyPDF2.PdfReader(file)
-    text = ''
-    for page in pdf_reader.pages:
-        text += page.extract_text() or '' # Added 'or '' to handle potentially empty text
-    return text
-
-
-# Function to extract text from DOCX
-def extract_text_from_docx(file):
-    # docx library handles file-like objects directly
-    doc = docx.Document(file) 
-    text = ''
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + '\n'
-    return text
-
-
-# Function to extract text from TXT with explicit encoding handling
-def extract_text_from_txt(file):
-    # Streamlit passes file-like objects. We read content and decode.
-    # We must reset the stream position before reading, as st.file_uploader reads it initially.
-    file.seek(0)
-    
-    # Try using utf-8 encoding for reading the text file
-    try:
-        text = file.read().decode('utf-8')
-    except UnicodeDecodeError:
-        # In case utf-8 fails, try 'latin-1' encoding as a fallback
-        file.seek(0) # Reset stream again for the second read attempt
-        text = file.read().decode('latin-1')
-    return text
-
 ## Get the Content of the Resume
 def get_resume_content(resume_file):
-    file_extension = resume_file.name.split('.')[-1].lower()
-    if file_extension == 'pdf':
-        text = extract_text_from_pdf(resume_file)
-    elif file_extension == 'docx':
-        text = extract_text_from_docx(resume_file)
-    elif file_extension == 'txt':
-        text = extract_text_from_txt(resume_file)
-    else:
-        raise ValueError("Unsupported file type. Please upload a PDF, DOCX, or TXT file.")
-    return text
+    # PDF, DOCX or TXT, told apart by the file's magic bytes rather than its extension (Text_Extract.py);
+    # raises ValueError for anything else
+    return extract_text(resume_file.getvalue())['text']
 
 ## Predict the Category / Job Role of the Resume
 def predict_resume_category(resume_content):
@@ -0,0 +1,307 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from langchain_core.callbacks import CallbackManager
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import ensure_config
+
+## Pluggable chat model behind Analyze_Resume.model.
+##   groq   : ChatGroq (default)
+##   record : ChatGroq, and every prompt + structured response is appended to a cassette file
+##   replay : answers from a cassette, no network (missing prompts raise, or use the fake model with LLM_REPLAY_ON_MISS=fake)
+##   fake   : synthetic, schema-valid responses generated locally (load tests on an offline machine)
+## Every provider only implements with_structured_output(schema, include_raw=...) and model_name,
+## which is all the graph nodes and the scheduler (LLM_Scheduler.py) use.
+
+GROQ_MODEL_NAME = 'llama-3.3-70b-versatile'
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+# Providers answered locally: no provider limits to respect, the scheduler skips its RPM / TPM budgets for them
+OFFLINE_PROVIDERS = ("replay", "fake")
+# Cassette file used by record / replay
+LLM_CASSETTE = os.getenv("LLM_CASSETTE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cassettes", "default.jsonl"))
+# "error" or "fake" : what replay does with a prompt that is not on the cassette
+LLM_REPLAY_ON_MISS = os.getenv("LLM_REPLAY_ON_MISS", "error")
+# Injected latency for replay / fake calls, in seconds ("recorded" replays the latency captured on the cassette)
+LLM_LATENCY = os.getenv("LLM_LATENCY", "0")
+LLM_LATENCY_JITTER = float(os.getenv("LLM_LATENCY_JITTER", "0"))
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a prompt that was never recorded."""
+
+
+def serialize_messages(messages) -> list:
+    return [{"role": getattr(m, "type", "human"), "content": getattr(m, "content", str(m))} for m in messages]
+
+
+def cassette_key(schema, messages) -> str:
+    """Identifies one structured call: the output schema plus the exact prompt."""
+    payload = json.dumps({"schema": schema.__name__, "messages": serialize_messages(messages)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def structured_result(model_name: str, messages, parsed, usage: dict, include_raw: bool, config=None):
+    """
+    Shape an offline response like langchain's with_structured_output and report it to the
+    callbacks of the current run, so token counters (get_usage_metadata_callback) still see it.
+    """
+    raw = AIMessage(content=parsed.model_dump_json(), usage_metadata=usage, response_metadata={"model_name": model_name})
+    manager = CallbackManager.configure(inheritable_callbacks=ensure_config(config).get("callbacks"))
+    for run in manager.on_chat_model_start({"name": model_name}, [list(messages)]):
+        run.on_llm_end(LLMResult(generations=[[ChatGeneration(message=raw)]]))
+    if not include_raw:
+        return parsed
+    return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+
+def estimate_usage(messages, parsed) -> dict:
+    input_tokens = sum(len(m["content"]) for m in serialize_messages(messages)) // 4
+    output_tokens = len(parsed.model_dump_json()) // 4
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+class InjectedLatency:
+    """
+    Latency added to offline calls. The jitter is seeded by the call key, so the same prompt
+    always waits the same time and runs stay reproducible.
+    """
+
+    def __init__(self, latency: str = LLM_LATENCY, jitter: float = LLM_LATENCY_JITTER):
+        self.recorded = latency == "recorded"
+        self.latency = 0.0 if self.recorded else float(latency)
+        self.jitter = jitter
+
+    def seconds(self, key: str, recorded: float = 0.0) -> float:
+        base = recorded if self.recorded else self.latency
+        if not self.jitter:
+            return base
+        return max(0.0, base + random.Random(key).uniform(-self.jitter, self.jitter))
+
+
+# ---------------------------
+# Synthetic Fake Model
+# ---------------------------
+FAKE_CATEGORIES = ["Data Science", "Python Developer", "Java Developer", "Web Designing", "DevOps Engineer",
+                   "Business Analyst", "HR", "Testing", "Network Security Engineer", "Database"]
+
+
+def fake_value(name: str, field, rng: random.Random):
+    annotation = field.annotation
+    if annotation is bool:
+        return True
+    if annotation is int:
+        low, high = 0, 100
+        for constraint in field.metadata:
+            low = getattr(constraint, "ge", low)
+            high = getattr(constraint, "le", high)
+        # Stay in the range real analyses mostly land in
+        return rng.randint(max(low, 40), min(high, 95))
+    label = name.replace("_", " ")
+    if annotation == list[str]:
+        return [f"Synthetic {label} point {i + 1}." for i in range(rng.randint(2, 5))]
+    if "category" in name:
+        return rng.choice(FAKE_CATEGORIES)
+    return f"Synthetic {label} for load testing."
+
+
+def fake_response(schema, messages):
+    """Schema-valid instance of `schema`, deterministic for a given prompt."""
+    rng = random.Random(cassette_key(schema, messages))
+    return schema(**{name: fake_value(name, field, rng) for name, field in schema.model_fields.items()})
+
+
+class FakeStructuredModel:
+
+    def __init__(self, schema, include_raw: bool, latency: InjectedLatency):
+        self.schema = schema
+        self.include_raw = include_raw
+        self.latency = latency
+
+    def respond(self, messages, config):
+        parsed = fake_response(self.schema, messages)
+        return structured_result(FakeChatModel.model_name, messages, parsed, estimate_usage(messages, parsed), self.include_raw, config)
+
+    def invoke(self, messages, config=None):
+        time.sleep(self.latency.seconds(cassette_key(self.schema, messages)))
+        return self.respond(messages, config)
+
+    async def ainvoke(self, messages, config=None):
+        await asyncio.sleep(self.latency.seconds(cassette_key(self.schema, messages)))
+        return self.respond(messages, config)
+
+
+class FakeChatModel:
+    model_name = "fake"
+
+    def __init__(self, latency: InjectedLatency = None):
+        self.latency = latency or InjectedLatency()
+
+    def with_structured_output(self, schema, include_raw: bool = False, **kwargs):
+        return FakeStructuredModel(schema, include_raw, self.latency)
+
+
+# ---------------------------
+# Cassettes
+# ---------------------------
+class Cassette:
+    """Recorded calls stored as JSON lines: key, schema, messages, response, usage, latency."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.records[record["key"]] = record
+
+    def get(self, key: str):
+        return self.records.get(key)
+
+    def append(self, record: dict):
+        with self.lock:
+            self.records[record["key"]] = record
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class RecordingStructuredModel:
+
+    def __init__(self, runnable, schema, include_raw: bool, cassette: Cassette, model_name: str):
+        self.runnable = runnable
+        self.schema = schema
+        self.include_raw = include_raw
+        self.cassette = cassette
+        self.model_name = model_name
+
+    def record(self, messages, result, latency: float):
+        raw, parsed = result["raw"], result["parsed"]
+        if parsed is None:
+            # Nothing worth replaying; let the caller see the parsing error
+            if self.include_raw:
+                return result
+            raise result["parsing_error"]
+        self.cassette.append({
+            "key": cassette_key(self.schema, messages),
+            "model": self.model_name,
+            "schema": self.schema.__name__,
+            "messages": serialize_messages(messages),
+            "response": parsed.model_dump(),
+            "usage": dict(getattr(raw, "usage_metadata", None) or {}),
+            "latency": round(latency, 4),
+        })
+        return result if self.include_raw else parsed
+
+    def invoke(self, messages, config=None):
+        started = time.perf_counter()
+        result = self.runnable.invoke(messages, config)
+        return self.record(messages, result, time.perf_counter() - started)
+
+    async def ainvoke(self, messages, config=None):
+        started = time.perf_counter()
+        result = await self.runnable.ainvoke(messages, config)
+        return self.record(messages, result, time.perf_counter() - started)
+
+
+class RecordingChatModel:
+
+    def __init__(self, model, cassette: Cassette):
+        self.model = model
+        self.cassette = cassette
+        self.model_name = model.model_name
+
+    def with_structured_output(self, schema, include_raw: bool = False, **kwargs):
+        runnable = self.model.with_structured_output(schema, include_raw=True, **kwargs)
+        return RecordingStructuredModel(runnable, schema, include_raw, self.cassette, self.model_name)
+
+
+class ReplayStructuredModel:
+
+    def __init__(self, schema, include_raw: bool, cassette: Cassette, latency: InjectedLatency, on_miss: str, model_name: str):
+        self.model_name = model_name
+        self.schema = schema
+        self.include_raw = include_raw
+        self.cassette = cassette
+        self.latency = latency
+        self.on_miss = on_miss
+
+    def lookup(self, messages):
+        """Recorded (or, with on_miss="fake", synthetic) response, its usage and the recorded latency."""
+        key = cassette_key(self.schema, messages)
+        record = self.cassette.get(key)
+        if record is not None:
+            parsed = self.schema(**record["response"])
+            return key, parsed, record.get("usage") or estimate_usage(messages, parsed), record.get("latency", 0.0)
+        if self.on_miss == "fake":
+            parsed = fake_response(self.schema, messages)
+            return key, parsed, estimate_usage(messages, parsed), 0.0
+        raise CassetteMissError(f"No recorded {self.schema.__name__} response for this prompt in {self.cassette.path}")
+
+    def invoke(self, messages, config=None):
+        key, parsed, usage, recorded = self.lookup(messages)
+        time.sleep(self.latency.seconds(key, recorded))
+        return structured_result(self.model_name, messages, parsed, usage, self.include_raw, config)
+
+    async def ainvoke(self, messages, config=None):
+        key, parsed, usage, recorded = self.lookup(messages)
+        await asyncio.sleep(self.latency.seconds(key, recorded))
+        return structured_result(self.model_name, messages, parsed, usage, self.include_raw, config)
+
+
+class ReplayChatModel:
+
+    def __init__(self, cassette: Cassette, latency: InjectedLatency = None, on_miss: str = LLM_REPLAY_ON_MISS):
+        self.cassette = cassette
+        self.latency = latency or InjectedLatency()
+        self.on_miss = on_miss
+        # Kept apart from live results in the analysis cache
+        self.model_name = f"replay:{os.path.basename(cassette.path)}"
+
+    def with_structured_output(self, schema, include_raw: bool = False, **kwargs):
+        return ReplayStructuredModel(schema, include_raw, self.cassette, self.latency, self.on_miss, self.model_name)
+
+
+# ---------------------------
+# Factory
+# ---------------------------
+def create_chat_model(provider: str = None, cassette_path: str = None):
+    """
+    Build the chat model for `provider` ("groq", "record", "replay" or "fake"; defaults to LLM_PROVIDER).
+    """
+    provider = provider or LLM_PROVIDER
+    cassette_path = cassette_path or LLM_CASSETTE
+    if provider in ("groq", "record"):
+        from langchain_groq import ChatGroq
+        # Calls are throttled / retried by the shared scheduler (LLM_Scheduler.py), so the client itself does not retry
+        model = ChatGroq(model=GROQ_MODEL_NAME, max_retries=0)
+        return model if provider == "groq" else RecordingChatModel(model, Cassette(cassette_path))
+    if provider == "replay":
+        return ReplayChatModel(Cassette(cassette_path))
+    if provider == "fake":
+        return FakeChatModel()
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+def is_offline_provider(provider: str = None) -> bool:
+    return (provider or LLM_PROVIDER) in OFFLINE_PROVIDERS
+
+def chat_model_name(provider: str = None, cassette_path: str = None) -> str:
+    """
+    model_name of the model create_chat_model would build, without building it (cache keys).
+    """
+    provider = provider or LLM_PROVIDER
+    if provider in ("groq", "record"):
+        return GROQ_MODEL_NAME
+    if provider == "replay":
+        return f"replay:{os.path.basename(cassette_path or LLM_CASSETTE)}"
+    if provider == "fake":
+        return FakeChatModel.model_name
+    raise ValueError(f"Unknown LLM provider: {provider}")
@@ -0,0 +1,357 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+## Shared scheduler in front of the Groq chat model.
+## Every structured LLM call made by the analysis graph goes through one LLMScheduler, which
+##   - keeps request (RPM) and token (TPM) budgets as token buckets so we stay under the provider limits
+##     (calls to the offline replay / fake providers skip them, see ScheduledModel),
+##   - lets interactive uploads go ahead of background / batch work when calls are waiting for budget,
+##   - retries 429 / 5xx / connection errors with exponential backoff and full jitter (Retry-After is honoured),
+##   - counts queue depth, retries and rate-limit hits for /llm_scheduler/stats.
+
+# Provider limits (set them to the limits of your Groq plan)
+LLM_RPM = int(os.getenv("LLM_RPM", "30"))
+LLM_TPM = int(os.getenv("LLM_TPM", "12000"))
+# Retry policy for rate limits and server errors
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+# Completion tokens reserved per call until the real usage is known
+LLM_OUTPUT_TOKENS = int(os.getenv("LLM_OUTPUT_TOKENS", "600"))
+
+# Priority classes, lower value is served first
+PRIORITIES = {"interactive": 0, "background": 1, "batch": 2}
+
+# Longest a waiting call sleeps before checking the budgets / queue again
+POLL_INTERVAL = 0.05
+
+llm_priority_var = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """
+    Run the enclosed LLM calls with the given priority class
+    ("interactive", "background" or "batch").
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = llm_priority_var.set(priority)
+    try:
+        yield
+    finally:
+        llm_priority_var.reset(token)
+
+
+class LLMRateLimitError(RuntimeError):
+    """Raised when a call is still rate limited after all retries."""
+
+
+# ---------------------------
+# Token Bucket
+# ---------------------------
+class TokenBucket:
+    """
+    Budget of `capacity` units refilled continuously at `capacity` units per minute.
+    A capacity of 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if not self.capacity:
+            return 0.0
+        self.refill(now)
+        # A single request bigger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        if self.capacity:
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Give back (positive) or charge extra (negative) once the real usage is known."""
+        if self.capacity:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self, now: float):
+        if self.capacity:
+            self.refill(now)
+            self.tokens = min(self.tokens, 0.0)
+
+
+def estimate_tokens(messages) -> int:
+    """Rough prompt size (~4 characters per token) plus the completion reserve."""
+    chars = 0
+    for message in messages:
+        content = getattr(message, "content", message)
+        chars += len(content) if isinstance(content, str) else len(str(content))
+    return chars // 4 + LLM_OUTPUT_TOKENS
+
+
+def retry_delay(error: Exception):
+    """
+    Seconds the provider asked us to wait (Retry-After) or 0.0 for a retryable error
+    without a hint, None if the error should not be retried.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        # Connection errors / timeouts from the Groq or httpx clients
+        if type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout"):
+            return 0.0
+        return None
+    if status != 429 and status < 500:
+        return None
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ---------------------------
+# Scheduler
+# ---------------------------
+class LLMScheduler:
+
+    def __init__(self, rpm: int = LLM_RPM, tpm: int = LLM_TPM, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE, backoff_max: float = LLM_BACKOFF_MAX):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lock = threading.Lock()
+        # Nothing is dispatched before this time (set when the provider answers 429)
+        self.paused_until = 0.0
+        self.waiting = {priority: 0 for priority in PRIORITIES}
+        self.in_flight = 0
+        self.counters = {"calls": 0, "completed": 0, "failed": 0, "retries": 0,
+                         "rate_limited": 0, "queue_wait_seconds": 0.0, "max_queue_depth": 0}
+
+    # --- admission ---------------------------------------------------------
+
+    def try_acquire(self, priority: str, amount: int, rate_limited: bool = True) -> float:
+        """Take the budget for one call; returns 0.0 on success or the seconds to wait."""
+        with self.lock:
+            if not rate_limited:
+                # Answered locally: no provider budget to take or pause to honour
+                self.in_flight += 1
+                return 0.0
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            rank = PRIORITIES[priority]
+            if any(count for name, count in self.waiting.items() if PRIORITIES[name] < rank):
+                # Higher priority calls are queued, let them go first
+                return POLL_INTERVAL
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(amount, now))
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(amount)
+            self.in_flight += 1
+            return 0.0
+
+    def enter_queue(self, priority: str):
+        with self.lock:
+            self.waiting[priority] += 1
+            self.counters["max_queue_depth"] = max(self.counters["max_queue_depth"], sum(self.waiting.values()))
+
+    def leave_queue(self, priority: str, waited: float):
+        with self.lock:
+            self.waiting[priority] -= 1
+            self.counters["queue_wait_seconds"] += waited
+
+    def release(self, reserved: int, used, rate_limited: bool = True):
+        with self.lock:
+            self.in_flight -= 1
+            if used is not None and rate_limited:
+                self.tokens.adjust(reserved - used)
+
+    def acquire(self, priority: str, amount: int, rate_limited: bool = True):
+        started = time.monotonic()
+        self.enter_queue(priority)
+        try:
+            while True:
+                wait = self.try_acquire(priority, amount, rate_limited)
+                if not wait:
+                    return
+                time.sleep(min(wait, POLL_INTERVAL))
+        finally:
+            self.leave_queue(priority, time.monotonic() - started)
+
+    async def aacquire(self, priority: str, amount: int, rate_limited: bool = True):
+        started = time.monotonic()
+        self.enter_queue(priority)
+        try:
+            while True:
+                wait = self.try_acquire(priority, amount, rate_limited)
+                if not wait:
+                    return
+                await asyncio.sleep(min(wait, POLL_INTERVAL))
+        finally:
+            self.leave_queue(priority, time.monotonic() - started)
+
+    # --- retries -----------------------------------------------------------
+
+    def backoff(self, error: Exception, attempt: int):
+        """Seconds to wait before the next attempt, or None if the error is final."""
+        hint = retry_delay(error)
+        if hint is None or attempt >= self.max_retries:
+            return None
+        delay = max(hint, random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+        with self.lock:
+            self.counters["retries"] += 1
+            if getattr(error, "status_code", None) == 429:
+                # The provider disagrees with our budget: stop everyone until it recovers
+                self.counters["rate_limited"] += 1
+                now = time.monotonic()
+                self.requests.drain(now)
+                self.tokens.drain(now)
+                self.paused_until = max(self.paused_until, now + hint)
+        return delay
+
+    def fail(self, error: Exception):
+        with self.lock:
+            self.counters["failed"] += 1
+        if getattr(error, "status_code", None) == 429:
+            raise LLMRateLimitError(f"LLM provider is rate limiting requests: {error}") from error
+        raise error
+
+    def call(self, runnable, messages, config=None, rate_limited: bool = True):
+        priority = llm_priority_var.get()
+        reserved = estimate_tokens(messages)
+        with self.lock:
+            self.counters["calls"] += 1
+        attempt = 0
+        while True:
+            self.acquire(priority, reserved, rate_limited)
+            try:
+                result = runnable.invoke(messages, config)
+            except Exception as e:
+                self.release(reserved, None, rate_limited)
+                delay = self.backoff(e, attempt)
+                if delay is None:
+                    self.fail(e)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self.release(reserved, usage_tokens(result), rate_limited)
+            with self.lock:
+                self.counters["completed"] += 1
+            return result
+
+    async def acall(self, runnable, messages, config=None, rate_limited: bool = True):
+        priority = llm_priority_var.get()
+        reserved = estimate_tokens(messages)
+        with self.lock:
+            self.counters["calls"] += 1
+        attempt = 0
+        while True:
+            await self.aacquire(priority, reserved, rate_limited)
+            try:
+                result = await runnable.ainvoke(messages, config)
+            except Exception as e:
+                self.release(reserved, None, rate_limited)
+                delay = self.backoff(e, attempt)
+                if delay is None:
+                    self.fail(e)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.release(reserved, usage_tokens(result), rate_limited)
+            with self.lock:
+                self.counters["completed"] += 1
+            return result
+
+    def stats(self) -> dict:
+        with self.lock:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                **self.counters,
+                "queue_depth": sum(self.waiting.values()),
+                "waiting": dict(self.waiting),
+                "in_flight": self.in_flight,
+                "requests_available": round(self.requests.tokens, 2),
+                "tokens_available": round(self.tokens.tokens, 2),
+                "paused_seconds": round(max(0.0, self.paused_until - now), 2),
+                "limits": {"rpm": int(self.requests.capacity), "tpm": int(self.tokens.capacity)},
+            }
+
+
+def usage_tokens(result):
+    """Total tokens reported by the provider for an include_raw structured output."""
+    raw = result.get("raw") if isinstance(result, dict) else None
+    usage = getattr(raw, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens")
+    return None
+
+
+# ---------------------------
+# Scheduled Model
+# ---------------------------
+class ScheduledStructuredModel:
+    """Structured output runnable whose calls go through the scheduler."""
+
+    def __init__(self, runnable, scheduler: LLMScheduler, rate_limited: bool = True):
+        self.runnable = runnable
+        self.scheduler = scheduler
+        self.rate_limited = rate_limited
+
+    @staticmethod
+    def parsed(result):
+        if result.get("parsing_error") is not None:
+            raise result["parsing_error"]
+        return result["parsed"]
+
+    def invoke(self, messages, config=None):
+        return self.parsed(self.scheduler.call(self.runnable, messages, config, self.rate_limited))
+
+    async def ainvoke(self, messages, config=None):
+        return self.parsed(await self.scheduler.acall(self.runnable, messages, config, self.rate_limited))
+
+
+class ScheduledModel:
+    """
+    Drop-in wrapper for the chat model: `with_structured_output(schema)` returns a runnable
+    scheduled by `scheduler`, every other attribute is read from the wrapped model.
+    rate_limited=False (offline providers) keeps the retries and counters but skips the RPM / TPM budgets.
+    """
+
+    def __init__(self, model, scheduler: LLMScheduler, rate_limited: bool = True):
+        self.model = model
+        self.scheduler = scheduler
+        self.rate_limited = rate_limited
+
+    def with_structured_output(self, schema, **kwargs):
+        # include_raw keeps the provider's usage metadata so the token bucket can be settled
+        runnable = self.model.with_structured_output(schema, include_raw=True, **kwargs)
+        return ScheduledStructuredModel(runnable, self.scheduler, self.rate_limited)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+# Shared by every graph in this process
+llm_scheduler = LLMScheduler()
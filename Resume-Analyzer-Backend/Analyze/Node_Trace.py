@@ -0,0 +1,103 @@
+import threading
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+
+## Per-node timing and LLM token trace for the LangGraph workflow.
+## Usage : trace = NodeTimingTrace(); workflow.invoke(state, config={'callbacks': [trace]}); print(trace.format())
+
+
+class NodeTimingTrace(BaseCallbackHandler):
+    """
+    Callback handler that records when every graph node starts and finishes, and the LLM tokens each node used.
+    Node runs are recognised by LangGraph's 'langgraph_node' metadata matching the run name;
+    LLM runs inherit that metadata, which attributes their usage to the node.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.running = {}  # run_id -> (node, step, start)
+        self.spans = []    # finished nodes, in completion order
+        self.llm_runs = {}  # run_id -> node
+        self.tokens = {}    # node -> {'calls', 'input_tokens', 'output_tokens'}
+        self.lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get('langgraph_node')
+        if node is None or kwargs.get('name') != node:
+            return
+        with self.lock:
+            # The wrapped node runnable shares the node's name, only time the outermost run
+            parent = self.running.get(parent_run_id)
+            if parent is not None and parent[0] == node:
+                return
+            self.running[run_id] = (node, metadata.get('langgraph_step'), time.perf_counter() - self.origin)
+
+    def finish(self, run_id, status: str):
+        end = time.perf_counter() - self.origin
+        with self.lock:
+            started = self.running.pop(run_id, None)
+            if started is None:
+                return
+            node, step, start = started
+            self.spans.append({'node': node, 'step': step, 'start': start, 'end': end, 'duration': end - start, 'status': status})
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        self.finish(run_id, 'ok')
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self.finish(run_id, 'error')
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get('langgraph_node')
+        if node is not None:
+            with self.lock:
+                self.llm_runs[run_id] = node
+
+    def on_llm_end(self, response, *, run_id, parent_run_id=None, **kwargs):
+        with self.lock:
+            node = self.llm_runs.pop(run_id, None)
+            if node is None:
+                return
+            usage = {}
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or usage
+            totals = self.tokens.setdefault(node, {'calls': 0, 'input_tokens': 0, 'output_tokens': 0})
+            totals['calls'] += 1
+            totals['input_tokens'] += usage.get('input_tokens', 0)
+            totals['output_tokens'] += usage.get('output_tokens', 0)
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        with self.lock:
+            self.llm_runs.pop(run_id, None)
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: wall-clock span of all nodes (the critical path), the sum of node durations, and the
+                  LLM input / output tokens of the whole run. A sum larger than the critical path means nodes overlapped.
+        """
+        input_tokens = sum(t['input_tokens'] for t in self.tokens.values())
+        output_tokens = sum(t['output_tokens'] for t in self.tokens.values())
+        if not self.spans:
+            return {'critical_path': 0.0, 'node_time': 0.0, 'input_tokens': input_tokens, 'output_tokens': output_tokens}
+        critical_path = max(s['end'] for s in self.spans) - min(s['start'] for s in self.spans)
+        return {'critical_path': critical_path, 'node_time': sum(s['duration'] for s in self.spans),
+                'input_tokens': input_tokens, 'output_tokens': output_tokens}
+
+    def format(self) -> str:
+        lines = []
+        for span in sorted(self.spans, key=lambda s: s['start']):
+            lines.append(f"  step {span['step']}  {span['node']:<22} {span['start'] * 1000:9.1f} -> {span['end'] * 1000:9.1f} ms"
+                         f"  ({span['duration'] * 1000:8.1f} ms) {span['status']}"
+                         + self.format_tokens(span['node']))
+        summary = self.summary()
+        lines.append(f"  critical path {summary['critical_path'] * 1000:.1f} ms, summed node time {summary['node_time'] * 1000:.1f} ms, "
+                     f"LLM tokens in={summary['input_tokens']} out={summary['output_tokens']}")
+        return "\n".join(lines)
+
+    def format_tokens(self, node: str) -> str:
+        totals = self.tokens.get(node)
+        if not totals:
+            return ""
+        return f"  tokens in={totals['input_tokens']} out={totals['output_tokens']}"
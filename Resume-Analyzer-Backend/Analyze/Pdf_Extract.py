@@ -0,0 +1,400 @@
+import hashlib
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from io import BytesIO
+import PyPDF2
+
+## Bounded PDF text extraction for uploads.
+## The document is rejected above PDF_MAX_BYTES before it is parsed (read_upload stops reading there already), at
+## most PDF_MAX_PAGES pages are read, and extraction stops at the PDF_TIME_BUDGET deadline or once PDF_TEXT_TARGET
+## characters have been gathered, keeping the pages read so far. Pages are extracted in order as a stream and joined
+## once at the end (the text is the same as the old page-by-page concatenation, minus the quadratic copying).
+## All the parsing (the PdfReader as well as every page) runs in a pool of worker processes that stream the page texts
+## back, so the deadline is a hard bound: the caller never waits past it, and a worker still parsing then (a crafted
+## page can keep PyPDF2 busy for minutes) is killed and replaced. Documents with PDF_PARALLEL_PAGES pages or more are
+## split into page ranges spread over several workers (PyPDF2 is pure Python, threads would hold the GIL), collected
+## in page order.
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))  # larger uploads are rejected unread
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))                    # pages read at most, the rest is ignored
+PDF_TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "10"))              # seconds per document, the pages read by then are used
+PDF_TEXT_TARGET = int(os.getenv("PDF_TEXT_TARGET", "60000"))             # characters after which the remaining pages are skipped (0 = no limit)
+PDF_PARALLEL_PAGES = int(os.getenv("PDF_PARALLEL_PAGES", "12"))          # page count from which the process pool is used (0 = never)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))  # parsing processes (0 = in the calling thread, deadline checked between pages only)
+
+UPLOAD_READ_CHUNK = 1024 * 1024
+MAX_RANGE_PAGES = 4  # pages per parallel range: small enough that the early stops and the deadline lose little work
+
+pool = None
+pool_lock = threading.Lock()
+document_ids = itertools.count()  # tells the workers which document a request is about
+
+
+# ---------------------------
+# Upload Reading
+# ---------------------------
+async def read_upload(uploaded_file, max_bytes: int = PDF_MAX_BYTES) -> tuple:
+    """
+    Read a FastAPI UploadFile in chunks, giving up as soon as it exceeds max_bytes.
+    The SHA-256 of the file is computed along the way (the key of the extraction cache, Extraction_Cache.py).
+
+    Returns:
+        tuple: (file bytes, SHA-256 hex digest).
+
+    Raises:
+        ValueError: If the file is larger than max_bytes.
+    """
+    chunks, size = [], 0
+    digest = hashlib.sha256()
+    while True:
+        chunk = await uploaded_file.read(UPLOAD_READ_CHUNK)
+        if not chunk:
+            return b''.join(chunks), digest.hexdigest()
+        size += len(chunk)
+        if size > max_bytes:
+            raise ValueError(f"The uploaded file is larger than {max_bytes // (1024 * 1024)} MB")
+        digest.update(chunk)
+        chunks.append(chunk)
+
+
+# ---------------------------
+# Worker Processes
+# ---------------------------
+def worker_main(connection):
+    """
+    Loop of a PDF worker process. Requests:
+      ('open', document_id, data)                                   -> ('pages', page count)
+      ('read', document_id, data, start, stop, deadline, text_target) -> ('page', text) per page, then ('done', stopped)
+    data is None when the worker already holds the document; any parsing error is answered with ('error', exception).
+    """
+    document_id, reader = None, None
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        try:
+            if request[1] != document_id:
+                document_id, reader = request[1], PyPDF2.PdfReader(BytesIO(request[2]))
+            if request[0] == 'open':
+                connection.send(('pages', len(reader.pages)))
+                continue
+            _, _, _, start, stop, deadline, text_target = request
+            gathered, stopped = 0, None
+            for index in range(start, stop):
+                if time.time() >= deadline:
+                    stopped = 'time_budget'
+                    break
+                text = reader.pages[index].extract_text() or ''
+                connection.send(('page', text))
+                gathered += len(text)
+                if text_target and gathered >= text_target and index + 1 < stop:
+                    stopped = 'text_target'
+                    break
+            connection.send(('done', stopped))
+        except Exception as e:
+            document_id, reader = None, None
+            try:
+                connection.send(('error', e))
+            except Exception:
+                # Not every parser exception pickles
+                connection.send(('error', ValueError(str(e))))
+
+
+class PdfWorker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self):
+        context = multiprocessing.get_context('spawn')
+        self.connection, child = context.Pipe()
+        # spawn: forking a process that runs threads (uvicorn, the warmup) can copy a held lock
+        self.process = context.Process(target=worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.document_id = None   # document whose reader the worker holds
+        self.pending = None       # deadline of a read the caller stopped waiting for (replies still to drain)
+
+    def send(self, request: tuple):
+        self.connection.send(request)
+        self.document_id = request[1]
+
+    def receive(self, deadline: float):
+        """Next reply, None if the deadline passes first, ('crashed',) if the process died."""
+        try:
+            if not self.connection.poll(max(0.0, deadline - time.time())):
+                return None
+            return self.connection.recv()
+        except (EOFError, OSError):
+            return ('crashed',)
+
+    def drain(self, deadline: float) -> bool:
+        """Skip the replies of the pending read; False if it is still running at the deadline."""
+        while self.pending is not None:
+            reply = self.receive(min(deadline, self.pending))
+            if reply is None or reply[0] == 'crashed':
+                return False
+            if reply[0] in ('done', 'error'):
+                self.pending = None
+        return True
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1)
+        self.connection.close()
+
+
+class PdfWorkerPool:
+    """
+    Up to `size` worker processes, started on demand. A worker still parsing when its document's deadline passes
+    is killed (a crafted page can keep PyPDF2 busy far longer than the budget) and replaced by the next acquire.
+    """
+
+    def __init__(self, size: int = PDF_WORKERS):
+        self.size = size
+        self.idle = []
+        self.started = 0  # live workers, idle or busy
+        self.condition = threading.Condition()
+        self.killed = 0
+
+    def acquire(self, deadline: float, wait: bool = True):
+        """An idle (or new) worker, or None if there is none before the deadline (right away with wait=False)."""
+        while True:
+            with self.condition:
+                while not self.idle and self.started >= self.size:
+                    remaining = deadline - time.time()
+                    if not wait or remaining <= 0:
+                        return None
+                    self.condition.wait(remaining)
+                if self.idle:
+                    worker = self.idle.pop()
+                else:
+                    self.started += 1
+                    worker = None
+            if worker is None:
+                try:
+                    return PdfWorker()
+                except Exception:
+                    with self.condition:
+                        self.started -= 1
+                        self.condition.notify()
+                    raise
+            if worker.drain(deadline):
+                return worker
+            self.discard(worker)
+
+    def release(self, worker: PdfWorker):
+        if not worker.process.is_alive():
+            self.discard(worker)
+            return
+        with self.condition:
+            self.idle.append(worker)
+            self.condition.notify()
+
+    def discard(self, worker: PdfWorker):
+        worker.kill()
+        with self.condition:
+            self.started -= 1
+            self.killed += 1
+            self.condition.notify()
+
+    def settle(self, worker: PdfWorker, deadline: float):
+        """Return a worker whose read was abandoned: kept if it is done (or will stop by itself), killed past the deadline."""
+        worker.pending = deadline
+        if time.time() < deadline or worker.drain(time.time()):
+            self.release(worker)
+        else:
+            self.discard(worker)
+
+    def start(self):
+        """Start every worker ahead of the first upload (API warmup)."""
+        workers = [worker for worker in (self.acquire(time.time() + 60, wait=False) for _ in range(self.size)) if worker]
+        for worker in workers:
+            self.release(worker)
+
+
+def get_pool() -> PdfWorkerPool:
+    global pool
+    with pool_lock:
+        if pool is None:
+            pool = PdfWorkerPool(PDF_WORKERS)
+        return pool
+
+def start_workers():
+    # Spawning a worker imports PyPDF2 in a fresh interpreter, the API warmup does it before the first upload
+    if PDF_WORKERS:
+        get_pool().start()
+
+
+# ---------------------------
+# Page Extraction
+# ---------------------------
+def read_range(worker: PdfWorker, texts: list, deadline: float):
+    """
+    Collect the page texts of the read sent to worker into texts.
+
+    Returns:
+        tuple: (finished, stopped) - finished is False if the deadline passed first (the read is left pending).
+
+    Raises:
+        Exception: The parser's error for the document.
+    """
+    while True:
+        reply = worker.receive(deadline)
+        if reply is None:
+            return False, 'time_budget'
+        if reply[0] == 'page':
+            texts.append(reply[1])
+        elif reply[0] == 'done':
+            return True, reply[1]
+        elif reply[0] == 'error':
+            raise reply[1]
+        else:
+            raise ValueError("The PDF could not be read (its extraction process crashed)")
+
+def extract_sequential(reader, page_count: int, deadline: float, text_target: int):
+    """(page texts, reason extraction stopped early or None), in the calling thread (PDF_WORKERS=0)."""
+    texts, gathered = [], 0
+    for index in range(page_count):
+        if time.time() >= deadline:
+            return texts, 'time_budget'
+        text = reader.pages[index].extract_text() or ''
+        texts.append(text)
+        gathered += len(text)
+        if text_target and gathered >= text_target and index + 1 < page_count:
+            return texts, 'text_target'
+    return texts, None
+
+def extract_parallel(workers: PdfWorkerPool, first: PdfWorker, document_id: int, data: bytes, page_count: int,
+                     deadline: float, text_target: int, parallel: bool):
+    """
+    Read the pages in worker processes. first already holds the document; with parallel, page ranges are spread
+    over as many idle workers as there are and collected in page order, so the early stop needs no more than the
+    ranges already in flight. Workers still reading when the caller stops are settled by the pool: reused once
+    done, killed if they are still parsing past the deadline.
+    """
+    if not parallel:
+        ranges = deque([(0, page_count)])
+    else:
+        chunk_pages = max(1, min(MAX_RANGE_PAGES, -(-page_count // (PDF_WORKERS * 2))))
+        ranges = deque((start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages))
+    idle = [first]
+    while parallel and len(idle) < min(PDF_WORKERS, len(ranges)):
+        worker = workers.acquire(deadline, wait=False)
+        if worker is None:
+            break
+        idle.append(worker)
+
+    in_flight = deque()  # (worker, pages expected)
+    texts, gathered, stopped = [], 0, None
+    try:
+        while ranges or in_flight:
+            while ranges and idle:
+                start, stop = ranges.popleft()
+                worker = idle.pop()
+                held = worker.document_id == document_id
+                worker.send(('read', document_id, None if held else data, start, stop, deadline, 0 if parallel else text_target))
+                in_flight.append((worker, stop - start))
+            worker, expected = in_flight.popleft()
+            page_texts = []
+            try:
+                finished, stopped = read_range(worker, page_texts, deadline)
+            except Exception:
+                idle.append(worker)
+                raise
+            texts.extend(page_texts)
+            if not finished:
+                in_flight.appendleft((worker, expected))
+                return texts, stopped
+            idle.append(worker)
+            if stopped:
+                return texts, stopped
+            gathered += sum(len(text) for text in page_texts)
+            if text_target and gathered >= text_target and (ranges or in_flight):
+                return texts, 'text_target'
+        return texts, None
+    finally:
+        for worker, _ in in_flight:
+            workers.settle(worker, deadline)
+        for worker in idle:
+            workers.release(worker)
+
+
+# ---------------------------
+# PDF Text Extraction
+# ---------------------------
+def extract_in_workers(data: bytes, max_pages: int, deadline: float, text_target: int, parallel_pages: int):
+    """(pages, page texts, stopped, parallel) with every step of the parsing in the worker processes."""
+    workers = get_pool()
+    worker = workers.acquire(deadline)
+    if worker is None:
+        return 0, [], 'time_budget', False
+    document_id = next(document_ids)
+    worker.send(('open', document_id, data))
+    reply = worker.receive(deadline)
+    if reply is None:
+        # Still parsing the document structure at the deadline
+        print("⚠️ PDF still parsing at its time budget, the worker process is replaced")
+        workers.discard(worker)
+        return 0, [], 'time_budget', False
+    if reply[0] != 'pages':
+        if reply[0] == 'crashed':
+            workers.discard(worker)
+            raise ValueError("The PDF could not be read (its extraction process crashed)")
+        workers.release(worker)
+        raise reply[1]
+
+    pages = reply[1]
+    page_count = min(pages, max_pages)
+    parallel = bool(parallel_pages) and page_count >= parallel_pages and PDF_WORKERS > 1
+    texts, stopped = extract_parallel(workers, worker, document_id, data, page_count, deadline, text_target, parallel)
+    return pages, texts, stopped, parallel
+
+def extract_pdf(file_bytes, max_pages: int = None, time_budget: float = None, text_target: int = None,
+                parallel_pages: int = None) -> dict:
+    """
+    Extract the text of a PDF within the page / byte / time budgets (defaults from the PDF_* settings).
+
+    Args:
+        file_bytes (bytes | BytesIO): The PDF.
+
+    Returns:
+        dict: text, pages (in the document), pages_read, stopped (None, 'page_budget', 'text_target' or
+              'time_budget'), parallel (whether the process pool was used), seconds.
+
+    Raises:
+        ValueError: If the PDF is larger than PDF_MAX_BYTES.
+        Exception: Whatever PyPDF2 raises for a file it cannot open.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+    text_target = PDF_TEXT_TARGET if text_target is None else text_target
+    parallel_pages = PDF_PARALLEL_PAGES if parallel_pages is None else parallel_pages
+
+    data = file_bytes.getvalue() if isinstance(file_bytes, BytesIO) else bytes(file_bytes)
+    if len(data) > PDF_MAX_BYTES:
+        raise ValueError(f"The PDF is larger than {PDF_MAX_BYTES // (1024 * 1024)} MB")
+
+    start = time.time()
+    deadline = start + time_budget
+    if PDF_WORKERS:
+        pages, texts, stopped, parallel = extract_in_workers(data, max_pages, deadline, text_target, parallel_pages)
+    else:
+        reader = PyPDF2.PdfReader(BytesIO(data))
+        pages = len(reader.pages)
+        texts, stopped = extract_sequential(reader, min(pages, max_pages), deadline, text_target)
+        parallel = False
+    if stopped is None and pages > len(texts):
+        stopped = 'page_budget'
+
+    return {
+        'text': ''.join(texts),
+        'pages': pages,
+        'pages_read': len(texts),
+        'stopped': stopped,
+        'parallel': parallel,
+        'seconds': round(time.time() - start, 4),
+    }
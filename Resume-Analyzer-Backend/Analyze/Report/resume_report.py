@@ -13,18 +13,28 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.lib.colors import HexColor
+import reportlab
+import hashlib
 import os
-import PyPDF2
 
-def generate_resume_report(json_data: dict, user_name: str, output_path: str = "resume_analysis_report.pdf"):
+# Fingerprint of this template (and the reportlab version rendering it); changes automatically whenever the
+# report layout is edited, so reports cached in GridFS are rendered again (see Resume_Service.render_report)
+with open(__file__, 'rb') as template_source:
+    REPORT_TEMPLATE_VERSION = hashlib.sha256(template_source.read() + reportlab.Version.encode()).hexdigest()[:16]
+
+def is_complete_pdf(pdf_bytes) -> bool:
+    """Cheap structural check instead of a full parse: PDF header at the start, end-of-file marker at the end."""
+    return bool(pdf_bytes) and pdf_bytes[:5] == b'%PDF-' and b'%%EOF' in pdf_bytes[-32:]
+
+def generate_resume_report(json_data: dict, user_name: str, output_path: str = None):
     """
     Generates a beautiful PDF report from the resume analysis JSON data, excluding resume_content and job_description.
-    Saves the PDF to the specified path and returns the PDF as a bytes object.
+    Returns the PDF as a bytes object (and saves it to output_path if given).
     
     Args:
     - json_data: Dict containing the analysis.
     - user_name: Name of the user (e.g., "Anuj Rawat").
-    - output_path: Path to save the PDF (default: "resume_analysis_report.pdf").
+    - output_path: Optional path to also save the PDF to.
     
     Returns:
     - bytes: The PDF content as a bytes object.
@@ -194,20 +204,18 @@ def generate_resume_report(json_data: dict, user_name: str, output_path: str = "
     # Get the PDF bytes from the buffer
     pdf_bytes = pdf_buffer.getvalue()
     
-    # Validate PDF bytes
-    try:
-        pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
-        if len(pdf_reader.pages) == 0:
-            raise ValueError("Generated PDF is empty")
-    except Exception as e:
+    # Validate PDF bytes: reportlab counted the pages it laid out, the bytes only need to be complete
+    # (no PyPDF2 re-parse of our own output)
+    if buffer_doc.page == 0 or not is_complete_pdf(pdf_bytes):
         pdf_buffer.close()
-        raise ValueError(f"Generated PDF is invalid: {str(e)}")
+        raise ValueError(f"Generated PDF is invalid: {'no pages' if buffer_doc.page == 0 else 'truncated output'}")
     
     # Save the validated pdf_bytes to the local file
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)  # Ensure directory exists
-    with open(output_path, "wb") as f:
-        f.write(pdf_bytes)
-    print(f"PDF report generated successfully at: {output_path}")
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)  # Ensure directory exists
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+        print(f"PDF report generated successfully at: {output_path}")
     
     # Clean up the buffer
     pdf_buffer.close()
@@ -0,0 +1,225 @@
+import os
+import re
+from functools import lru_cache
+from Job_Role.Text_Normalize import normalize_whitespace
+
+## Compact prompt inputs for the LLM nodes.
+## The resume and job description are cleaned (whitespace, bullets, page furniture, repeated headers / footers),
+## the resume is split into sections, and both are fitted into hard token budgets:
+##   - low-value sections (references, hobbies, declarations ...) are dropped first,
+##   - the remaining budget is shared between sections (short sections stay whole, long ones are cut at line ends),
+## so every section keeps its beginning instead of the tail of a long resume being lost.
+## Each node then gets only what it needs (see compact_inputs and the build_*_messages functions in Analyze_Resume.py).
+
+PROMPT_COMPACTION = os.getenv("PROMPT_COMPACTION", "true").lower() in ("1", "true", "yes")
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "2500"))        # resume tokens sent to the analysis nodes
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", "800"))                 # job description tokens sent to the analysis nodes
+SCORING_RESUME_TOKENS = int(os.getenv("SCORING_RESUME_TOKENS", "300"))     # resume outline sent to the Overall_Score LLM fallback
+SCORING_JD_TOKENS = int(os.getenv("SCORING_JD_TOKENS", "200"))             # job description excerpt sent to the Overall_Score LLM fallback
+
+TRUNCATION_MARK = "[...]"
+
+# Canonical section -> heading words that open it
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "objective", "career objective", "about me", "professional summary"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "company details", "internships", "internship"],
+    "skills": ["skills", "technical skills", "skill details", "skill set", "key skills", "core competencies", "competencies"],
+    "projects": ["projects", "project details", "academic projects", "personal projects"],
+    "education": ["education", "education details", "academic details", "qualifications", "academic qualifications"],
+    "certifications": ["certifications", "certification", "certificates", "courses", "trainings", "training"],
+    "achievements": ["achievements", "accomplishments", "awards", "honors", "recognition"],
+    "publications": ["publications", "research"],
+    "languages": ["languages", "languages known"],
+    "personal": ["personal details", "personal information", "personal profile", "contact", "contact details", "declaration"],
+    "interests": ["interests", "hobbies", "extracurricular activities", "extra curricular activities"],
+    "references": ["references"],
+}
+# Dropped (in this order) before any other section is shortened
+LOW_VALUE_SECTIONS = ["references", "interests", "personal", "languages"]
+
+HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+HEADING_PATTERN = re.compile(
+    r'^(' + '|'.join(sorted((re.escape(h) for h in HEADING_TO_SECTION), key=len, reverse=True)) + r')\s*[:\-]?\s*(.*)$',
+    re.IGNORECASE
+)
+BULLET_PATTERN = re.compile(r'^[\u2022\u25cf\u25aa\u25a0\u2023\u2043\u2219\uf0b7\uf0a7\u27a2\u2713\u2714*>\-]+\s*')
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^page\s+\d+(\s+of\s+\d+)?$', re.IGNORECASE),
+    re.compile(r'^\d{1,3}$'),
+    re.compile(r'^(curriculum vitae|resume|r[ée]sum[ée]|cv)$', re.IGNORECASE),
+    re.compile(r'references?\s+(are\s+)?(available\s+)?(up)?on\s+request', re.IGNORECASE),
+    re.compile(r'(equal opportunity employer|all qualified applicants will receive)', re.IGNORECASE),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, the same estimate the LLM scheduler budgets with."""
+    return (len(text) + 3) // 4
+
+
+# ---------------------------
+# Cleaning & Segmentation
+# ---------------------------
+def clean_lines(text: str) -> list:
+    """Whitespace-normalized, non-empty lines without bullets, page furniture or repeated headers / footers."""
+    lines, seen = [], set()
+    for line in (text or '').splitlines():
+        line = BULLET_PATTERN.sub('', normalize_whitespace(line))
+        if not line or any(p.search(line) for p in BOILERPLATE_PATTERNS):
+            continue
+        # Longer lines repeated verbatim are page headers / footers of multi-page PDFs
+        if len(line) > 15:
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+    return lines
+
+
+def match_heading(line: str):
+    """(section, rest of the line) if the line opens a section, else None."""
+    if len(line) > 60:
+        return None
+    match = HEADING_PATTERN.match(line)
+    if match is None:
+        return None
+    rest = match.group(2).strip()
+    # "Skills: Python, SQL" opens a section, "Experience with Python" does not
+    if rest and not re.match(r'^[\s:\-]', line[len(match.group(1)):]):
+        return None
+    return HEADING_TO_SECTION[match.group(1).lower()], rest
+
+
+def segment_sections(text: str) -> list:
+    """
+    Split a resume into [(section, [lines])] in document order. Text before the first heading
+    (name, contact line, headline) is the "header" section; repeated headings are merged.
+    """
+    sections = {"header": []}
+    current = sections["header"]
+    for line in clean_lines(text):
+        heading = match_heading(line)
+        if heading is None:
+            current.append(line)
+            continue
+        section, rest = heading
+        current = sections.setdefault(section, [])
+        if rest:
+            current.append(rest)
+    return [(section, lines) for section, lines in sections.items() if lines]
+
+
+@lru_cache(maxsize=256)
+def resume_sections(text: str) -> tuple:
+    """segment_sections, cached: the compact prompt inputs and the keyword engine share one segmentation per resume."""
+    return tuple((section, tuple(lines)) for section, lines in segment_sections(text))
+
+
+# ---------------------------
+# Token Budgets
+# ---------------------------
+def truncate_lines(lines: list, budget: int) -> list:
+    """Keep whole lines from the start while they fit (a single oversized line is cut at a word)."""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            if not kept:
+                cut = line[:max(0, budget * 4 - len(TRUNCATION_MARK) - 1)].rsplit(' ', 1)[0]
+                if cut:
+                    kept.append(cut)
+            kept.append(TRUNCATION_MARK)
+            return kept
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def fit_sections(sections: list, budget: int) -> list:
+    """
+    Fit [(section, lines)] into `budget` tokens: drop LOW_VALUE_SECTIONS first, then share the budget
+    by water-filling (each section gets min(its size, an equal share of what is left)).
+    """
+    sizes = {section: sum(estimate_tokens(line) + 1 for line in lines) + 2 for section, lines in sections}
+    total = sum(sizes.values())
+    if total <= budget:
+        return sections
+
+    sections = list(sections)
+    for low_value in LOW_VALUE_SECTIONS:
+        if total <= budget:
+            break
+        for section, lines in list(sections):
+            if section == low_value:
+                sections.remove((section, lines))
+                total -= sizes[section]
+
+    allowance, remaining = {}, budget
+    ordered = sorted(sections, key=lambda item: sizes[item[0]])
+    for i, (section, _) in enumerate(ordered):
+        allowance[section] = min(sizes[section], remaining // (len(ordered) - i))
+        remaining -= allowance[section]
+
+    fitted = []
+    for section, lines in sections:
+        if allowance[section] >= sizes[section]:
+            fitted.append((section, lines))
+        elif allowance[section] > 2:
+            fitted.append((section, truncate_lines(lines, allowance[section] - 2)))
+    return fitted
+
+
+def render_sections(sections: list) -> str:
+    parts = []
+    for section, lines in sections:
+        body = "\n".join(lines)
+        parts.append(body if section == "header" else f"{section.upper()}\n{body}")
+    return "\n\n".join(parts)
+
+
+def compact_job_description(job_description: str, budget: int) -> str:
+    return "\n".join(truncate_lines(clean_lines(job_description), budget))
+
+
+# ---------------------------
+# Per-node Inputs
+# ---------------------------
+@lru_cache(maxsize=256)
+def compact_inputs(resume_content: str, job_description: str) -> dict:
+    """
+    Build the compact representation once per (resume, job description) and share it between nodes.
+
+    Returns:
+        dict: resume / job_description      - analysis inputs within RESUME_TOKEN_BUDGET / JD_TOKEN_BUDGET, also what
+                                              Validate_Resume checks (it must see everything the analysis will read)
+              scoring_resume / scoring_jd   - outline and excerpt for the Overall_Score LLM fallback
+              sections                      - names of the sections found, in document order
+    """
+    sections = resume_sections(resume_content)
+    return {
+        'resume': render_sections(fit_sections(sections, RESUME_TOKEN_BUDGET)),
+        'job_description': compact_job_description(job_description, JD_TOKEN_BUDGET),
+        'scoring_resume': render_sections(fit_sections(sections, SCORING_RESUME_TOKENS)),
+        'scoring_jd': compact_job_description(job_description, SCORING_JD_TOKENS),
+        'sections': [section for section, _ in sections],
+    }
+
+
+def prompt_inputs(state: dict) -> dict:
+    """compact_inputs for a ResumeState, or the raw texts for every field when PROMPT_COMPACTION is off."""
+    resume_content = state.get('resume_content', '') or ''
+    job_description = state.get('job_description', 'N/A') or ''
+    if not PROMPT_COMPACTION:
+        return {'resume': resume_content, 'job_description': job_description,
+                'scoring_resume': resume_content,
+                'scoring_jd': job_description, 'sections': []}
+    return compact_inputs(resume_content, job_description)
+
+
+def summarize_list(items, limit: int = 3) -> str:
+    """First `limit` items plus how many there are, for prompts that only need the gist of a list."""
+    items = list(items or [])
+    if len(items) <= limit:
+        return str(items)
+    return f"{items[:limit]} (+{len(items) - limit} more, {len(items)} total)"
@@ -0,0 +1,263 @@
+import asyncio
+import os
+from io import BytesIO
+from datetime import datetime
+from bson import ObjectId
+from Analyze_Resume import get_workflow
+from Analysis_Cache import analysis_cache, analysis_cache_key
+from Report.resume_report import generate_resume_report, REPORT_TEMPLATE_VERSION
+from DB_Handle import asaveToDb, aget_saved_analysis, get_rendered_report, save_rendered_report, get_report_source
+from Upload_Dedup import SingleFlight
+from LLM_Scheduler import LLMRateLimitError, llm_priority
+from Text_Extract import extract_text
+from Extraction_Cache import extraction_cache, file_sha256
+
+## Analysis pipeline shared by the FastAPI endpoints (main.py), batch uploads (Batch_Analyze.py) and other entry points.
+
+# Maximum number of analyses (LLM workflows) a single worker keeps in flight at once
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "32"))
+analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+# Render reports in the background right after an upload instead of on their first download
+REPORT_PREFETCH = os.getenv("REPORT_PREFETCH", "false").lower() in ("1", "true", "yes")
+
+# ---------------------------
+# Resume Text Extraction
+# ---------------------------
+def get_resume_content(file_bytes, file_hash: str = None) -> str:
+    """
+    Extract text content from a PDF, DOCX or TXT file (Text_Extract.py, within the Pdf_Extract.py budgets).
+    A file seen before (same SHA-256) is answered from the extraction cache without parsing it.
+    
+    Args:
+        file_bytes (BytesIO): The resume file as a BytesIO object.
+        file_hash (str): SHA-256 of the file if already known (Pdf_Extract.read_upload computes it while reading).
+    
+    Returns:
+        str: Extracted text from the file.
+    """
+    file_hash = file_hash or file_sha256(file_bytes)
+    text = extraction_cache.get(file_hash)
+    if text is not None:
+        return text
+
+    try:
+        extraction = extract_text(file_bytes)
+    except Exception as e:
+        raise ValueError(f"Error extracting text from file: {str(e)}")
+    if extraction['stopped']:
+        print(f"{extraction['format'].upper()} extraction stopped early ({extraction['stopped']}): {len(extraction['text'])} characters in {extraction['seconds']}s")
+    extraction_cache.set(file_hash, extraction)
+    return extraction['text']
+
+def workflow_error_response(e: Exception) -> dict:
+    if isinstance(e, ValueError):
+         # Raised for invalid inputs (non-resume, malicious job desc, etc.)
+        return {
+            "success": False,
+            "error": {
+            "type": "InputValidationError",
+            "message": str(e),
+            "details": None
+            }
+        }
+    if isinstance(e, LLMRateLimitError):
+        # Provider kept answering 429 after every retry
+        return {
+            "success": False,
+            "error": {
+            "type": "RateLimitError",
+            "message": "The analysis service is busy right now. Please try again in a minute.",
+            "details": str(e)
+            }
+        }
+    # Catch-all for unexpected runtime/LLM issues
+    return {
+        "success": False,
+        "error": {
+        "type": "InternalServerError",
+        "message": "Something went wrong during resume analysis. Please try again later.",
+        "details": str(e) # optional, hide in production
+        }
+    }
+
+def get_resume_report(initial_state):
+    
+    # Identical resume + job description (same prompts / model) -> reuse the stored analysis
+    cache_key = analysis_cache_key(initial_state.get('resume_content', ''), initial_state.get('job_description', ''))
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        return {
+            "success": True,
+            "data": cached
+        }
+
+    try:
+        result = get_workflow().invoke(initial_state)
+        analysis_cache.set(cache_key, result)
+        return {
+            "success": True,
+            "data": result
+        }
+    except Exception as e:
+        return workflow_error_response(e)
+
+async def aget_resume_report(initial_state):
+    """
+    Async counterpart of get_resume_report. Runs the workflow with ainvoke, waiting
+    for a free analysis slot first so a worker never exceeds MAX_CONCURRENT_ANALYSES.
+    """
+    cache_key = analysis_cache_key(initial_state.get('resume_content', ''), initial_state.get('job_description', ''))
+    cached = await analysis_cache.aget(cache_key)
+    if cached is not None:
+        return {
+            "success": True,
+            "data": cached
+        }
+
+    try:
+        async with analysis_slots:
+            result = await get_workflow().ainvoke(initial_state)
+        await analysis_cache.aset(cache_key, result)
+        return {
+            "success": True,
+            "data": result
+        }
+    except Exception as e:
+        return workflow_error_response(e)
+
+async def astream_resume_report(initial_state):
+    """
+    Streaming counterpart of aget_resume_report built on LangGraph's node-level streaming.
+
+    Yields:
+        tuple: ("node", node_name, partial_state) as each graph node completes
+               (a single ("node", "Cache", state) on a cache hit), then ("result", None, AI_Response).
+    """
+    cache_key = analysis_cache_key(initial_state.get('resume_content', ''), initial_state.get('job_description', ''))
+    cached = await analysis_cache.aget(cache_key)
+    if cached is not None:
+        yield "node", "Cache", cached
+        yield "result", None, {"success": True, "data": cached}
+        return
+
+    result = dict(initial_state)
+    try:
+        async with analysis_slots:
+            async for chunk in get_workflow().astream(initial_state, stream_mode="updates"):
+                for node_name, update in chunk.items():
+                    result.update(update or {})
+                    yield "node", node_name, update or {}
+        await analysis_cache.aset(cache_key, result)
+        yield "result", None, {"success": True, "data": result}
+    except Exception as e:
+        yield "result", None, workflow_error_response(e)
+
+
+# ---------------------------
+# Upload Pipeline
+# ---------------------------
+async def asave_analysis(AI_Response: dict, user_name: str, file_bytes: bytes, resume_file_name: str, document_id: str = None) -> dict:
+    """
+    Save a finished analysis and its resume to MongoDB. The report PDF is not rendered here: a successful analysis
+    gets a report id whose PDF render_report produces on the first download (or the prefetch job).
+    With document_id the document is saved under that '_id', so a second save of it fails instead of duplicating it.
+
+    Returns:
+        dict: The saved document (AI response with file ids).
+
+    Raises:
+        RuntimeError: If the document could not be saved.
+    """
+    # Get today's date
+    today_date = datetime.today().strftime("%Y-%m-%d")
+    if document_id:
+        AI_Response['_id'] = ObjectId(document_id)
+
+    # Save to MongoDB regardless of success/failure
+    AI_Response = await asaveToDb(AI_Response, user_name, BytesIO(file_bytes), None, resume_file_name, today_date)
+
+    if AI_Response is None:
+        raise RuntimeError("Failed to save data to database")
+    return AI_Response
+
+async def aanalyze_and_save(resume_text: str, job_description: str, user_name: str, file_bytes: bytes, resume_file_name: str,
+                            document_id: str = None) -> dict:
+    """
+    Analyze an extracted resume and save everything to MongoDB (the core of /upload_resume).
+    Raises the same errors as asave_analysis.
+    """
+    AI_Response = await aget_resume_report({'resume_content': resume_text, 'job_description': job_description})
+    return await asave_analysis(AI_Response, user_name, file_bytes, resume_file_name, document_id)
+
+async def aprocess_upload(payload: dict) -> dict:
+    """
+    Job handler for background uploads: extraction plus aanalyze_and_save.
+    The analysis is saved under the job's document_id, so a retry after the save (a failed prefetch, an expired
+    lease) returns the saved document instead of analysing and saving the resume again.
+
+    Args:
+        payload (dict): file_bytes, file_hash (optional), resume_file_name, job_description, user_name, document_id.
+    """
+    document_id = payload.get('document_id')
+    saved = await aget_saved_analysis(document_id, payload['user_name']) if document_id else None
+    if saved is None:
+        resume_text = await asyncio.to_thread(get_resume_content, BytesIO(payload['file_bytes']), payload.get('file_hash'))
+        with llm_priority("background"):
+            saved = await aanalyze_and_save(resume_text, payload['job_description'], payload['user_name'],
+                                            payload['file_bytes'], payload['resume_file_name'], document_id)
+    # Already off the request path, so the prefetch runs right here
+    if REPORT_PREFETCH and saved.get('resume_report_id'):
+        await arender_report(saved['resume_report_id'])
+    return saved
+
+
+# ---------------------------
+# Report Rendering
+# ---------------------------
+report_flights = SingleFlight()
+
+def render_report(report_id: str):
+    """
+    The PDF behind a lazy resume_report_id: the render cached in GridFS for the current template
+    (REPORT_TEMPLATE_VERSION), else rendered now from the saved analysis JSON and cached.
+
+    Returns:
+        tuple: (PDF bytes, filename), or (None, None) if report_id is not the lazy report of a saved analysis.
+
+    Raises:
+        ValueError: If the generated report PDF is invalid.
+    """
+    if not ObjectId.is_valid(report_id):
+        return None, None
+    pdf_bytes, filename = get_rendered_report(report_id, REPORT_TEMPLATE_VERSION)
+    if pdf_bytes is not None:
+        return pdf_bytes, filename
+
+    user_name, document = get_report_source(report_id)
+    if document is None or not document.get('success'):
+        return None, None
+    pdf_bytes = generate_resume_report(document['data'], user_name=user_name)
+    filename = f"{user_name}_report"
+    save_rendered_report(report_id, REPORT_TEMPLATE_VERSION, pdf_bytes, filename)
+    return pdf_bytes, filename
+
+async def arender_report(report_id: str):
+    # Concurrent first downloads of one report render it once (reportlab is CPU-bound, keep it off the event loop)
+    return await report_flights.run(report_id, lambda: asyncio.to_thread(render_report, report_id))
+
+async def aprefetch_report(payload: dict) -> dict:
+    """
+    Job handler rendering a report ahead of its first download (REPORT_PREFETCH).
+
+    Args:
+        payload (dict): report_id.
+    """
+    pdf_bytes, _ = await arender_report(payload['report_id'])
+    return {'report_id': payload['report_id'], 'rendered': pdf_bytes is not None}
+
+# Job kinds the background worker pool (Job_Queue.py) knows how to run
+JOB_HANDLERS = {
+    "analyze_upload": aprocess_upload,
+    "render_report": aprefetch_report,
+}
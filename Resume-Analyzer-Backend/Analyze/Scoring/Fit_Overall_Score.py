@@ -0,0 +1,99 @@
+import argparse
+import json
+from datetime import datetime
+import numpy as np
+from Scoring.Get_Overall_Score import FEATURES, WEIGHTS_PATH, extract_features, compute_overall_score, load_weights
+
+## Calibrates Scoring/Model/overall-score-weights.json against stored analyses.
+## Targets are the overall scores the Overall_Score LLM node produced, so analyses scored by the
+## local engine itself (overall_score_source == "local") are skipped.
+## Run Command (from Analyze) : python -m Scoring.Fit_Overall_Score            (reads every user collection in MongoDB)
+##                              python -m Scoring.Fit_Overall_Score --from-json analyses.json --dry-run
+
+
+def load_stored_analyses():
+    from DB_Handle import db, is_system_collection  # imported lazily, connecting to MongoDB is only needed here
+
+    analyses = []
+    for collection_name in db.list_collection_names():
+        if is_system_collection(collection_name):
+            continue
+        for doc in db[collection_name].find({'success': True}, {'data': 1}):
+            if isinstance(doc.get('data'), dict):
+                analyses.append(doc['data'])
+    return analyses
+
+def build_training_set(analyses):
+    rows, targets = [], []
+    for analysis in analyses:
+        if analysis.get('overall_score_source') == 'local' or not isinstance(analysis.get('overall_score'), (int, float)):
+            continue
+        features = extract_features(analysis)
+        if features is None:
+            continue
+        rows.append([features[name] for name in FEATURES])
+        targets.append(float(analysis['overall_score']))
+    return np.array(rows, dtype=float), np.array(targets, dtype=float)
+
+def fit_weights(X, y, ridge: float = 1.0):
+    """Ridge least squares with an unpenalised intercept."""
+    X1 = np.hstack([np.ones((X.shape[0], 1)), X])
+    penalty = ridge * np.eye(X1.shape[1])
+    penalty[0, 0] = 0.0
+    coef = np.linalg.solve(X1.T @ X1 + penalty, X1.T @ y)
+    return float(coef[0]), {name: float(w) for name, w in zip(FEATURES, coef[1:])}
+
+def mean_absolute_error(analyses, weights):
+    errors = []
+    for analysis in analyses:
+        if analysis.get('overall_score_source') == 'local':
+            continue
+        predicted = compute_overall_score(analysis, weights)
+        if predicted is not None and isinstance(analysis.get('overall_score'), (int, float)):
+            errors.append(abs(predicted - analysis['overall_score']))
+    return sum(errors) / len(errors) if errors else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the local overall-score engine against stored analyses")
+    parser.add_argument('--from-json', help="Read analyses (a JSON list of ResumeState dicts) from a file instead of MongoDB")
+    parser.add_argument('--ridge', type=float, default=1.0, help="L2 regularisation strength")
+    parser.add_argument('--min-samples', type=int, default=30, help="Refuse to fit on fewer analyses than this")
+    parser.add_argument('--dry-run', action='store_true', help="Report the fit without writing the weights file")
+    args = parser.parse_args()
+
+    if args.from_json:
+        with open(args.from_json, 'r', encoding='utf-8') as f:
+            analyses = json.load(f)
+    else:
+        analyses = load_stored_analyses()
+
+    X, y = build_training_set(analyses)
+    print(f"Usable analyses: {len(y)}")
+    if len(y) < args.min_samples:
+        print(f"❌ Need at least {args.min_samples} LLM-scored analyses to calibrate, keeping current weights.")
+        return
+
+    current = load_weights()
+    intercept, weights = fit_weights(X, y, ridge=args.ridge)
+    fitted = {
+        'version': current.get('version', 0) + 1,
+        'source': f"fitted on {len(y)} stored analyses ({datetime.today().strftime('%Y-%m-%d')}, ridge={args.ridge})",
+        'intercept': intercept,
+        'weights': weights,
+    }
+
+    print(f"MAE current weights : {mean_absolute_error(analyses, current):.2f}")
+    print(f"MAE fitted weights  : {mean_absolute_error(analyses, fitted):.2f}")
+    for name in FEATURES:
+        print(f"  {name:<28} {weights[name]:8.4f}")
+    print(f"  {'intercept':<28} {intercept:8.4f}")
+
+    if not args.dry_run:
+        with open(WEIGHTS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(fitted, f, indent=2)
+        print(f"✅ Weights written to {WEIGHTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
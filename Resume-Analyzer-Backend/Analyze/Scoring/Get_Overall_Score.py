@@ -0,0 +1,84 @@
+import json
+import os
+import re
+
+## Deterministic local replacement for the Overall_Score LLM node.
+## overall_score = intercept + sum(weight * feature), rounded and clipped to 0-100.
+## Weights live in Scoring/Model/overall-score-weights.json and are calibrated by Scoring/Fit_Overall_Score.py.
+
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model', 'overall-score-weights.json')
+
+# Feature order used by the scorer and the fitting script
+SCORE_FEATURES = ['ats_score', 'content_score', 'format_design_score', 'keyword_score']
+LIST_FEATURES = ['strengths', 'weakness', 'content_improvements', 'format_design_improvements', 'key_improvements']
+FEATURES = SCORE_FEATURES + ['category_agreement'] + LIST_FEATURES
+
+# Role words that say nothing about the field itself ("Java Developer" vs "Backend Developer")
+GENERIC_ROLE_WORDS = {'engineer', 'engineering', 'developer', 'development', 'manager', 'analyst',
+                      'specialist', 'senior', 'junior', 'lead', 'and', 'the', 'of'}
+
+
+def load_weights(path: str = WEIGHTS_PATH) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+score_weights = load_weights()
+
+
+### Helper Functions
+
+def _role_stems(category) -> set:
+    # 5-character prefixes make "Data Science" and "Data Scientist" agree
+    words = re.findall(r'[a-z0-9]+', str(category or '').lower())
+    return {w[:5] for w in words if w not in GENERIC_ROLE_WORDS}
+
+def category_agreement(ml_job_category, ai_job_category) -> float:
+    """
+    Fraction of the ML category's field words that also appear in the AI category (0.0 - 1.0).
+    """
+    ml_stems = _role_stems(ml_job_category)
+    ai_stems = _role_stems(ai_job_category)
+    if not ml_stems or not ai_stems:
+        return 0.0
+    return len(ml_stems & ai_stems) / len(ml_stems)
+
+def extract_features(state: dict):
+    """
+    Build the scorer's feature dict from an analysed ResumeState.
+
+    Returns:
+        dict: feature name -> value, or None if any of the four sub-scores is missing.
+    """
+    features = {}
+    for name in SCORE_FEATURES:
+        value = state.get(name)
+        if not isinstance(value, (int, float)):
+            return None
+        features[name] = float(value)
+    features['category_agreement'] = category_agreement(state.get('ml_job_category'), state.get('ai_job_category'))
+    for name in LIST_FEATURES:
+        features[name] = float(len(state.get(name) or []))
+    return features
+
+## Compute the Overall Score of an analysed Resume
+def compute_overall_score(state: dict, weights: dict = None):
+    """
+    Compute overall_score locally from the analysis fields already in the state.
+
+    Args:
+        state (dict): ResumeState after the Analyze_Resume node.
+        weights (dict): Calibrated weights (defaults to Model/overall-score-weights.json).
+
+    Returns:
+        int: Overall score (0-100), or None if the state lacks the required sub-scores.
+    """
+    features = extract_features(state)
+    if features is None:
+        return None
+
+    weights = weights or score_weights
+    score = weights.get('intercept', 0.0)
+    for name, weight in weights['weights'].items():
+        score += weight * features.get(name, 0.0)
+
+    return int(min(100, max(0, round(score))))
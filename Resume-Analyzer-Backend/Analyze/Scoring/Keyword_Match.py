@@ -0,0 +1,260 @@
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from Resume_Compact import resume_sections
+
+## Deterministic local keyword_score.
+## Terms are taken from the job description (skill dictionary matches, synonyms folded to one canonical term,
+## plus capitalised tool / product names), then found in the resume in one pass per section with a
+## token-level Aho-Corasick automaton. Coverage, missing terms and the sections each term appears in are reported.
+## keyword_score = 100 * sum(weight * placement factor of found terms) / sum(weight of all terms)
+## The dictionary lives in Scoring/Model/keyword-terms.json (canonical term -> synonyms).
+
+TERMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model', 'keyword-terms.json')
+
+# Terms used in context (described work) count fully, terms only listed (skills, certifications ...) count less
+CONTEXT_SECTIONS = {'experience', 'projects', 'summary', 'achievements', 'publications'}
+LISTED_FACTOR = 0.8
+# Weight of a dictionary term (+0.5 per repeated mention, capped) and of a capitalised phrase outside the dictionary
+TERM_WEIGHT, REPEAT_BONUS, MAX_TERM_WEIGHT, PHRASE_WEIGHT = 1.0, 0.5, 2.0, 0.5
+
+# Dots split tokens ("node.js" -> node js, joined PDF lines like "skills.python" -> skills python), except in ".net"
+TOKEN_PATTERN = re.compile(r'\.net(?![a-z0-9])|[a-z0-9][a-z0-9+#]*')
+FRAGMENT_SPLIT = re.compile(r'[,;:()\[\]|\n•/]|\s(?:and|or|&)\s|\.\s')
+# Capitalised words that are not skills (sentence starts, role titles, JD boilerplate)
+GENERIC_JD_WORDS = {
+    'a', 'an', 'the', 'we', 'you', 'our', 'your', 'they', 'is', 'are', 'be', 'with', 'in', 'of', 'for', 'to', 'on', 'at', 'as', 'by',
+    'requirements', 'requirement', 'responsibilities', 'qualifications', 'qualification', 'skills', 'skill', 'experience', 'knowledge',
+    'must', 'should', 'nice', 'preferred', 'required', 'plus', 'bonus', 'strong', 'good', 'excellent', 'ability', 'job', 'role', 'team',
+    'company', 'description', 'location', 'salary', 'benefits', 'about', 'us', 'years', 'year', 'etc', 'e.g', 'i.e', 'other', 'any',
+    'developer', 'engineer', 'manager', 'scientist', 'analyst', 'specialist', 'consultant', 'architect', 'intern', 'lead', 'senior',
+    'junior', 'associate', 'executive', 'officer', 'head', 'director', 'administrator', 'designer', 'tester', 'hiring', 'looking',
+}
+
+
+def load_terms(path: str = TERMS_PATH) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+keyword_terms = load_terms()
+
+
+### Helper Functions
+
+def word_forms(token: str) -> list:
+    """The token plus its plural / singular form, so 'API' matches 'APIs' without normalizing every resume token."""
+    forms = [token]
+    if token[-1].isalpha():
+        forms.append(token + 's')
+        if token.endswith('s') and not token.endswith('ss') and len(token) > 4:
+            forms.append(token[:-1])
+    return forms
+
+def split_tokens(text: str) -> list:
+    # Phrases and resume text go through the same tokenizer, so "ci/cd", "a/b testing" or "t-sql" line up
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# ---------------------------
+# Aho-Corasick Automaton (over tokens)
+# ---------------------------
+class KeywordAutomaton:
+    """
+    Multi-pattern matcher over word tokens: every phrase (a sequence of tokens) maps to a canonical term,
+    and a single left-to-right pass finds all of them, overlapping ones included.
+    Tokens that occur in no phrase reset the automaton without touching the transition table.
+    """
+
+    def __init__(self, phrases: dict):
+        """
+        Args:
+            phrases (dict): surface phrase -> canonical term.
+        """
+        self.token_ids = {}   # token (and its plural / singular form) -> token id
+        self.token_count = 0
+        self.goto = [{}]      # state -> {token id: next state}
+        self.fail = [0]
+        self.outputs = [()]   # state -> canonical terms ending here
+        for phrase, canonical in phrases.items():
+            self.add(phrase, canonical)
+        self.build()
+
+    def token_id(self, token: str) -> int:
+        tid = self.token_ids.get(token)
+        if tid is None:
+            tid = self.token_count
+            self.token_count += 1
+            for form in word_forms(token):
+                self.token_ids.setdefault(form, tid)
+        return tid
+
+    def add(self, phrase: str, canonical: str):
+        tokens = split_tokens(phrase)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            tid = self.token_id(token)
+            next_state = self.goto[state].get(tid)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][tid] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+            state = next_state
+        if canonical not in self.outputs[state]:
+            self.outputs[state] += (canonical,)
+
+    def build(self):
+        """Breadth-first failure links; each state's outputs include those of its failure chain."""
+        # Depth-1 states fail to the root
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for tid, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and tid not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(tid, 0)
+                self.outputs[next_state] += tuple(t for t in self.outputs[self.fail[next_state]] if t not in self.outputs[next_state])
+
+    def token_ids_of(self, text: str) -> list:
+        """Token ids of the text (None for tokens no phrase uses)."""
+        return list(map(self.token_ids.get, split_tokens(text)))
+
+    def find_terms(self, text: str) -> set:
+        """Canonical terms occurring anywhere in the text, in one left-to-right pass."""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = set()
+        state = 0
+        for tid in self.token_ids_of(text):
+            if tid is None:
+                state = 0
+                continue
+            next_state = goto[state].get(tid)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(tid)
+            state = next_state or 0
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def count_terms(self, text: str) -> dict:
+        """Canonical term -> number of occurrences (same pass as find_terms)."""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        counts = {}
+        state = 0
+        for tid in self.token_ids_of(text):
+            if tid is None:
+                state = 0
+                continue
+            next_state = goto[state].get(tid)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(tid)
+            state = next_state or 0
+            for term in outputs[state]:
+                counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def __len__(self):
+        return len(self.goto)
+
+
+def dictionary_phrases(terms: dict) -> dict:
+    """Surface phrase -> canonical term for the canonical terms and all their synonyms."""
+    phrases = {}
+    for canonical, synonyms in terms.items():
+        phrases[canonical] = canonical
+        for synonym in synonyms:
+            phrases.setdefault(synonym, canonical)
+    return phrases
+
+dictionary_automaton = KeywordAutomaton(dictionary_phrases(keyword_terms['terms']))
+
+
+# ---------------------------
+# Job Description Terms
+# ---------------------------
+def capitalized_phrases(job_description: str) -> set:
+    """
+    Tool / product names the dictionary does not know: list fragments of 1-3 words that are
+    capitalised or contain digits / symbols ("Power BI", "SAP MM", "C-300"), minus generic JD words.
+    """
+    phrases = set()
+    for fragment in FRAGMENT_SPLIT.split(job_description or ''):
+        words = fragment.split()
+        if not 1 <= len(words) <= 3:
+            continue
+        if any(w.lower().strip('.') in GENERIC_JD_WORDS for w in words):
+            continue
+        if all(w[0].isupper() or any(c.isdigit() or c in '+#' for c in w) for w in words):
+            phrases.add(' '.join(words).lower().strip('.'))
+    return phrases
+
+@lru_cache(maxsize=128)
+def job_terms(job_description: str):
+    """
+    Weighted terms of a job description and an automaton matching just those terms (all their surface forms).
+
+    Returns:
+        tuple: ({canonical term: weight}, KeywordAutomaton)
+    """
+    weights, phrases = {}, {}
+    synonyms = keyword_terms['terms']
+    for term, count in dictionary_automaton.count_terms(job_description or '').items():
+        weights[term] = min(MAX_TERM_WEIGHT, TERM_WEIGHT + REPEAT_BONUS * (count - 1))
+        phrases[term] = term
+        for synonym in synonyms.get(term, []):
+            phrases.setdefault(synonym, term)
+    for phrase in capitalized_phrases(job_description):
+        # Skip names the dictionary already covers ("Python 3", "AWS Lambda")
+        if not dictionary_automaton.find_terms(phrase):
+            weights[phrase] = PHRASE_WEIGHT
+            phrases[phrase] = phrase
+    return weights, KeywordAutomaton(phrases)
+
+
+# ---------------------------
+# Resume Matching
+# ---------------------------
+@lru_cache(maxsize=256)
+def keyword_match(resume_content: str, job_description: str):
+    """
+    Match the job description's terms against the resume, section by section.
+
+    Returns:
+        dict: keyword_score (0-100), coverage (share of terms found), matched / missing terms
+              (missing sorted by weight) and placement ([{term, sections it appears in}]),
+              or None if the job description has no recognisable terms.
+    """
+    weights, automaton = job_terms(job_description or '')
+    if not weights:
+        return None
+
+    placement = {}
+    for section, lines in resume_sections(resume_content or ''):
+        for term in automaton.find_terms('\n'.join(lines)):
+            sections = placement.setdefault(term, [])
+            if section not in sections:
+                sections.append(section)
+
+    earned = 0.0
+    for term, sections in placement.items():
+        factor = 1.0 if CONTEXT_SECTIONS.intersection(sections) else LISTED_FACTOR
+        earned += weights[term] * factor
+    total = sum(weights.values())
+    missing = sorted((t for t in weights if t not in placement), key=lambda t: (-weights[t], t))
+    return {
+        'keyword_score': int(round(100 * earned / total)),
+        'coverage': round(len(placement) / len(weights), 3),
+        'matched': sorted(placement),
+        'missing': missing,
+        # A list rather than a dict: terms like "node.js" are not valid MongoDB field names
+        'placement': [{'term': term, 'sections': placement[term]} for term in sorted(placement)],
+    }
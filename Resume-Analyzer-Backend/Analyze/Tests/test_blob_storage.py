@@ -0,0 +1,120 @@
+import os
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/?serverSelectionTimeoutMS=50")
+os.environ.setdefault("DB_NAME", "testdb")
+
+from datetime import timedelta
+from io import BytesIO
+import gridfs
+import pytest
+mongomock = pytest.importorskip("mongomock")  # test-only dependency: pip install mongomock
+from mongomock.gridfs import enable_gridfs_integration
+from bson import ObjectId
+import DB_Handle
+from DB_Handle import (BLOB_COLLECTION, BLOB_GC_GRACE, REPORT_COLLECTION, collect_blob_garbage, delete_report, put_blob,
+                       release_blob, save_rendered_report, saveToDb)
+
+## Tests for the content-addressed blob storage of DB_Handle.py (put_blob / release_blob / collect_blob_garbage)
+## against an in-memory mongomock database: identical uploads share one GridFS file, deletes drop references,
+## the last one reclaims the file, and the GC sweep spares young records and the renders of referenced reports.
+## Run Command (from Analyze) : python -m pytest Tests
+
+
+# Lets gridfs.GridFS run on a mongomock database
+enable_gridfs_integration()
+
+RESUME = b"%PDF-1.4 Jane Roe - Machine Learning Engineer"
+OTHER_RESUME = b"%PDF-1.4 John Doe - Backend Developer"
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client["testdb"]
+    monkeypatch.setattr(DB_Handle, 'client', client)
+    monkeypatch.setattr(DB_Handle, 'db', db)
+    monkeypatch.setattr(DB_Handle, 'fs', gridfs.GridFS(db))
+    monkeypatch.setattr(DB_Handle, 'blob_index_ready', False)
+    return db
+
+
+def save(username: str, data: bytes, success: bool = True) -> dict:
+    AI_Response = {'success': success, 'data': {'ml_job_category': "Data Science"}}
+    return saveToDb(AI_Response, username, BytesIO(data), None, "resume.pdf", "2026-01-01")
+
+def blob_of(db, file_id):
+    return db[BLOB_COLLECTION].find_one({'file_id': ObjectId(file_id)})
+
+def age(db, seconds: int = 2 * BLOB_GC_GRACE):
+    """Move every blob, report record and GridFS file back in time, past the GC grace window."""
+    for collection, field in ((BLOB_COLLECTION, 'updated_at'), (REPORT_COLLECTION, 'created_at'), ('fs.files', 'uploadDate')):
+        for record in db[collection].find({}, {field: 1}):
+            db[collection].update_one({'_id': record['_id']}, {'$set': {field: record[field] - timedelta(seconds=seconds)}})
+
+
+def test_identical_uploads_share_one_file(mongo):
+    first, second = save("bob", RESUME), save("amy", RESUME)
+    assert first['resume_file_id'] == second['resume_file_id']
+    assert blob_of(mongo, first['resume_file_id'])['refs'] == 2
+    assert mongo['fs.files'].count_documents({}) == 1
+
+    third = save("bob", OTHER_RESUME)
+    assert third['resume_file_id'] != first['resume_file_id']
+    assert mongo['fs.files'].count_documents({}) == 2
+
+def test_delete_drops_one_reference(mongo):
+    first, second = save("bob", RESUME), save("amy", RESUME)
+    assert delete_report(first['_id'], "bob")
+    assert blob_of(mongo, second['resume_file_id'])['refs'] == 1
+    assert mongo['fs.files'].count_documents({'_id': ObjectId(second['resume_file_id'])}) == 1
+
+def test_last_reference_reclaims_the_file(mongo):
+    first, second = save("bob", RESUME), save("amy", RESUME)
+    assert delete_report(first['_id'], "bob") and delete_report(second['_id'], "amy")
+    assert mongo[BLOB_COLLECTION].count_documents({}) == 0
+    assert mongo['fs.files'].count_documents({}) == 0
+    assert mongo[REPORT_COLLECTION].count_documents({}) == 0
+
+def test_release_of_a_file_without_blob_deletes_it(mongo):
+    file_id = DB_Handle.fs.put(RESUME, filename="bob_resume")
+    release_blob(file_id)
+    assert mongo['fs.files'].count_documents({}) == 0
+
+def test_gc_leaves_records_inside_the_grace_window(mongo):
+    # Stored files and a reserved report whose document insert has not happened yet, as in a save in flight
+    file_id = put_blob(RESUME, filename="bob_resume")
+    DB_Handle.reserve_report("bob", ObjectId())
+    orphan_id = DB_Handle.fs.put(OTHER_RESUME, filename="bob_report")
+
+    report = collect_blob_garbage()
+    assert report == {'blobs_recounted': 0, 'blobs_reclaimed': 0, 'reports_deleted': 0, 'orphan_files_deleted': 0, 'bytes_freed': 0}
+    assert blob_of(mongo, file_id)['refs'] == 1
+    assert mongo[REPORT_COLLECTION].count_documents({}) == 1
+    assert mongo['fs.files'].count_documents({'_id': orphan_id}) == 1
+
+    age(mongo)
+    report = collect_blob_garbage()
+    assert (report['blobs_reclaimed'], report['reports_deleted'], report['orphan_files_deleted']) == (1, 1, 1)
+    assert mongo['fs.files'].count_documents({}) == 0
+
+def test_gc_keeps_renders_of_referenced_lazy_reports(mongo):
+    document = save("bob", RESUME)
+    report_id = document['resume_report_id']
+    assert save_rendered_report(report_id, "v1", b"%PDF-1.4 rendered", "bob_report")
+
+    age(mongo)
+    report = collect_blob_garbage()
+    assert (report['blobs_reclaimed'], report['reports_deleted'], report['orphan_files_deleted']) == (0, 0, 0)
+    assert mongo[REPORT_COLLECTION].count_documents({'_id': ObjectId(report_id)}) == 1
+    assert mongo['fs.files'].count_documents({'report_id': ObjectId(report_id)}) == 1
+    assert DB_Handle.get_report_source(report_id)[1]['_id'] == ObjectId(document['_id'])
+
+def test_gc_recounts_references_and_drops_orphaned_reports(mongo):
+    document = save("bob", RESUME)
+    # A crash between the document delete and the reference drop leaves the blob and report behind
+    mongo["bob"].delete_one({'_id': ObjectId(document['_id'])})
+
+    age(mongo)
+    report = collect_blob_garbage()
+    assert report['blobs_recounted'] == 1 and report['blobs_reclaimed'] == 1 and report['reports_deleted'] == 1
+    assert mongo[BLOB_COLLECTION].count_documents({}) == 0
+    assert mongo['fs.files'].count_documents({}) == 0
@@ -0,0 +1,67 @@
+import os
+import random
+import re
+import pytest
+from Job_Role.Text_Normalize import cleanResume, legacy_clean_resume, normalize_whitespace
+from Job_Role.Get_Job_Category import MODEL_DIR, load_models
+from Benchmarks.Bench_Utils import load_resumes
+
+## Regression tests for Job_Role/Text_Normalize.py: cleanResume must produce exactly what the original seven-pass
+## cleaner (the one the job-role model was trained with) produces, quirks included, so the model's inputs and
+## predictions do not move.
+## Run Command (from Analyze) : python -m pytest Tests
+
+
+# Legacy outputs the model depends on, pinned verbatim
+PINNED = [
+    ("Accounting & Finance", "A ounting Finance"),
+    ("ARTS, Success, RTL", "A S Su ess L"),
+    ("see http://x.io/a.b, #ml @bob!", "see "),
+    ("#acct @ccx #http://a b", " t x b"),
+    ("café résumé\tC++", "caf r sum C "),
+    ("  leading\n\ntrailing  ", " leading trailing "),
+    ("", ""),
+]
+
+FUZZ_PIECES = ['http', 'https://a.b/c?d=1', 'ht', 'tp', 'h', 'RT', 'R', 'T', 'cc', 'c', '#', '@', 'a', 'x', '.', '-',
+               '?', ' ', '  ', '\t', '\n', '\x1c', '\x00', '\xa0', ' ', 'é', '•']
+
+
+@pytest.fixture(scope='module')
+def resumes():
+    return [text for _, text in load_resumes()]
+
+
+@pytest.mark.parametrize("text, expected", PINNED)
+def test_pinned_legacy_output(text, expected):
+    assert legacy_clean_resume(text) == expected
+    assert cleanResume(text) == expected
+
+def test_dataset_matches_legacy(resumes):
+    for text in resumes:
+        assert cleanResume(text) == legacy_clean_resume(text)
+
+def test_large_resume_matches_legacy(resumes):
+    text = "\n\f".join(resumes[:40]) + " https://github.com/someone #python @handle"
+    assert cleanResume(text) == legacy_clean_resume(text)
+
+def test_fuzz_matches_legacy():
+    rng = random.Random(18)
+    for _ in range(50000):
+        text = ''.join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 16)))
+        assert cleanResume(text) == legacy_clean_resume(text), repr(text)
+
+def test_normalize_whitespace_matches_regex():
+    rng = random.Random(18)
+    for _ in range(20000):
+        text = ''.join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 12)))
+        assert normalize_whitespace(text) == re.sub(r'\s+', ' ', text).strip()
+    assert normalize_whitespace(None) == ''
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(MODEL_DIR, 'job-role-prediction-model.pkl')), reason="job-role model not available")
+def test_model_predictions_unchanged(resumes):
+    model, tfidf, _ = load_models()
+    texts = resumes[::4]
+    legacy = model.predict(tfidf.transform([legacy_clean_resume(text) for text in texts]))
+    current = model.predict(tfidf.transform([cleanResume(text) for text in texts]))
+    assert list(current) == list(legacy)
@@ -0,0 +1,216 @@
+import codecs
+import re
+import threading
+import time
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+from Pdf_Extract import extract_pdf, PDF_MAX_BYTES, PDF_TIME_BUDGET, PDF_TEXT_TARGET
+from Job_Role.Text_Normalize import normalize_extracted_text
+
+## Resume text extraction for every supported format, picked from the file's magic bytes (never its name):
+##   pdf  : "%PDF-" in the first 1024 bytes -> Pdf_Extract.extract_pdf (page / time / text budgets)
+##   docx : ZIP archive holding word/document.xml -> the XML is streamed through iterparse, no document model is built
+##   txt  : UTF-8 (or UTF-16 with a byte-order mark) that decodes cleanly and is almost only printable characters,
+##          not RTF / PostScript / HTML -> decoded as is, nothing to parse; anything else is an unsupported file
+## Each extractor's text goes through Text_Normalize.normalize_extracted_text, so every format looks the same
+## downstream, and every call is timed per format (extractor_stats).
+## Shared by the API (Resume_Service.get_resume_content) and both Streamlit apps (app.py, Job_Role/app.py).
+
+EXTRACTOR_VERSION = 2   # bumped when an extractor's output changes (part of the extraction cache settings)
+DOCX_MAX_XML_BYTES = 20 * 1024 * 1024   # uncompressed word/document.xml read at most (ZIP bombs)
+UNSUPPORTED_MESSAGE = "Unsupported file type. Please upload a PDF, DOCX, or TXT file."
+TXT_MIN_PRINTABLE = 0.98   # share of printable / whitespace characters a TXT resume needs
+TXT_SNIFF_BYTES = 4096     # bytes decoded to recognise a TXT file (the whole file is checked again when extracted)
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+FALLBACK_TAG = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_BREAKS = {WORD_NAMESPACE + 'tab': '\t', WORD_NAMESPACE + 'ptab': '\t', WORD_NAMESPACE + 'br': '\n',
+               WORD_NAMESPACE + 'cr': '\n', WORD_NAMESPACE + 'noBreakHyphen': '-'}
+
+# format -> (detect(data) -> bool, extract(data) -> dict), tried in this order; txt is the loosest check and stays last
+EXTRACTORS = {}
+
+format_stats = {}  # format -> counters, see record
+format_stats_lock = threading.Lock()
+
+
+def register_extractor(name: str, detect, extract):
+    """
+    Add a format. extract returns a dict with text, pages and pages_read (None where the format has no pages)
+    and stopped (None or the budget that cut it short).
+    """
+    EXTRACTORS[name] = (detect, extract)
+
+
+# ---------------------------
+# PDF
+# ---------------------------
+def is_pdf(data: bytes) -> bool:
+    # The header may follow a few bytes of junk, readers accept it anywhere in the first 1024
+    return b'%PDF-' in data[:1024]
+
+
+# ---------------------------
+# DOCX
+# ---------------------------
+def is_docx(data: bytes) -> bool:
+    if not data.startswith(b'PK\x03\x04'):
+        return False
+    try:
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def extract_docx(data: bytes, time_budget: float = PDF_TIME_BUDGET, text_target: int = PDF_TEXT_TARGET) -> dict:
+    """
+    Paragraph texts of word/document.xml, one per line (body, tables and text boxes), read as a stream of XML
+    events with each paragraph dropped once read. Within the same time / text budgets as PDFs.
+    """
+    deadline = time.time() + time_budget
+    parts, gathered, stopped = [], 0, None
+    fallback_depth = 0  # inside mc:Fallback, Word's duplicate of the text box content just read in mc:Choice
+
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        info = archive.getinfo('word/document.xml')
+        if info.file_size > DOCX_MAX_XML_BYTES:
+            raise ValueError(f"The DOCX document is larger than {DOCX_MAX_XML_BYTES // (1024 * 1024)} MB uncompressed")
+        with archive.open(info) as document:
+            for event, element in iterparse(document, events=('start', 'end')):
+                tag = element.tag
+                if tag == FALLBACK_TAG:
+                    fallback_depth += 1 if event == 'start' else -1
+                if event == 'start' or fallback_depth:
+                    continue
+                if tag == WORD_NAMESPACE + 't':
+                    parts.append(element.text or '')
+                    gathered += len(element.text or '')
+                elif tag in DOCX_BREAKS:
+                    parts.append(DOCX_BREAKS[tag])
+                elif tag == WORD_NAMESPACE + 'p':
+                    parts.append('\n')
+                    element.clear()
+                    if text_target and gathered >= text_target:
+                        stopped = 'text_target'
+                        break
+                    if time.time() >= deadline:
+                        stopped = 'time_budget'
+                        break
+                elif tag == WORD_NAMESPACE + 'tbl':
+                    element.clear()
+
+    return {'text': ''.join(parts), 'pages': None, 'pages_read': None, 'stopped': stopped}
+
+
+# ---------------------------
+# TXT
+# ---------------------------
+# Control characters (C0 / C1 but tab, line and page breaks) and U+FFFD: binary data decoded as text
+CONTROL_CHARACTERS = re.compile('[\x00-\x08\x0b\x0e-\x1f\x7f-\x9f\ufffd]')
+# Plain text to a byte decoder, but markup no resume is written in
+NOT_TEXT_SIGNATURES = ('{\\rtf', '%!ps', '<!doctype html', '<html', '<?xml')
+
+def decode_text(data: bytes, final: bool = True):
+    """The text of UTF-8 / UTF-16 (byte-order mark) bytes, or None if they do not decode cleanly."""
+    encoding = 'utf-16' if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) else 'utf-8-sig'
+    try:
+        # final=False: bytes cut off in the middle of a character at the end of a sniffed prefix are not an error
+        return codecs.getincrementaldecoder(encoding)().decode(data, final)
+    except UnicodeDecodeError:
+        return None
+
+def looks_like_text(text: str) -> bool:
+    if text.lstrip()[:16].lower().startswith(NOT_TEXT_SIGNATURES):
+        return False
+    return not text or 1 - len(CONTROL_CHARACTERS.findall(text)) / len(text) >= TXT_MIN_PRINTABLE
+
+def is_txt(data: bytes) -> bool:
+    text = decode_text(data[:TXT_SNIFF_BYTES], final=len(data) <= TXT_SNIFF_BYTES)
+    return text is not None and looks_like_text(text)
+
+def extract_txt(data: bytes) -> dict:
+    # Nothing to parse: decode, the rest of the file has to be as clean as the part is_txt looked at
+    text = decode_text(data)
+    if text is None or not looks_like_text(text):
+        raise ValueError(UNSUPPORTED_MESSAGE)
+    return {'text': text, 'pages': None, 'pages_read': None, 'stopped': None}
+
+
+register_extractor('pdf', is_pdf, extract_pdf)
+register_extractor('docx', is_docx, extract_docx)
+register_extractor('txt', is_txt, extract_txt)
+
+
+# ---------------------------
+# Dispatch
+# ---------------------------
+def detect_format(data: bytes) -> str:
+    """
+    Raises:
+        ValueError: If no extractor recognises the file.
+    """
+    for name, (detect, _) in EXTRACTORS.items():
+        if detect(data):
+            return name
+    raise ValueError(UNSUPPORTED_MESSAGE)
+
+def record(file_format: str, seconds: float, size: int, chars: int = 0, failed: bool = False):
+    with format_stats_lock:
+        stats = format_stats.setdefault(file_format, {'files': 0, 'failures': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0, 'chars': 0})
+        stats['files'] += 1
+        stats['failures'] += failed
+        stats['seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        stats['bytes'] += size
+        stats['chars'] += chars
+
+def extract_text(file_bytes) -> dict:
+    """
+    Extract the text of a resume file of any registered format.
+
+    Args:
+        file_bytes (bytes | BytesIO): The file.
+
+    Returns:
+        dict: text (normalized), format, pages, pages_read, stopped (see Pdf_Extract.extract_pdf), seconds.
+
+    Raises:
+        ValueError: If the file is larger than PDF_MAX_BYTES or of no supported format.
+        Exception: Whatever the format's parser raises for a file it cannot read.
+    """
+    data = file_bytes.getvalue() if isinstance(file_bytes, BytesIO) else bytes(file_bytes)
+    if len(data) > PDF_MAX_BYTES:
+        raise ValueError(f"The file is larger than {PDF_MAX_BYTES // (1024 * 1024)} MB")
+    file_format = detect_format(data)
+
+    start = time.perf_counter()
+    try:
+        extraction = EXTRACTORS[file_format][1](data)
+    except Exception:
+        record(file_format, time.perf_counter() - start, len(data), failed=True)
+        raise
+    text = normalize_extracted_text(extraction['text'])
+    seconds = time.perf_counter() - start
+    record(file_format, seconds, len(data), len(text))
+
+    return {
+        'text': text,
+        'format': file_format,
+        'pages': extraction['pages'],
+        'pages_read': extraction['pages_read'],
+        'stopped': extraction['stopped'],
+        'seconds': round(seconds, 4),
+    }
+
+def extractor_stats() -> dict:
+    """Per-format counters of this worker: files, failures, average / max milliseconds, MB/s, characters per file."""
+    with format_stats_lock:
+        stats = {name: dict(values) for name, values in format_stats.items()}
+    for values in stats.values():
+        seconds = values.pop('seconds')
+        values['avg_ms'] = round(seconds / values['files'] * 1000, 2)
+        values['max_ms'] = round(values.pop('max_seconds') * 1000, 2)
+        values['mb_per_s'] = round(values['bytes'] / seconds / 1e6, 2) if seconds else None
+        values['avg_chars'] = round(values.pop('chars') / values['files'])
+    return stats
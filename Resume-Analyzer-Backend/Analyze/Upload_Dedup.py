@@ -0,0 +1,95 @@
+import asyncio
+import copy
+import hashlib
+import os
+from Analysis_Cache import TTLCache, normalize_text
+from DB_Handle import aget_idempotent_response, asave_idempotent_response
+
+## Duplicate-upload protection for /upload_resume.
+## Single-flight   : identical uploads in flight at the same time (same file bytes, job description and user)
+##                   share one analysis and one saved document instead of each running the workflow.
+## Idempotency-Key : a retry carrying the same key within IDEMPOTENCY_TTL gets the stored response back.
+##                   Responses are kept in memory per worker and in MongoDB (DB_Handle.IDEMPOTENCY_COLLECTION) for all workers.
+
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))            # seconds a stored response is replayed
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "1024"))      # responses kept in memory per worker
+
+
+def upload_fingerprint(file_bytes: bytes, job_description: str, user_name: str, mode: str = "sync", file_hash: str = None) -> str:
+    """
+    Identity of an upload: SHA-256 of the file (file_hash if already computed), of the normalized job description,
+    the user and how it is processed ("sync" or "background", which answer differently).
+    """
+    file_hash = file_hash or hashlib.sha256(file_bytes).hexdigest()
+    job_description_hash = hashlib.sha256(normalize_text(job_description).encode('utf-8')).hexdigest()
+    return hashlib.sha256("\x00".join([file_hash, job_description_hash, user_name, mode]).encode('utf-8')).hexdigest()
+
+
+# ---------------------------
+# Single-flight
+# ---------------------------
+class SingleFlight:
+    """
+    Runs one coroutine per key at a time; callers arriving while it is in flight await the same result
+    (or exception). The shared task is shielded, so a caller that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls = {}  # key -> asyncio.Task
+        self.counters = {'leaders': 0, 'coalesced': 0}
+
+    async def run(self, key: str, func):
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+            self.counters['leaders'] += 1
+        else:
+            self.counters['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: str, task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {**self.counters, 'in_flight': len(self.calls)}
+
+
+# ---------------------------
+# Idempotency Keys
+# ---------------------------
+class IdempotencyStore:
+
+    def __init__(self, ttl_seconds: int = IDEMPOTENCY_TTL, max_entries: int = IDEMPOTENCY_CACHE_SIZE):
+        self.local = TTLCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def record_key(user_name: str, idempotency_key: str) -> str:
+        # Keys are scoped to the user, so two users can never replay each other's responses
+        return hashlib.sha256(f"{user_name}\x00{idempotency_key}".encode('utf-8')).hexdigest()
+
+    async def aget(self, user_name: str, idempotency_key: str):
+        """Stored {'fingerprint', 'status_code', 'body'} for this key, or None."""
+        record_key = self.record_key(user_name, idempotency_key)
+        record = self.local.get(record_key)
+        if record is None:
+            record = await aget_idempotent_response(record_key)
+            if record is not None:
+                self.local.set(record_key, record)
+        return copy.deepcopy(record)
+
+    async def aset(self, user_name: str, idempotency_key: str, fingerprint: str, status_code: int, body: dict):
+        record_key = self.record_key(user_name, idempotency_key)
+        record = {'fingerprint': fingerprint, 'status_code': status_code, 'body': copy.deepcopy(body)}
+        self.local.set(record_key, record)
+        await asave_idempotent_response(record_key, record, self.ttl_seconds)
+
+
+upload_flights = SingleFlight()
+idempotency_store = IdempotencyStore()
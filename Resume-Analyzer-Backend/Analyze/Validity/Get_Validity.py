@@ -0,0 +1,112 @@
+import hashlib
+import os
+import pickle
+import re
+import warnings
+from functools import lru_cache
+
+## Local pre-LLM validity check.
+## 1. Injection screen : one compiled multi-pattern regex per document type, a single pass over the resume / job description
+##                       (prompt injection phrases and attempts to steer the validator's output reject both; shell / code
+##                       payloads reject a job description, but only send a resume to the LLM validator).
+## 2. Classifier       : TF-IDF + logistic regression giving P(text is a resume), trained by Validity/Train_Validity_Model.py
+##                       on ResumeDataSet.csv against essays, code, job descriptions, letters and other documents.
+##                       Confident answers (>= VALIDITY_ACCEPT or <= VALIDITY_REJECT) are final, only the ambiguous
+##                       band in between is escalated to the Validate_Resume LLM call.
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model', 'resume-validity-model.pkl')
+
+VALIDITY_ACCEPT = float(os.getenv("VALIDITY_ACCEPT", "0.9"))   # P(resume) at or above which the resume is accepted locally
+VALIDITY_REJECT = float(os.getenv("VALIDITY_REJECT", "0.1"))   # P(resume) at or below which the resume is rejected locally
+
+# Screened in both the resume and the job description: attempts to override the instructions or steer the scores.
+# A resume matching one is rejected outright.
+INJECTION_PATTERNS = [
+    r'\b(ignore|disregard|forget|override)\s+(all\s+|any\s+|the\s+|your\s+)?(previous\s+|prior\s+|above\s+|earlier\s+|preceding\s+|other\s+|evaluation\s+|scoring\s+)?'
+    r'(instructions|prompts?|rules|directions|guidelines|criteria)\b',
+    r'\b(reveal|print|show|output|repeat)\s+(your\s+|the\s+)?(system\s+prompt|hidden\s+instructions|initial\s+instructions)\b',
+    r'\byou\s+are\s+now\s+(a|an|in)\b',
+    r'\bact\s+as\s+(a|an)\s+(different|unrestricted|new)\b',
+    r'\b(rate|score|rank|mark)\s+(this|the|my)\s+(resume|candidate|cv|document)\s+(as\s+|with\s+|at\s+)?(100|the\s+highest|perfect|valid)\b',
+    r'\b(give|assign)\s+(this|the)\s+(resume|candidate|cv)\s+(a\s+)?(score|rating)\s+of\s+100\b',
+    r'\b(note|message|instructions?)\s+(to|for)\s+(the\s+)?(ai|llm|gpt|chatbot|language\s+model)\b',
+]
+# Shell / code payloads and prompt vocabulary: rejected in the job description, but ordinary in the resume of an
+# ML, data or backend engineer ("designed the system prompt of our LLM agent", "drop table staging after load"),
+# so a resume matching one is only kept from the local classifier's verdict and left to the LLM validator
+CODE_PATTERNS = [
+    r'\bsystem\s+(command|override|prompt)\b',
+    r'\bis_valid\b',
+    r'\bprint\s+environment\b',
+    r'\bimport\s+os\b',
+    r'\bos\.(system|popen|environ)\b',
+    r'\bsubprocess\.(run|call|popen|check_output)\b',
+    r'\brm\s+-rf\b',
+    r'<\s*script\b',
+    r'\bdrop\s+table\b',
+]
+# Screened in the job description only (the original keyword list, matched as substrings like before)
+JOB_DESCRIPTION_KEYWORDS = ["ignore all instructions", "system command", "execute", "delete", "print environment", "import os", "subprocess"]
+
+
+def compile_patterns(patterns: list):
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+resume_screen = compile_patterns(INJECTION_PATTERNS)
+resume_code_screen = compile_patterns(CODE_PATTERNS)
+job_description_screen = compile_patterns(INJECTION_PATTERNS + CODE_PATTERNS + [re.escape(k) for k in JOB_DESCRIPTION_KEYWORDS])
+
+
+### Helper Functions
+
+def find_injection(text: str, job_description: bool = False):
+    """First suspicious phrase in the text, or None (for a resume, only the INJECTION_PATTERNS)."""
+    screen = job_description_screen if job_description else resume_screen
+    match = screen.search(text or '')
+    return match.group(0) if match else None
+
+def find_code(text: str):
+    """First CODE_PATTERNS phrase in a resume, or None: the resume goes to the LLM validator instead of the classifier."""
+    match = resume_code_screen.search(text or '')
+    return match.group(0) if match else None
+
+@lru_cache(maxsize=1)
+def load_model(path: str = MODEL_PATH):
+    # Loaded on first use (or by the API warmup), not at import
+    from sklearn.exceptions import InconsistentVersionWarning
+
+    # Ignore scikit-learn version mismatch warnings
+    warnings.filterwarnings("ignore", category=InconsistentVersionWarning)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+@lru_cache(maxsize=1)
+def model_fingerprint(path: str = MODEL_PATH) -> str:
+    """SHA-256 prefix of the validity model file, with the accept / reject thresholds (analysis cache key)."""
+    if not os.path.exists(path):
+        return 'missing'
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{digest}:{VALIDITY_ACCEPT}:{VALIDITY_REJECT}"
+
+
+## Probability that the text is a resume
+def resume_probability(resume_content: str) -> float:
+    return float(load_model().predict_proba([resume_content or ''])[0][1])
+
+def resume_validity(resume_content: str, accept: float = None, reject: float = None):
+    """
+    Local verdict on a resume.
+
+    Returns:
+        tuple: (verdict, probability) - verdict is True (resume), False (not a resume)
+               or None (ambiguous, ask the LLM validator).
+    """
+    accept = VALIDITY_ACCEPT if accept is None else accept
+    reject = VALIDITY_REJECT if reject is None else reject
+    probability = resume_probability(resume_content)
+    if probability >= accept:
+        return True, probability
+    if probability <= reject:
+        return False, probability
+    return None, probability
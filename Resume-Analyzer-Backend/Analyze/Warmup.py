@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from DB_Handle import ping_db
+from Analyze_Resume import get_model, get_workflow
+from Job_Role.Get_Job_Category import predict_resume_category, model_fingerprint as job_role_fingerprint
+from Validity.Get_Validity import resume_validity, model_fingerprint as validity_fingerprint
+from Scoring.Keyword_Match import keyword_match
+from Pdf_Extract import start_workers as start_pdf_workers
+
+## Startup warmup and readiness of an API process.
+## Heavy resources (pickled models, the LLM client, the compiled graph, the MongoDB connection, the PDF worker
+## processes) are loaded lazily on first use, so importing main.py stays fast. The lifespan hook in main.py starts
+## a warmup that loads them in parallel worker threads and runs one throwaway prediction through each inference
+## path, so the first real request does not pay for it. GET /ready answers 503 until every step has succeeded
+## (failed steps are retried on the next probe), which lets a load balancer hold traffic back from a replica that
+## is still starting.
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")  # "false" loads on first request / probe
+
+WARMUP_RESUME = """John Doe - Python Developer
+Summary: Backend developer with 4 years of experience building REST APIs.
+Experience: Software Engineer, Acme Corp (2020 - 2024). Built Django and FastAPI services, PostgreSQL, Docker, AWS.
+Education: B.Tech in Computer Science, 2020.
+Skills: Python, SQL, Django, FastAPI, Docker, Git, AWS, machine learning."""
+WARMUP_JOB_DESCRIPTION = "Python Developer with Django, REST APIs, SQL, Docker and AWS experience."
+
+
+def check_database():
+    if not ping_db():
+        raise ConnectionError("MongoDB did not answer the ping")
+
+# Steps of a group run one after another (they import the same libraries), groups run in parallel
+WARMUP_GROUPS = [
+    {"database": check_database},
+    {"pdf_workers": start_pdf_workers},
+    # The model fingerprints (analysis cache key) hash the model files, once per process
+    {"job_role_model": lambda: (predict_resume_category(WARMUP_RESUME), job_role_fingerprint()),
+     "validity_model": lambda: (resume_validity(WARMUP_RESUME), validity_fingerprint()),
+     "keyword_engine": lambda: keyword_match(WARMUP_RESUME, WARMUP_JOB_DESCRIPTION)},
+    {"llm_model": get_model,
+     "workflow": get_workflow},
+]
+
+
+class Readiness:
+    """Status of every warmup step: pending -> loading -> ready / failed."""
+
+    def __init__(self, groups: list = WARMUP_GROUPS):
+        self.groups = groups
+        self.status = {name: {'state': 'pending', 'seconds': None, 'error': None} for group in groups for name in group}
+        self.task = None
+
+    def run_group(self, group: dict, names: set):
+        for name, func in group.items():
+            if name not in names:
+                continue
+            self.status[name].update(state='loading', error=None)
+            start = time.perf_counter()
+            try:
+                func()
+                self.status[name].update(state='ready')
+            except Exception as e:
+                print(f"❌ Warmup step {name} failed: {str(e)}")
+                self.status[name].update(state='failed', error=str(e))
+            self.status[name]['seconds'] = round(time.perf_counter() - start, 3)
+
+    async def awarmup(self, names: set = None):
+        names = set(self.status) if names is None else names
+        start = time.perf_counter()
+        await asyncio.gather(*(asyncio.to_thread(self.run_group, group, names) for group in self.groups))
+        state = "✅ Ready" if self.is_ready() else "❌ Not ready"
+        print(f"{state} after warmup ({time.perf_counter() - start:.2f}s): " +
+              ", ".join(f"{name}={status['state']}" for name, status in self.status.items()))
+
+    def start(self):
+        """Start (or resume, for steps that are pending or failed) the warmup in the background."""
+        if self.task is None or self.task.done():
+            names = {name for name, status in self.status.items() if status['state'] in ('pending', 'failed')}
+            if names:
+                self.task = asyncio.ensure_future(self.awarmup(names))
+        return self.task
+
+    def is_ready(self) -> bool:
+        return all(status['state'] == 'ready' for status in self.status.values())
+
+    def report(self) -> dict:
+        return {'ready': self.is_ready(), 'resources': {name: dict(status) for name, status in self.status.items()}}
+
+
+readiness = Readiness()
@@ -1,17 +1,14 @@
 # app.py
 import streamlit as st
-from Analyze_Resume import workflow, ResumeState
-import PyPDF2
+from Analyze_Resume import get_workflow, ResumeState
+from Text_Extract import extract_text
 
 # ---------------------------
-# Function to extract PDF text
+# Function to extract resume text
 # ---------------------------
 def get_resume_content(resume_file) -> str:
-    pdf_reader = PyPDF2.PdfReader(resume_file)
-    text = ''
-    for page in pdf_reader.pages:
-        text += page.extract_text() or ''
-    return text
+    # Same extractors as the API: PDF, DOCX or TXT, recognised from the file's content
+    return extract_text(resume_file.getvalue())['text']
 
 def display_points(title, points):
     st.markdown(f"### {title}")
@@ -30,14 +27,17 @@ def main():
 
     st.title("📄 Resume Analyzer")
     st.markdown(
-        "Upload a resume in PDF format and get predicted job categories, scores, and analysis."
+        "Upload a resume in PDF, DOCX, or TXT format and get predicted job categories, scores, and analysis."
     )
 
-    uploaded_file = st.file_uploader("Upload a Resume", type=["pdf"])
+    uploaded_file = st.file_uploader("Upload a Resume", type=["pdf", "docx", "txt"])
 
     if uploaded_file is not None:
-        uploaded_file.seek(0)
-        resume_text = get_resume_content(uploaded_file)
+        try:
+            resume_text = get_resume_content(uploaded_file)
+        except Exception as e:
+            st.error(f"Error reading the file: {str(e)}")
+            return
 
         if resume_text:
             st.success("Successfully extracted text from the uploaded resume.")
@@ -52,7 +52,7 @@ def main():
             initial_state: ResumeState = {'resume_content': resume_text}
 
             try:
-                final_state: ResumeState = workflow.invoke(initial_state)
+                final_state: ResumeState = get_workflow().invoke(initial_state)
 
                 # Display results
                 st.markdown(f"""
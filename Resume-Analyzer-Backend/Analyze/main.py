@@ -1,21 +1,42 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from io import BytesIO
-import PyPDF2
-from Analyze_Resume import workflow
-import warnings
-from sklearn.exceptions import InconsistentVersionWarning
-from Report.resume_report import generate_resume_report
-from DB_Handle import saveToDb, get_file, get_file_stream, delete_report, get_all_documents, get_report, check_username_exists
-from datetime import datetime
-
-# Ignore scikit-learn version mismatch warnings
-warnings.filterwarnings("ignore", category=InconsistentVersionWarning)
+from contextlib import asynccontextmanager
+from bson import ObjectId
+import json
+from Resume_Service import get_resume_content, aanalyze_and_save, JOB_HANDLERS
+from Resume_Service import astream_resume_report, asave_analysis, arender_report, REPORT_PREFETCH
+from Job_Queue import create_job_queue, JobWorkerPool
+from Analysis_Cache import analysis_cache
+from Extraction_Cache import extraction_cache
+from Text_Extract import extractor_stats
+from LLM_Scheduler import llm_scheduler
+from Upload_Dedup import upload_fingerprint, upload_flights, idempotency_store
+from Pdf_Extract import read_upload
+from Batch_Analyze import prepare_job_description, analyze_and_save_batch
+from Warmup import readiness, WARMUP_ON_STARTUP
+from DB_Handle import get_report, check_username_exists, is_system_collection
+from DB_Handle import aget_file_stream, adelete_report, aget_all_documents, ablob_storage_stats
 
 ## Run Command : uvicorn main:app --reload
 
-app = FastAPI()
+# Background analysis jobs (see Job_Queue.py for backends and settings)
+job_queue = create_job_queue()
+job_workers = JobWorkerPool(job_queue, JOB_HANDLERS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_workers.start()
+    # Models, LLM client, graph and database connection load in the background; GET /ready reports when they are done
+    if WARMUP_ON_STARTUP:
+        readiness.start()
+    yield
+    await job_workers.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow frontend origins (adjust for your setup)
 origins = [
@@ -33,119 +54,240 @@ app.add_middleware(
 )
 
 # ---------------------------
-# PDF Text Extraction
+# FastAPI Endpoints
 # ---------------------------
-def get_resume_content(file_bytes) -> str:
+def check_user_name(user_name: str):
+    # Every user's documents live in a collection named after them: the system collections' names are refused
+    if is_system_collection(user_name):
+        raise HTTPException(status_code=400, detail=f"'{user_name}' is a reserved name, please choose another username")
+
+async def read_resume_upload(uploaded_file: UploadFile) -> tuple:
+    # (file bytes, SHA-256). Stops reading at PDF_MAX_BYTES instead of buffering an arbitrarily large upload
+    try:
+        return await read_upload(uploaded_file)
+    except ValueError as ve:
+        raise HTTPException(status_code=413, detail=str(ve))
+
+async def prefetch_report(saved: dict):
+    # REPORT_PREFETCH: the worker pool renders the report now, so its first download is served from the cache
+    if REPORT_PREFETCH and saved.get('resume_report_id'):
+        await job_queue.enqueue("render_report", {'report_id': saved['resume_report_id']})
+
+async def run_upload(file_bytes: bytes, file_hash: str, resume_file_name: str, job_description: str, user_name: str, background: bool):
     """
-    Extract text content from a PDF file.
-    
-    Args:
-        file_bytes (BytesIO): The PDF file as a BytesIO object.
-    
+    The work behind /upload_resume, shared by coalesced duplicate requests.
+
     Returns:
-        str: Extracted text from the PDF.
+        tuple: (status code, response body).
     """
-    try:
-        pdf_reader = PyPDF2.PdfReader(file_bytes)
-        text = ""
-        for page in pdf_reader.pages:
-            extracted = page.extract_text()
-            if extracted:
-                text += extracted
-        return text
-    except Exception as e:
-        raise ValueError(f"Error extracting text from PDF: {str(e)}")
+    # Background mode: hand the upload to the worker pool and return a job id right away
+    if background:
+        job_id = await job_queue.enqueue("analyze_upload", {
+            'file_bytes': file_bytes,
+            'file_hash': file_hash,
+            'resume_file_name': resume_file_name,
+            'job_description': job_description,
+            'user_name': user_name,
+            # The analysis is saved under this id: a retried job finds it instead of saving it twice
+            'document_id': str(ObjectId())
+        })
+        return 202, {"job_id": job_id, "status": "queued"}
 
-def get_resume_report(initial_state):
+    # PDF parsing is CPU-bound, keep it off the event loop (a file seen before comes from the extraction cache)
+    resume_text = await run_in_threadpool(get_resume_content, BytesIO(file_bytes), file_hash)
     
     try:
-        result = workflow.invoke(initial_state)
-        return {
-            "success": True,
-            "data": result
-        }
-    except ValueError as e:
-         # Raised for invalid inputs (non-resume, malicious job desc, etc.)
-        return {
-            "success": False,
-            "error": {
-            "type": "InputValidationError",
-            "message": str(e),
-            "details": None
-            }
-        }
+        AI_Response = await aanalyze_and_save(resume_text, job_description, user_name, file_bytes, resume_file_name)
     except Exception as e:
-        # Catch-all for unexpected runtime/LLM issues
-        return {
-            "success": False,
-            "error": {
-            "type": "InternalServerError",
-            "message": "Something went wrong during resume analysis. Please try again later.",
-            "details": str(e) # optional, hide in production
-            }
-        }
-
+        print("Exception during analysis or saving:", str(e))
+        raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
+    
+    await prefetch_report(AI_Response)
+    return 200, AI_Response
 
-# ---------------------------
-# FastAPI Endpoints
-# ---------------------------
 @app.post("/upload_resume")
-async def upload_resume(uploaded_file: UploadFile = File(...), job_description: str = Form(...), user_name: str = Form(...)):
+async def upload_resume(uploaded_file: UploadFile = File(...), job_description: str = Form(...), user_name: str = Form(...), background: bool = Form(False),
+                        idempotency_key: str = Header(None)):
     """
-    Upload a resume, analyze it, generate a report, and save to MongoDB.
+    Upload a resume, analyze it and save to MongoDB (the report PDF is rendered on its first download).
+    Identical uploads in flight at the same time share one analysis and one saved document.
     
     Args:
-        uploaded_file (UploadFile): The uploaded resume PDF.
+        uploaded_file (UploadFile): The uploaded resume (PDF, DOCX or TXT, recognised from its content).
         job_description (str): The job description text.
         user_name (str): The username for storing data.
+        background (bool): Enqueue the analysis and return a job id immediately (poll GET /jobs/{job_id}).
+        idempotency_key (str): Optional Idempotency-Key header. A retry with the same key returns the stored
+            response (marked with an Idempotent-Replayed header) instead of analysing the resume again.
     
     Returns:
         dict: AI response with analysis and file IDs, or error message.
     """
+    check_user_name(user_name)
+    file_bytes, file_hash = await read_resume_upload(uploaded_file)
     try:
-        file_bytes = await uploaded_file.read()
-        resume_file = BytesIO(file_bytes)
-        resume_text = get_resume_content(resume_file)
         resume_file_name = uploaded_file.filename
+        fingerprint = upload_fingerprint(file_bytes, job_description, user_name, "background" if background else "sync", file_hash)
+
+        if idempotency_key:
+            stored = await idempotency_store.aget(user_name, idempotency_key)
+            if stored is not None:
+                if stored['fingerprint'] != fingerprint:
+                    return JSONResponse(status_code=422, content={"detail": "Idempotency-Key was already used for a different upload"})
+                return JSONResponse(status_code=stored['status_code'], content=stored['body'], headers={"Idempotent-Replayed": "true"})
+
+        status_code, body = await upload_flights.run(fingerprint, lambda: run_upload(file_bytes, file_hash, resume_file_name, job_description, user_name, background))
+        body = jsonable_encoder(body)
+
+        if idempotency_key:
+            await idempotency_store.aset(user_name, idempotency_key, fingerprint, status_code, body)
+        return JSONResponse(status_code=status_code, content=body)
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"File processing error: {str(e)}")
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-        # Get today's date
-        today_date = datetime.today().strftime("%Y-%m-%d")
-        
-        AI_Response = {}
+@app.post("/upload_resume_stream")
+async def upload_resume_stream(uploaded_file: UploadFile = File(...), job_description: str = Form(...), user_name: str = Form(...)):
+    """
+    Same as /upload_resume, but streams progress as server-sent events.
+    
+    Events:
+        node      - {"node": name, "state": partial state} as each graph node completes
+                    (Validate_Resume, Get_Job_Category, Analyze_Resume, Overall_Score, ...)
+        analysis  - the full AI response, before it is saved
+        complete  - the saved document with file IDs
+        error     - {"detail": message}
+    """
+    check_user_name(user_name)
+    file_bytes, file_hash = await read_resume_upload(uploaded_file)
+    resume_file_name = uploaded_file.filename
+
+    async def events():
         try:
-            AI_Response = get_resume_report({'resume_content': resume_text, 'job_description': job_description})
-            
-            # Ensure directory exists for report
-            output_path = f"Report/Resume_Reports/{user_name}_Report.pdf"
-            import os
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Generate Feedback Report only if successful
-            if AI_Response['success']:
-                resume_report = generate_resume_report(AI_Response['data'], user_name=user_name, output_path=output_path)
+            resume_text = await run_in_threadpool(get_resume_content, BytesIO(file_bytes), file_hash)
+        except Exception as e:
+            yield sse_event("error", {"detail": f"File processing error: {str(e)}"})
+            return
+
+        AI_Response = None
+        async for kind, node_name, payload in astream_resume_report({'resume_content': resume_text, 'job_description': job_description}):
+            if kind == "node":
+                yield sse_event("node", {"node": node_name, "state": payload})
             else:
-                resume_report = None
-
-            # Reset resume_file position for saving
-            resume_file.seek(0)
-            
-            # Save to MongoDB regardless of success/failure
-            AI_Response = saveToDb(AI_Response, user_name, resume_file, resume_report, resume_file_name, today_date)
-            
-            if AI_Response is None:
-                raise HTTPException(status_code=500, detail="Failed to save data to database, possibly due to invalid report PDF")
-            
-        except ValueError as ve:
-            print("PDF generation error:", str(ve))
-            raise HTTPException(status_code=500, detail=f"PDF generation error: {str(ve)}")
+                AI_Response = payload
+        yield sse_event("analysis", AI_Response)
+
+        try:
+            saved = await asave_analysis(AI_Response, user_name, file_bytes, resume_file_name)
         except Exception as e:
-            print("Exception during analysis or report generation:", str(e))
-            raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
-        
-        return AI_Response
+            print("Exception during saving:", str(e))
+            yield sse_event("error", {"detail": f"Analysis error: {str(e)}"})
+            return
+        await prefetch_report(saved)
+        yield sse_event("complete", saved)
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"File processing error: {str(e)}")
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Status of a background analysis job.
+    
+    Args:
+        job_id (str): The id returned by POST /upload_resume with background=true.
+    
+    Returns:
+        dict: status (queued / running / done / failed), attempts, and the saved analysis once done.
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job['_id'],
+        "status": job['status'],
+        "attempts": job['attempts'],
+        "created_at": job['created_at'],
+        "updated_at": job['updated_at'],
+        "result": job.get('result'),
+        "error": job.get('error')
+    }
+
+@app.post("/upload_resumes_batch")
+async def upload_resumes_batch(uploaded_files: list[UploadFile] = File(...), job_description: str = Form(...), user_name: str = Form(...)):
+    """
+    Analyze many resumes against one job description and stream the results back as NDJSON.
+    
+    Args:
+        uploaded_files (list[UploadFile]): The resumes (PDF, DOCX or TXT).
+        job_description (str): The job description shared by every resume.
+        user_name (str): The username for storing data.
+    
+    Returns:
+        StreamingResponse: One JSON document per line as each resume finishes, then a summary line.
+    """
+    check_user_name(user_name)
+    try:
+        prepare_job_description(job_description)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    # Read every upload before streaming starts, the request's files are closed once the handler returns
+    resumes = [(uploaded_file.filename, (await read_resume_upload(uploaded_file))[0]) for uploaded_file in uploaded_files]
+
+    async def ndjson_lines():
+        async for line in analyze_and_save_batch(job_description, resumes, user_name):
+            yield json.dumps(line, default=str) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@app.get("/analysis_cache/stats")
+def analysis_cache_stats():
+    """
+    Hit / miss counters of the analysis result cache for this worker.
+    """
+    return analysis_cache.stats()
+
+@app.get("/extraction_cache/stats")
+def extraction_cache_stats():
+    """
+    Hit / miss counters of the extracted-text cache (keyed by file SHA-256) for this worker.
+    """
+    return extraction_cache.stats()
+
+@app.get("/extractors/stats")
+def extractors_stats():
+    """
+    Files, failures and timings of the text extractors per format (pdf / docx / txt) for this worker.
+    """
+    return extractor_stats()
+
+@app.get("/storage/stats")
+async def storage_stats():
+    """
+    Deduplicated GridFS storage: unique files, references to them and the bytes saved by storing each file once.
+    """
+    return await ablob_storage_stats()
+
+@app.get("/llm_scheduler/stats")
+def llm_scheduler_stats():
+    """
+    Queue depth, remaining budgets and retry counters of the shared LLM scheduler.
+    """
+    return llm_scheduler.stats()
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once every resource is loaded and the database answers, 503 (with per-resource status) before.
+    Steps that are pending or failed are (re)started by the probe.
+    """
+    if not readiness.is_ready():
+        readiness.start()
+    return JSONResponse(status_code=200 if readiness.is_ready() else 503, content=readiness.report())
 
 @app.get("/check_username/{username}")
 def check_username(username: str):
@@ -174,6 +316,7 @@ def retrieve_doc(user_name: str, report_id: str):
     Returns:
         Dictionary: A single dictionary / json object
     """
+    check_user_name(user_name)
     document = get_report(report_id, user_name)
     if document is None:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve document for user {user_name}")
@@ -193,7 +336,8 @@ async def get_all_documents_endpoint(username: str = Query(...)):
     Returns:
         list: List of documents in the collection.
     """
-    documents, avg_ats_score, score_change, total_valid_documents = get_all_documents(username)
+    check_user_name(username)
+    documents, avg_ats_score, score_change, total_valid_documents = await aget_all_documents(username)
     if documents is None:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve documents for user {username}")
     if not documents:
@@ -211,15 +355,25 @@ async def get_all_documents_endpoint(username: str = Query(...)):
 @app.get("/download_reportfile/{file_id}")
 async def download_file(file_id: str):
     """
-    Download a file from GridFS by file ID as a streaming response.
+    Download a report (or any file) from GridFS by ID as a streaming response.
+    A report id of a saved analysis is rendered from the analysis on its first download and cached in GridFS,
+    later downloads (until the report template changes) are served from that cache.
     
     Args:
-        file_id (str): The GridFS file ID.
+        file_id (str): The report id (resume_report_id) or GridFS file ID.
     
     Returns:
         StreamingResponse: The file as a streaming response.
     """
-    file_stream, filename = get_file_stream(file_id)
+    try:
+        pdf_bytes, filename = await arender_report(file_id)
+    except ValueError as ve:
+        raise HTTPException(status_code=500, detail=f"PDF generation error: {str(ve)}")
+    if pdf_bytes is not None:
+        file_stream = BytesIO(pdf_bytes)
+    else:
+        # Reports rendered at upload time (before lazy rendering) and other files are plain GridFS files
+        file_stream, filename = await aget_file_stream(file_id)
     if file_stream is None:
         raise HTTPException(status_code=404, detail="File not found")
     
@@ -259,7 +413,8 @@ async def delete_report_endpoint(report_id: str, username: str = Query(...)):
     Returns:
         dict: Confirmation message.
     """
-    success = delete_report(report_id, username)
+    check_user_name(username)
+    success = await adelete_report(report_id, username)
     if not success:
         raise HTTPException(status_code=404, detail="Report not found or failed to delete")
     